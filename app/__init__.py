@@ -147,5 +147,6 @@ def create_app(config_class):
 
     app.cli.add_command(commands.sync_archive_data)
     app.cli.add_command(commands.clear_archive_cache)
+    app.cli.add_command(commands.archive_sync_daemon)
 
     return app
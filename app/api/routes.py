@@ -47,6 +47,8 @@ def archive_records():
 
     Query parameters:
         character (required): First character to filter by (e.g., 'a', '0-9')
+        cursor (optional): next_cursor or previous_cursor from another page
+        limit (optional): Number of records per page, up to ARCHIVE_LIMIT_MAX
 
     Returns:
         JSON response with format:
@@ -69,10 +71,15 @@ def archive_records():
             ],
             "meta": {
                 "total_count": 100,
+                "limit": 100,
+                "next_cursor": "WyJhZnRlciIsICJleGFtcGxlIHNpdGUiLCAxXQ",
+                "previous_cursor": null
             }
         }
     """
     character = request.args.get("character", "").strip().lower()
+    cursor = request.args.get("cursor") or None
+    limit = request.args.get("limit", type=int)
 
     if not character:
         return (
@@ -85,9 +92,32 @@ def archive_records():
             400,
         )
 
+    if "limit" in request.args and (limit is None or limit < 1):
+        return (
+            jsonify(
+                {
+                    "error": "Invalid parameter",
+                    "message": "Parameter 'limit' must be a positive integer",
+                }
+            ),
+            400,
+        )
+
     try:
-        result = archive_service.get_records_by_character(character=character)
+        result = archive_service.get_records_by_character(
+            character=character, cursor=cursor, limit=limit
+        )
         return jsonify(result), 200
+    except archive_service.InvalidCursorError:
+        return (
+            jsonify(
+                {
+                    "error": "Invalid parameter",
+                    "message": "Parameter 'cursor' is not valid",
+                }
+            ),
+            400,
+        )
     except Exception as e:
         current_app.logger.error(
             f"Error fetching records for character '{character}': {e}"
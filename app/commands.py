@@ -3,8 +3,12 @@ Flask CLI command to sync archive data from external JSON source.
 
 - Processes records in batches
 - Assumes wam_id is unique
-- Full JSON dataset remains in memory throughout processing
-- Memory usage spikes during JSON load, but then remains flat during batch processing
+- Streams the JSON feed to a temporary file, then parses entries incrementally
+- Reads feeds over HTTP(S), from local files or stdin, decompressing gzip and zstd
+  feeds as they are parsed
+- Peak memory depends on the validation batch size rather than the size of the feed
+- Skips the sync when the feed is unchanged since the last successful sync (HTTP 304
+  or matching SHA-256 digest)
 
 Expected Schema of input:
     [
@@ -44,28 +48,103 @@ Saved fields:
 
 Usage:
     flask sync-archive-data --url https://example.com/data.json
+    flask sync-archive-data --url file:///data/archive.json.gz  # Reads a local file
+    cat archive.json.zst | flask sync-archive-data --url -  # Reads from stdin
     flask sync-archive-data  # Uses ARCHIVE_JSON_URL environment variable
     flask sync-archive-data --dry-run  # Processes all entries without saving to database
+    flask sync-archive-data --force  # Processes the feed even if it is unchanged
+    flask sync-archive-data --workers 4  # Validates batches in 4 processes
+    flask sync-archive-data --rebuild-fts  # Rebuilds the whole search index afterwards
+    flask sync-archive-data --report-json sync.json  # Writes per-phase timings
+    flask sync-archive-data --resume  # Continues an interrupted sync of the same feed
+    flask archive-sync-daemon  # Syncs every ARCHIVE_SYNC_INTERVAL seconds
+    flask archive-sync-daemon -- --workers 4  # Passes options on to sync-archive-data
 """
 
+import hashlib
 import json
 import logging
 import os
+import random
+import signal
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from functools import partial
+from itertools import islice
+from urllib.parse import urlparse
+from urllib.request import url2pathname
 
 import click
 import requests
+from flask import current_app
 from pydantic import ValidationError
-from sqlalchemy import text
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    MetaData,
+    Table,
+    delete,
+    exists,
+    func,
+    literal,
+    or_,
+    select,
+    text,
+    true,
+)
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import SQLAlchemyError
+from urllib3.exceptions import DecodeError, ProtocolError, ReadTimeoutError
 
 from app.lib import database
-from app.lib.archive_service import get_records_by_character
+from app.lib.archive_service import (
+    cache_records_page,
+    invalidate_listings,
+    invalidate_search,
+    list_available_characters,
+    prerender_listing,
+)
 from app.lib.cache import cache
-from app.lib.models import ArchiveRecord
-from app.lib.schemas import ArchiveRecordSchema
+from app.lib.feed import (
+    CONTENT_ENCODINGS,
+    FEED_CHUNK_SIZE,
+    FeedCompressionError,
+    accept_encoding,
+    detect_compression,
+    iter_feed_chunks,
+    iter_json_array,
+)
+from app.lib.models import (
+    ArchiveRecord,
+    ArchiveRecordStage,
+    ArchiveSyncCheckpoint,
+    ArchiveSyncState,
+)
+from app.lib.schemas import ArchiveRecordSchema, source_fingerprint
+from app.lib.sync_lock import SyncLock
+from app.lib.sync_report import SyncReport
 
 logger = logging.getLogger(__name__)
 
+# Number of source wam_ids loaded, and stale records deleted, per statement
+DELETE_CHUNK_SIZE = 10_000
+
+# wam_ids present in the source feed, loaded to anti-join against when deleting
+_source_ids = Table(
+    "archive_source_ids",
+    MetaData(),
+    Column("wam_id", BigInteger, primary_key=True),
+    prefixes=["TEMPORARY"],
+)
+
 
 @click.command("clear-archive-cache")
 @click.option(
@@ -82,7 +161,10 @@ def clear_archive_cache(dry_run: bool):
 @click.option(
     "--url",
     type=str,
-    help="URL to fetch JSON data from (otherwise uses ARCHIVE_JSON_URL env var)",
+    help=(
+        "URL, file path or - for stdin to read JSON data from "
+        "(otherwise uses ARCHIVE_JSON_URL env var)"
+    ),
 )
 @click.option(
     "--dry-run",
@@ -101,7 +183,46 @@ def clear_archive_cache(dry_run: bool):
     default=1000,
     help="Number of entries per database transaction (default: 1000)",
 )
-def sync_archive_data(url, dry_run, validation_batch_size, commit_batch_size):
+@click.option(
+    "--force",
+    is_flag=True,
+    help=(
+        "Process the feed and validate every entry even if unchanged since the "
+        "last sync"
+    ),
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Number of processes to validate batches with (default: 1)",
+)
+@click.option(
+    "--rebuild-fts",
+    is_flag=True,
+    help="Rebuild the whole search index after syncing, even if the feed is unchanged",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Continue an interrupted sync of the same feed after its last committed batch",
+)
+@click.option(
+    "--report-json",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write per-phase timings and throughput for the sync to this JSON file",
+)
+def sync_archive_data(
+    url,
+    dry_run,
+    validation_batch_size,
+    commit_batch_size,
+    force,
+    workers,
+    rebuild_fts,
+    resume,
+    report_json,
+):
     """Sync archive data from external JSON source with hash-based change detection"""
 
     stats = {
@@ -114,6 +235,12 @@ def sync_archive_data(url, dry_run, validation_batch_size, commit_batch_size):
         "database_errors": 0,
     }
 
+    # Reported however the command finishes
+    report = SyncReport()
+    click.get_current_context().call_on_close(
+        partial(_finish_report, report, stats, report_json)
+    )
+
     url = url or os.environ.get("ARCHIVE_JSON_URL")
     if not url:
         click.secho(
@@ -122,74 +249,359 @@ def sync_archive_data(url, dry_run, validation_batch_size, commit_batch_size):
         )
         return
 
-    # Load JSON data
+    # Only make a conditional request when the result will be acted on
+    sync_state = get_sync_state()
+    use_sync_state = not (dry_run or force)
+
+    # Download JSON data
+    report.outcome = "failed"
     try:
-        raw_data = load_data(url)
-    except (requests.RequestException, json.JSONDecodeError, ValueError) as e:
+        with report.phase("fetch"):
+            feed = fetch_feed(url, sync_state if use_sync_state else None)
+    except (requests.RequestException, OSError) as e:
         logger.error("Failed to load archive data from %s: %s", url, str(e))
         click.secho(f"Failed to load data: {e}", fg="red")
         return
 
-    stats["total"] = len(raw_data)
+    if feed is None:
+        report.outcome = "not_modified"
+        # Record that the data was confirmed up to date
+        save_sync_state(sync_state, url, None)
+        logger.info("Archive data not modified since last sync, skipping")
+        click.secho("Feed not modified since last sync, nothing to do", fg="green")
+    elif (
+        use_sync_state
+        and sync_state is not None
+        and sync_state.source_url == url
+        and sync_state.feed_digest == feed["digest"]
+    ):
+        report.add("fetch", 0, bytes=feed["size"])
+        report.outcome = "unchanged"
+        feed["file"].close()
+        # Keep the validators from this response for the next conditional request
+        save_sync_state(sync_state, url, feed)
+        logger.info("Archive data unchanged since last sync (digest match), skipping")
+        click.secho("Feed unchanged since last sync, nothing to do", fg="green")
+    else:
+        report.add("fetch", 0, bytes=feed["size"])
+        with feed["file"]:
+            synced = _sync_feed(
+                url,
+                feed,
+                stats,
+                report,
+                dry_run=dry_run,
+                force=force,
+                resume=resume,
+                validation_batch_size=validation_batch_size,
+                commit_batch_size=commit_batch_size,
+                workers=workers,
+            )
 
+        if synced:
+            report.outcome = "synced"
+        if synced and not dry_run and not stats["database_errors"]:
+            # Publishing may have created the row, and has changed its generation
+            save_sync_state(get_sync_state(), url, feed)
+
+    # The search index is otherwise kept up to date by triggers on archive_records
+    if rebuild_fts:
+        with report.phase("rebuild_fts"):
+            _rebuild_fts_index(dry_run)
+
+
+def _finish_report(report, stats, report_json=None):
+    """Log the sync report, and write it to a JSON file if a path is given."""
+    summary = report.as_dict(stats)
+    for name, phase in summary["phases"].items():
+        counts = ", ".join(
+            f"{key}={value:.0f}"
+            for key, value in phase.items()
+            if key not in ("seconds", "batches") and value is not None
+        )
+        logger.info(
+            "Archive data sync phase %s: %.2fs %s", name, phase["seconds"], counts
+        )
     logger.info(
-        "Starting archive data sync: %s entries, dry_run=%s",
-        stats["total"],
-        dry_run,
+        "Archive data sync report: outcome=%s, %.2fs, peak RSS %s bytes",
+        summary["outcome"],
+        summary["seconds"],
+        summary["peak_rss_bytes"],
+        extra={"sync_report": summary},
     )
 
+    if report_json:
+        try:
+            with open(report_json, "w") as f:
+                json.dump(summary, f, indent=2)
+        except OSError as e:
+            logger.error("Failed to write sync report to %s: %s", report_json, str(e))
+            click.secho(f"Failed to write sync report: {e}", fg="red")
+
+
+@click.command("archive-sync-daemon", context_settings={"ignore_unknown_options": True})
+@click.option(
+    "--interval",
+    type=click.IntRange(min=1),
+    help="Seconds between syncs (otherwise uses ARCHIVE_SYNC_INTERVAL)",
+)
+@click.option(
+    "--jitter",
+    type=click.IntRange(min=0),
+    help=(
+        "Maximum seconds to randomly add to or take from the interval "
+        "(otherwise uses ARCHIVE_SYNC_JITTER)"
+    ),
+)
+@click.option(
+    "--lock-ttl",
+    type=click.IntRange(min=1),
+    help=(
+        "Seconds before the lock of a node that has stopped can be taken over "
+        "(otherwise uses ARCHIVE_SYNC_LOCK_TTL)"
+    ),
+)
+@click.option(
+    "--once",
+    is_flag=True,
+    help="Run one scheduled sync, then exit",
+)
+@click.argument("sync_args", nargs=-1, type=click.UNPROCESSED)
+def archive_sync_daemon(interval, jitter, lock_ttl, once, sync_args):
+    """Sync archive data on an interval, with only one node syncing at a time"""
+    interval = interval or current_app.config["ARCHIVE_SYNC_INTERVAL"]
+    if jitter is None:
+        jitter = current_app.config["ARCHIVE_SYNC_JITTER"]
+    lock = SyncLock(lock_ttl or current_app.config["ARCHIVE_SYNC_LOCK_TTL"])
+
+    # Fail now, rather than on every run, if the sync options are invalid
+    sync_archive_data.make_context("sync-archive-data", list(sync_args)).close()
+
+    stopping = threading.Event()
+    previous_handler = signal.signal(signal.SIGTERM, lambda *args: stopping.set())
+    click.echo(f"Syncing archive data every {interval}s (±{jitter}s) as {lock.holder}")
+    try:
+        generation = None
+        while True:
+            # Keep running through failures, e.g. the database being unavailable,
+            # and try again on the next interval
+            try:
+                if generation is None:
+                    generation = _sync_generation()
+                generation = _scheduled_sync(
+                    lock, interval - jitter, sync_args, generation
+                )
+            except Exception:
+                logger.exception("Scheduled archive data sync run failed")
+            if once or stopping.wait(interval + random.uniform(-jitter, jitter)):
+                break
+    finally:
+        signal.signal(signal.SIGTERM, previous_handler)
+    click.echo("Archive sync daemon stopped")
+
+
+def _scheduled_sync(lock, min_interval, sync_args, generation):
+    """
+    Run the sync if this node gets the lock and no node has synced recently.
+
+    Args:
+        lock: SyncLock shared by every node
+        min_interval: Seconds since the last sync on any node before syncing again
+        sync_args: Command line arguments for sync-archive-data
+        generation: Data generation this node last refreshed its caches for
+
+    Returns:
+        int: The current data generation
+    """
+    if not lock.acquire():
+        logger.info("Archive data sync is running on another node, skipping")
+    else:
+        synced = False
+        try:
+            if lock.ran_within(min_interval):
+                logger.info(
+                    "Archive data was synced recently by another node, skipping"
+                )
+            else:
+                _run_sync(sync_args)
+                synced = True
+        finally:
+            lock.release(record_run=synced)
+        if synced:
+            # The sync has already refreshed the caches for its changes
+            return _sync_generation()
+
+    current_generation = _sync_generation()
+    if current_generation != generation and not _cache_is_shared():
+        logger.info(
+            "Archive data generation %s was synced by another node, clearing caches",
+            current_generation,
+        )
+        _clear_cache(False)
+    return current_generation
+
+
+def _run_sync(sync_args):
+    try:
+        # A new context per run, so the sync report is finished when the run ends
+        with sync_archive_data.make_context(
+            "sync-archive-data", list(sync_args)
+        ) as ctx:
+            sync_archive_data.invoke(ctx)
+    except Exception:
+        logger.exception("Scheduled archive data sync failed")
+    finally:
+        database.db_session.remove()
+
+
+def _sync_generation():
+    try:
+        sync_state = get_sync_state()
+        return sync_state.generation if sync_state is not None else 0
+    finally:
+        database.db_session.remove()
+
+
+def _cache_is_shared():
+    # Caches other than these are local to a node, so are not refreshed by a sync
+    # that runs on a different node
+    cache_type = current_app.config["CACHE_TYPE"]
+    return any(shared in cache_type for shared in ("Redis", "Memcached"))
+
+
+def _sync_feed(
+    url,
+    feed,
+    stats,
+    report,
+    *,
+    dry_run,
+    force,
+    resume,
+    validation_batch_size,
+    commit_batch_size,
+    workers,
+):
+    """
+    Validate, stage and publish entries from a downloaded feed.
+
+    Unless this is a dry run, a checkpoint is saved after each batch is staged. With
+    resume, entries up to the last checkpoint for the same feed are skipped.
+
+    Returns:
+        bool: True if the whole feed was processed and the changes were published
+    """
+    raw_data = report.timed("parse", load_data(feed["file"], feed["compression"]))
+
+    logger.info("Starting archive data sync: dry_run=%s", dry_run)
+
     # Processing mode message
     mode = "DRY RUN - no changes will be saved" if dry_run else "LIVE"
     click.secho(f"Mode: {mode}\n", fg="yellow" if dry_run else None)
-    click.echo(
-        f"Processing {stats['total']} entries in batches of {validation_batch_size}...\n"
+    click.echo(f"Processing entries in batches of {validation_batch_size}...\n")
+
+    # Entries matching these fingerprints are unchanged and skip validation
+    with report.phase("load_fingerprints"):
+        known_fingerprints = {} if force else load_fingerprints()
+
+    # Compact 8-byte integers, as this holds every wam_id in the feed
+    source_wam_ids = array("q")
+
+    checkpoint = None
+    if resume and not dry_run:
+        checkpoint = load_checkpoint(url, feed["digest"])
+        if checkpoint is None:
+            click.echo("No checkpoint for this feed, starting from the beginning\n")
+
+    if checkpoint is not None:
+        stats.update(checkpoint["stats"])
+        source_wam_ids = checkpoint["wam_ids"]
+        # Staged entries and checkpoints up to this point are kept
+        raw_data = islice(raw_data, checkpoint["entries_processed"], None)
+        click.echo(f"Resuming after {checkpoint['entries_processed']} entries\n")
+    elif not dry_run:
+        # Discard anything staged by an earlier sync that did not finish
+        with report.phase("clear_stage"):
+            clear_stage()
+
+    resumed_entries = stats["total"]
+    batches = iter(lambda: list(islice(raw_data, validation_batch_size)), [])
+
+    if workers > 1:
+        click.echo(f"Validating with {workers} worker processes\n")
+
+    # Process data in validation batches as they are streamed from the feed
+    # Validation time includes parsing the batches, which is subtracted afterwards
+    validated_batches = report.timed(
+        "validate", _validate_batches(batches, known_fingerprints, workers)
     )
+    try:
+        for batch_num, (batch_size, validation_results) in enumerate(
+            validated_batches, 1
+        ):
+            batch_start = stats["total"]
+            batch_end = batch_start + batch_size
+            stats["total"] = batch_end
+
+            click.echo(
+                f"\n--- Batch {batch_num}: Validated entries "
+                f"{batch_start + 1}-{batch_end} ---"
+            )
 
-    source_wam_ids = []
-    total_validated = 0
-    total_batches = (len(raw_data) + validation_batch_size - 1) // validation_batch_size
+            validated_rows, validation_errors, unchanged_wam_ids = validation_results
+            stats["validation_errors"] += validation_errors
+            stats["skipped"] += len(unchanged_wam_ids)
+            batch_source_ids = array("q", unchanged_wam_ids)
+            batch_valid_count = len(validated_rows)
 
-    # Process data in validation batches
-    for batch_start in range(0, len(raw_data), validation_batch_size):
-        batch_end = min(batch_start + validation_batch_size, len(raw_data))
-        batch_data = raw_data[batch_start:batch_end]
-        batch_num = (batch_start // validation_batch_size) + 1
+            click.echo(
+                f"Validated {batch_valid_count} entries "
+                f"({len(unchanged_wam_ids)} unchanged entries skipped)"
+            )
 
-        click.echo(
-            f"\n--- Batch {batch_num}/{total_batches}: Validating entries {batch_start + 1}-{batch_end} ---"
-        )
+            if batch_valid_count:
+                # Collect wam_ids for deletion later
+                batch_source_ids.extend(row["wam_id"] for row in validated_rows)
 
-        # Validate batch
-        validated_entries, validation_errors = validate_entries(batch_data)
-        stats["validation_errors"] += validation_errors
-        batch_valid_count = len(validated_entries)
-        total_validated += batch_valid_count
+                # Save batch immediately
+                if not dry_run:
+                    click.echo(f"Saving {batch_valid_count} entries to database...")
 
-        click.echo(f"Validated {batch_valid_count} entries")
+                save_results = save_entries(
+                    validated_rows,
+                    batch_valid_count,
+                    commit_batch_size,
+                    dry_run,
+                    report=report,
+                )
 
-        if batch_valid_count:
-            # Collect wam_ids for deletion later
-            batch_wam_ids = [entry.wam_id for entry in validated_entries]
-            source_wam_ids.extend(batch_wam_ids)
+                # Accumulate stats
+                for key in ("created", "updated", "skipped", "database_errors"):
+                    stats[key] += save_results[key]
 
-            # Save batch immediately
+            source_wam_ids.extend(batch_source_ids)
             if not dry_run:
-                click.echo(f"Saving {batch_valid_count} entries to database...")
-
-            save_results = save_entries(
-                validated_entries,
-                batch_valid_count,
-                commit_batch_size,
-                dry_run,
-            )
-
-            # Accumulate stats
-            for key in ("created", "updated", "skipped", "database_errors"):
-                stats[key] += save_results[key]
+                save_checkpoint(url, feed["digest"], stats, batch_source_ids)
+    except (json.JSONDecodeError, UnicodeDecodeError, FeedCompressionError) as e:
+        # The feed is incomplete, so the source wam_ids can't be used for deletion
+        logger.error(
+            "Failed to parse archive data from %s after %s entries: %s",
+            url,
+            stats["total"],
+            str(e),
+        )
+        click.secho(f"Failed to load data: {e}", fg="red")
+        return False
+    finally:
+        processed_entries = stats["total"] - resumed_entries
+        report.add("parse", 0, entries=processed_entries)
+        report.add(
+            "validate", -report.phases["parse"]["seconds"], entries=processed_entries
+        )
 
     # Summary after all batches
     click.secho(
-        f"\n\nValidation complete: {total_validated} valid entries",
+        f"\n\nValidation complete: {len(source_wam_ids)} valid entries",
         fg="green",
     )
     if validation_error_count := stats["validation_errors"]:
@@ -198,16 +610,14 @@ def sync_archive_data(url, dry_run, validation_batch_size, commit_batch_size):
             fg="yellow",
         )
 
-    # Delete entries not in source
-    to_delete = database.db_session.query(ArchiveRecord).filter(
-        ArchiveRecord.wam_id.not_in(source_wam_ids)
-    )
-    stats["deleted"] = delete_entries(to_delete, dry_run)
-
-    # Clear cache after successful sync
-    _clear_cache(dry_run)
+    # Apply staged entries and delete entries not in source
+    with report.phase("publish"):
+        publish_results = publish_entries(source_wam_ids, dry_run, source_url=url)
+    stats["deleted"] = publish_results["deleted"]
 
-    _rebuild_fts_index(dry_run)
+    # Refresh the cached listings that have changed
+    with report.phase("cache"):
+        _clear_cache(dry_run, publish_results["changed_characters"])
 
     logger.info(
         "Archive data sync completed: %s total, %s created, %s updated, "
@@ -225,71 +635,190 @@ def sync_archive_data(url, dry_run, validation_batch_size, commit_batch_size):
         fg="green",
     )
 
+    return stats["deleted"] != -1
+
 
-def validate_entries(raw_data):
+def validate_entries(raw_data, known_fingerprints=None):
     """
     Validate raw JSON entries using Pydantic schema.
 
+    Entries whose raw fingerprint matches the one stored for their wam_id are
+    unchanged since they were last saved, so they skip validation and are only
+    checked for duplicate wam_ids.
+
+    Args:
+        raw_data: List of raw JSON entries
+        known_fingerprints: Dict of {wam_id: source_fingerprint} for saved records
+
     Returns:
-        tuple: (validated_entries, validation_error_count)
+        tuple: (validated_entries, validation_error_count, unchanged_wam_ids)
     """
     validated_entries = []
+    unchanged_wam_ids = []
     validation_errors_count = 0
     seen_wam_ids = {}
 
     for idx, raw_entry in enumerate(raw_data, 1):
-        try:
-            # Validate with Pydantic (computes hash, sort_name, first_character)
-            validated = ArchiveRecordSchema(**raw_entry)
-
-            if validated.wam_id in seen_wam_ids:
+        if _is_unchanged(raw_entry, known_fingerprints):
+            validated = None
+            wam_id = raw_entry["wamId"]
+        else:
+            try:
+                # Validate with Pydantic (computes hash, sort_name, first_character)
+                validated = ArchiveRecordSchema(**raw_entry)
+                wam_id = validated.wam_id
+            except ValidationError as e:
                 validation_errors_count += 1
-                logger.error(
-                    "Duplicate wam_id %s at entry %s (first seen at entry %s), skipping",
-                    validated.wam_id,
-                    idx,
-                    seen_wam_ids[validated.wam_id],
+                wam_id = raw_entry.get("wamId", "unknown")
+
+                # Format error details for readable output
+                error_details = ", ".join(
+                    [
+                        f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}"
+                        for err in e.errors()
+                    ]
                 )
-                click.secho(
-                    f"Duplicate wam_id {validated.wam_id} at entry {idx} "
-                    f"(first seen at entry {seen_wam_ids[validated.wam_id]}), skipping",
-                    fg="red",
+                logger.warning(
+                    "Validation failed for entry %s (wam_id: %s): %s",
+                    idx,
+                    wam_id,
+                    error_details,
                 )
                 continue
 
-            seen_wam_ids[validated.wam_id] = idx
-            validated_entries.append(validated)
-
-        except ValidationError as e:
+        if wam_id in seen_wam_ids:
             validation_errors_count += 1
-            wam_id = raw_entry.get("wamId", "unknown")
-
-            # Format error details for readable output
-            error_details = ", ".join(
-                [
-                    f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}"
-                    for err in e.errors()
-                ]
-            )
-            logger.warning(
-                "Validation failed for entry %s (wam_id: %s): %s",
-                idx,
+            logger.error(
+                "Duplicate wam_id %s at entry %s (first seen at entry %s), skipping",
                 wam_id,
-                error_details,
+                idx,
+                seen_wam_ids[wam_id],
+            )
+            click.secho(
+                f"Duplicate wam_id {wam_id} at entry {idx} "
+                f"(first seen at entry {seen_wam_ids[wam_id]}), skipping",
+                fg="red",
             )
+            continue
+
+        seen_wam_ids[wam_id] = idx
+        if validated is None:
+            unchanged_wam_ids.append(wam_id)
+        else:
+            validated_entries.append(validated)
 
-    return validated_entries, validation_errors_count
+    return validated_entries, validation_errors_count, unchanged_wam_ids
 
 
-def save_entries(validated_entries, total_valid_entries, commit_batch_size, dry_run):
+def _validate_batches(batches, known_fingerprints, workers=1):
     """
-    Save validated entries to database in batches.
+    Validate batches of raw entries, optionally across a pool of worker processes.
+
+    Validated entries are converted to archive_records rows (including record_hash)
+    where they are validated, as plain dicts are much cheaper than Pydantic models to
+    send back from a worker. Results are yielded in feed order whatever order the
+    workers finish in. At most two batches per worker are in flight, so memory stays
+    bounded by the batch size.
 
     Args:
-        validated_entries: List of validated ArchiveRecordSchema objects
+        batches: Iterable of lists of raw JSON entries
+        known_fingerprints: Dict of {wam_id: source_fingerprint} for saved records
+        workers: Number of worker processes, or 1 to validate in this process
+
+    Yields:
+        tuple: (batch_size, (validated_rows, validation_error_count, unchanged_wam_ids))
+    """
+    if workers == 1:
+        for batch in batches:
+            yield len(batch), _validate_batch(batch, known_fingerprints)
+        return
+
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_validation_worker,
+        initargs=(known_fingerprints,),
+    )
+    pending = deque()
+    try:
+        for batch in batches:
+            pending.append((len(batch), executor.submit(_validate_batch, batch)))
+            if len(pending) >= workers * 2:
+                batch_size, future = pending.popleft()
+                yield batch_size, future.result()
+        while pending:
+            batch_size, future = pending.popleft()
+            yield batch_size, future.result()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+_worker_known_fingerprints = None
+
+
+def _init_validation_worker(known_fingerprints):
+    global _worker_known_fingerprints
+    _worker_known_fingerprints = known_fingerprints
+    # Connections inherited from the parent process must not be used or closed here
+    if database.engine is not None:
+        database.engine.dispose(close=False)
+
+
+def _validate_batch(batch, known_fingerprints=None):
+    if known_fingerprints is None:
+        known_fingerprints = _worker_known_fingerprints
+    validated_entries, validation_errors, unchanged_wam_ids = validate_entries(
+        batch, known_fingerprints
+    )
+    return (
+        [_record_row(validated) for validated in validated_entries],
+        validation_errors,
+        unchanged_wam_ids,
+    )
+
+
+def _is_unchanged(raw_entry, known_fingerprints):
+    """Check a raw entry against the stored fingerprint for its wam_id."""
+    if not known_fingerprints:
+        return False
+    wam_id = raw_entry.get("wamId")
+    # Anything other than a plain int needs validating (e.g. "12" or True)
+    if type(wam_id) is not int:
+        return False
+    known = known_fingerprints.get(wam_id)
+    return known is not None and known == source_fingerprint(raw_entry)
+
+
+def load_fingerprints():
+    """
+    Load the source fingerprint of every saved record in one query.
+
+    Returns:
+        dict: {wam_id: source_fingerprint}
+    """
+    return dict(
+        database.db_session.query(
+            ArchiveRecord.wam_id, ArchiveRecord.source_fingerprint
+        ).filter(ArchiveRecord.source_fingerprint.is_not(None))
+    )
+
+
+def save_entries(
+    validated_rows, total_valid_entries, commit_batch_size, dry_run, report=None
+):
+    """
+    Stage validated entries in batches, ready to be published by publish_entries().
+
+    New and changed entries are written to archive_records_stage with a single
+    multi-row upsert per commit batch, leaving archive_records untouched until the
+    sync is published. Existing hashes are read first so unchanged entries are
+    counted as skipped and left out of the write.
+
+    Args:
+        validated_rows: List of archive_records rows from _record_row()
         total_valid_entries: Total count of validated entries (for progress indicator)
         commit_batch_size: Number of entries per database transaction
         dry_run: If True, skip database writes while running save logic
+        report: SyncReport to add the write time of each commit batch to
 
     Returns:
         dict: {
@@ -302,39 +831,54 @@ def save_entries(validated_entries, total_valid_entries, commit_batch_size, dry_
     save_stats = {"created": 0, "updated": 0, "skipped": 0, "database_errors": 0}
 
     # Process entries in batches to commit incrementally
-    for batch_start in range(0, len(validated_entries), commit_batch_size):
-        batch_end = min(batch_start + commit_batch_size, len(validated_entries))
-        batch = validated_entries[batch_start:batch_end]
+    for batch_start in range(0, len(validated_rows), commit_batch_size):
+        batch_end = min(batch_start + commit_batch_size, len(validated_rows))
+        batch = validated_rows[batch_start:batch_end]
 
         try:
-            # Bulk load existing records for this batch (1 query instead of N queries)
-            batch_wam_ids = [v.wam_id for v in batch]
+            # Bulk load existing hashes for this batch (1 query instead of N queries)
+            batch_wam_ids = [row["wam_id"] for row in batch]
             existing_records = {
                 r.wam_id: r
-                for r in database.db_session.query(ArchiveRecord)
-                .filter(ArchiveRecord.wam_id.in_(batch_wam_ids))
-                .all()
+                for r in database.db_session.query(
+                    ArchiveRecord.wam_id,
+                    ArchiveRecord.record_hash,
+                    ArchiveRecord.source_fingerprint,
+                ).filter(ArchiveRecord.wam_id.in_(batch_wam_ids))
             }
 
-            # Disable autoflush for performance (flush only on commit)
-            with database.db_session.no_autoflush:
-                for validated in batch:
-                    result = save_entry(validated, existing_records, dry_run)
-                    save_stats[result] += 1
-
-                    processed = (
-                        save_stats["created"]
-                        + save_stats["updated"]
-                        + save_stats["skipped"]
-                    )
-                    if processed % 1000 == 0:
-                        click.echo(f"  Processed {processed}/{total_valid_entries}...")
+            changed_rows = []
+            for row in batch:
+                result = _change_type(row, existing_records)
+                save_stats[result] += 1
+                # Unchanged records are still written if only their raw fingerprint
+                # differs (e.g. whitespace) so they can skip validation next time
+                if (
+                    result != "skipped"
+                    or existing_records[row["wam_id"]].source_fingerprint
+                    != row["source_fingerprint"]
+                ):
+                    changed_rows.append(row)
+
+                processed = (
+                    save_stats["created"]
+                    + save_stats["updated"]
+                    + save_stats["skipped"]
+                )
+                if processed % 1000 == 0:
+                    click.echo(f"  Processed {processed}/{total_valid_entries}...")
 
-            # Commit batch
-            if not dry_run:
+            # Write and commit batch
+            if changed_rows and not dry_run:
+                write_start = time.perf_counter()
+                database.db_session.execute(_stage_statement(), changed_rows)
                 database.db_session.commit()
-                # Clear session cache to free memory
-                database.db_session.expire_all()
+                if report is not None:
+                    report.add_batch(
+                        "write",
+                        time.perf_counter() - write_start,
+                        rows=len(changed_rows),
+                    )
 
         except SQLAlchemyError as e:
             database.db_session.rollback()
@@ -350,112 +894,540 @@ def save_entries(validated_entries, total_valid_entries, commit_batch_size, dry_
     return save_stats
 
 
-def delete_entries(query, dry_run):
+def publish_entries(
+    source_wam_ids, dry_run, chunk_size=DELETE_CHUNK_SIZE, source_url=""
+):
     """
-    Delete database entries from a pre-filtered query.
+    Apply staged entries to archive_records and delete entries not in the source.
+
+    Everything happens in one transaction, so readers see either the previous or
+    the new set of records and never a partly synced one. If any records change,
+    the data generation is incremented in the same transaction, whether or not
+    every batch of the sync was staged.
+
+    The source wam_ids are bulk loaded into a temporary table and stale records are
+    found with an anti-join, rather than binding every wam_id into a NOT IN clause.
+    Records are deleted in chunks.
 
     Args:
-        query: SQLAlchemy query of ArchiveRecord entries to delete
+        source_wam_ids: Iterable of every wam_id in the source
         dry_run: If True, count deletions without writing to database
+        chunk_size: Number of wam_ids loaded, and records deleted, per statement
+        source_url: URL of the feed, recorded if there is no sync state yet
 
     Returns:
-        int: Number of entries deleted (or that would be deleted in dry run), or -1 if
-        deletion failed
+        dict: {
+            "deleted": int (entries deleted, or that would be deleted in dry run, or -1
+                if publishing failed),
+            "changed_characters": set of first_character values whose records were
+                created, changed or deleted
+        }
     """
     if not dry_run:
-        click.echo("\nRemoving entries not in source...")
+        click.echo("\nPublishing entries and removing entries not in source...")
 
-    try:
-        record_count = query.count()
+    stale_ids = select(ArchiveRecord.id).where(
+        ~exists().where(_source_ids.c.wam_id == ArchiveRecord.wam_id)
+    )
+    connection = database.db_session.connection()
 
+    try:
+        _source_ids.drop(connection, checkfirst=True)
+        _source_ids.create(connection)
+        _load_source_ids(connection, source_wam_ids, chunk_size)
+        changed_characters = _changed_characters(connection, stale_ids)
+
+        if dry_run:
+            record_count = connection.scalar(
+                select(func.count()).select_from(stale_ids.subquery())
+            )
+        else:
+            record_count = 0
+            while True:
+                deleted = connection.execute(
+                    delete(ArchiveRecord).where(
+                        ArchiveRecord.id.in_(stale_ids.limit(chunk_size))
+                    )
+                ).rowcount
+                record_count += deleted
+                if deleted < chunk_size:
+                    break
+
+            published = connection.execute(_upsert_statement()).rowcount
+            connection.execute(delete(ArchiveRecordStage))
+            connection.execute(delete(ArchiveSyncCheckpoint))
+            if changed_characters:
+                _start_generation(source_url)
+
+        _source_ids.drop(connection)
+        database.db_session.commit()
         if not dry_run:
-            query.delete(synchronize_session=False)
-            database.db_session.commit()
+            click.echo(f"Published {published} new and changed entries")
             if record_count:
                 click.echo(f"Deleted {record_count} entries not in source")
-        return record_count
+        return {"deleted": record_count, "changed_characters": changed_characters}
     except SQLAlchemyError as e:
+        database.db_session.rollback()
         if not dry_run:
-            database.db_session.rollback()
-            logger.error("Database error deleting removed entries: %s", str(e))
-            click.secho(f"Failed to delete removed entries: {e}", fg="red")
-        return -1
+            logger.error("Database error publishing synced entries: %s", str(e))
+            click.secho(f"Failed to publish synced entries: {e}", fg="red")
+        return {"deleted": -1, "changed_characters": set()}
+
+
+def _start_generation(source_url):
+    """Increment the data generation, in the transaction publishing the changes."""
+    sync_state = get_sync_state()
+    if sync_state is None:
+        # The rest of the state is recorded once the sync has finished
+        database.db_session.add(ArchiveSyncState(source_url=source_url, generation=1))
+    else:
+        sync_state.generation = ArchiveSyncState.generation + 1
+
+
+def _changed_characters(connection, stale_ids):
+    """
+    Find the first_character buckets that publishing the staged entries and deleting
+    stale_ids will change, including the previous bucket of renamed records.
+    """
+    stage = ArchiveRecordStage
+    changed = connection.execute(
+        select(stage.first_character, ArchiveRecord.first_character)
+        .outerjoin(ArchiveRecord, ArchiveRecord.wam_id == stage.wam_id)
+        .where(
+            or_(
+                ArchiveRecord.id.is_(None),
+                ArchiveRecord.record_hash != stage.record_hash,
+            )
+        )
+        .distinct()
+    )
+    deleted = connection.scalars(
+        select(ArchiveRecord.first_character)
+        .where(ArchiveRecord.id.in_(stale_ids))
+        .distinct()
+    )
+    characters = {character for row in changed for character in row}
+    characters.update(deleted)
+    characters.discard(None)
+    return characters
+
+
+def clear_stage():
+    """Delete all staged entries and checkpoints."""
+    database.db_session.execute(delete(ArchiveRecordStage))
+    database.db_session.execute(delete(ArchiveSyncCheckpoint))
+    database.db_session.commit()
 
 
-def load_data(url):
+def save_checkpoint(url, digest, stats, batch_wam_ids):
     """
-    Load JSON data from URL.
+    Record that a batch of the feed has been staged.
 
     Args:
-        url: URL to fetch JSON data from
+        url: URL the feed was fetched from
+        digest: SHA-256 digest of the feed
+        stats: Sync stats as of the end of the batch
+        batch_wam_ids: array('q') of the wam_ids of the valid entries in the batch
+    """
+    database.db_session.add(
+        ArchiveSyncCheckpoint(
+            source_url=url,
+            feed_digest=digest,
+            entries_processed=stats["total"],
+            stats=json.dumps(stats),
+            wam_ids=batch_wam_ids.tobytes(),
+        )
+    )
+    try:
+        database.db_session.commit()
+    except SQLAlchemyError as e:
+        database.db_session.rollback()
+        logger.error("Failed to save archive sync checkpoint: %s", str(e))
+        click.secho(f"Failed to save checkpoint: {e}", fg="red")
+
+
+def load_checkpoint(url, digest):
+    """
+    Load the checkpoints saved by an interrupted sync of the same feed.
+
+    Args:
+        url: URL the feed was fetched from
+        digest: SHA-256 digest of the feed
 
     Returns:
-        list: Parsed JSON array of archive entries
+        dict: {
+            "entries_processed": int,
+            "stats": dict,
+            "wam_ids": array('q') of the valid wam_ids in every staged batch
+        }, or None if there are no checkpoints for the feed
+    """
+    checkpoints = (
+        database.db_session.query(ArchiveSyncCheckpoint)
+        .filter(
+            ArchiveSyncCheckpoint.source_url == url,
+            ArchiveSyncCheckpoint.feed_digest == digest,
+        )
+        .order_by(ArchiveSyncCheckpoint.entries_processed)
+        .all()
+    )
+    if not checkpoints:
+        return None
+
+    wam_ids = array("q")
+    for checkpoint in checkpoints:
+        wam_ids.frombytes(checkpoint.wam_ids)
+    return {
+        "entries_processed": checkpoints[-1].entries_processed,
+        "stats": json.loads(checkpoints[-1].stats),
+        "wam_ids": wam_ids,
+    }
+
+
+def _load_source_ids(connection, source_wam_ids, chunk_size):
+    """Insert wam_ids into the temporary source IDs table, ignoring duplicates."""
+    insert = _dialect_insert(connection.dialect.name)
+    statement = insert(_source_ids).on_conflict_do_nothing().compile(connection)
+    # Executed directly on the driver, as building SQLAlchemy parameters for every
+    # row costs several times more than the insert itself
+    wam_ids = iter(source_wam_ids)
+    while chunk := list(islice(wam_ids, chunk_size)):
+        if statement.positional:
+            params = [(wam_id,) for wam_id in chunk]
+        else:
+            params = [{"wam_id": wam_id} for wam_id in chunk]
+        connection.exec_driver_sql(str(statement), params)
+
+
+def fetch_feed(url, sync_state=None):
+    """
+    Fetch the JSON feed from a URL, local file or stdin, computing its digest.
+
+    HTTP(S) responses and stdin are spooled to a temporary file, while local files
+    are read in place. gzip and zstd compressed feeds are kept compressed, to be
+    decompressed as they are parsed, so the digest is of the compressed bytes.
+
+    If sync_state is for the same URL, HTTP(S) requests are made conditional on the
+    ETag and Last-Modified values from the last successful sync.
+
+    Args:
+        url: http(s):// or file:// URL, local path, or "-" to read from stdin
+        sync_state: ArchiveSyncState from the last successful sync, or None
+
+    Returns:
+        dict: {
+            "file": file object containing the feed,
+            "etag": str | None,
+            "last_modified": str | None,
+            "digest": str,
+            "size": int (bytes, as fetched),
+            "compression": "gzip" | "zstd" | None
+        }, or None if the server responded 304 Not Modified
 
     Raises:
         requests.RequestException: If HTTP request fails
-        json.JSONDecodeError: If response is not valid JSON
+        OSError: If a local file or stdin can't be read
     """
+    if url == "-":
+        click.echo("Reading data from stdin...")
+        feed = _spool_feed(iter(partial(sys.stdin.buffer.read, FEED_CHUNK_SIZE), b""))
+        feed["compression"] = detect_compression("", _peek(feed["file"]))
+        return feed
+
+    scheme = urlparse(url).scheme
+    if scheme in ("http", "https"):
+        return _fetch_http_feed(url, sync_state)
+
+    path = url2pathname(urlparse(url).path) if scheme == "file" else url
+    click.echo(f"Reading data from {path}...")
+    digest = hashlib.sha256()
+    size = 0
+    with ExitStack() as stack:
+        feed_file = stack.enter_context(open(path, "rb"))
+        for chunk in iter(partial(feed_file.read, FEED_CHUNK_SIZE), b""):
+            digest.update(chunk)
+            size += len(chunk)
+        feed_file.seek(0)
+        compression = detect_compression(path, _peek(feed_file))
+        # Left open for the caller, the file is only closed if it can't be read
+        stack.pop_all()
+
+    return {
+        "file": feed_file,
+        "etag": None,
+        "last_modified": None,
+        "digest": digest.hexdigest(),
+        "size": size,
+        "compression": compression,
+    }
+
+
+def _fetch_http_feed(url, sync_state):
+    headers = {"Accept-Encoding": accept_encoding()}
+    if sync_state is not None and sync_state.source_url == url:
+        if sync_state.etag:
+            headers["If-None-Match"] = sync_state.etag
+        if sync_state.last_modified:
+            headers["If-Modified-Since"] = sync_state.last_modified
+
     click.echo(f"Fetching data from {url}...")
-    response = requests.get(url, timeout=60)
-    response.raise_for_status()
-    return response.json()
+    with requests.get(url, headers=headers, timeout=60, stream=True) as response:
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+
+        # gzip and zstd bodies are spooled as they are, any other encoding is decoded
+        content_encoding = response.headers.get("Content-Encoding", "").strip().lower()
+        compression = CONTENT_ENCODINGS.get(content_encoding)
+        feed = _spool_feed(_iter_body(response, decode_content=compression is None))
+
+    feed["etag"] = response.headers.get("ETag")
+    feed["last_modified"] = response.headers.get("Last-Modified")
+    feed["compression"] = compression or detect_compression(
+        urlparse(url).path, _peek(feed["file"])
+    )
+    return feed
+
+
+def _iter_body(response, decode_content):
+    # As response.iter_content(), which always decodes the body
+    try:
+        yield from response.raw.stream(FEED_CHUNK_SIZE, decode_content=decode_content)
+    except ProtocolError as e:
+        raise requests.exceptions.ChunkedEncodingError(e) from e
+    except DecodeError as e:
+        raise requests.exceptions.ContentDecodingError(e) from e
+    except ReadTimeoutError as e:
+        raise requests.exceptions.ConnectionError(e) from e
+
+
+def _spool_feed(chunks):
+    # Spool to disk rather than memory so large feeds can be hashed before parsing
+    digest = hashlib.sha256()
+    size = 0
+    with ExitStack() as stack:
+        feed_file = stack.enter_context(tempfile.TemporaryFile())
+        for chunk in chunks:
+            digest.update(chunk)
+            feed_file.write(chunk)
+            size += len(chunk)
+        stack.pop_all()
+    feed_file.seek(0)
+
+    return {
+        "file": feed_file,
+        "etag": None,
+        "last_modified": None,
+        "digest": digest.hexdigest(),
+        "size": size,
+    }
+
 
+def _peek(feed_file, size=4):
+    head = feed_file.read(size)
+    feed_file.seek(0)
+    return head
 
-def save_entry(validated: ArchiveRecordSchema, existing_records: dict, dry_run=False):
+
+def load_data(feed_file, compression=None):
     """
-    Save or update an entry in the database using hash-based change detection.
+    Stream JSON data from a fetched feed.
+
+    The file is read in chunks, decompressing it if needed, and parsed incrementally,
+    so only the entries currently being processed are held in memory.
 
     Args:
-        validated: Validated ArchiveRecordSchema object
-        existing_records: Dict of {wam_id: ArchiveRecord} for lookups
-        dry_run: If True, determine what would happen without writing to database
+        feed_file: Binary file object containing the JSON feed
+        compression: "gzip", "zstd" or None if the feed is not compressed
 
-    Returns: 'created', 'updated', or 'skipped'
+    Returns:
+        iterator: Archive entries from the JSON array, in feed order
+
+    Raises:
+        json.JSONDecodeError: While iterating, if the feed is not a valid JSON array
+        FeedCompressionError: While iterating, if the feed can't be decompressed
+    """
+    return iter_json_array(iter_feed_chunks(feed_file, compression))
+
+
+def get_sync_state():
+    """Get the state recorded by the last successful sync, if any."""
+    return database.db_session.query(ArchiveSyncState).first()
+
+
+def save_sync_state(sync_state, url, feed):
+    """
+    Record the feed that has just been synced so unchanged feeds can be skipped.
+
+    The generation is left as it is, as publish_entries() increments it.
+
+    Args:
+        sync_state: Existing ArchiveSyncState to update, or None to create one
+        url: URL the feed was fetched from
+        feed: Feed dict returned by fetch_feed, or None if it was not modified
+    """
+    if sync_state is None:
+        sync_state = ArchiveSyncState(generation=0)
+        database.db_session.add(sync_state)
+
+    if feed is not None:
+        sync_state.source_url = url
+        sync_state.etag = feed["etag"]
+        sync_state.last_modified = feed["last_modified"]
+        sync_state.feed_digest = feed["digest"]
+    sync_state.last_synced_at = datetime.now(timezone.utc)
+
+    try:
+        database.db_session.commit()
+    except SQLAlchemyError as e:
+        database.db_session.rollback()
+        logger.error("Failed to save archive sync state: %s", str(e))
+        click.secho(f"Failed to save sync state: {e}", fg="red")
+
+
+def _change_type(row: dict, existing_records: dict):
     """
-    # Get data excluding wam_id
-    data = validated.model_dump(mode="json", by_alias=False, exclude={"wam_id"})
+    Work out how an entry will be saved using hash-based change detection.
 
-    # Check if record exists
-    existing = existing_records.get(validated.wam_id)
+    Args:
+        row: archive_records row from _record_row()
+        existing_records: Dict of {wam_id: row with record_hash} for saved records
 
-    if dry_run:
-        if existing is None:
-            return "created"
-        if existing.record_hash == validated.record_hash:
-            return "skipped"
-        return "updated"
+    Returns: 'created', 'updated', or 'skipped'
+    """
+    existing = existing_records.get(row["wam_id"])
 
     if existing is None:
-        # Create new record
-        new_record = ArchiveRecord(wam_id=validated.wam_id, **data)
-        database.db_session.add(new_record)
         return "created"
-
-    # Check if changed (hash-based change detection)
-    if existing.record_hash == validated.record_hash:
+    if existing.record_hash == row["record_hash"]:
         return "skipped"
+    return "updated"
 
-    # Update existing record
-    for field, value in data.items():
-        setattr(existing, field, value)
 
-    return "updated"
+def _record_row(validated: ArchiveRecordSchema):
+    """Get the archive_records column values for a validated entry."""
+    return validated.to_row()
 
 
-def _clear_cache(dry_run: bool):
+def _stage_statement():
+    """
+    Build an INSERT ... ON CONFLICT (wam_id) DO UPDATE statement for
+    archive_records_stage, executed with a list of rows from _record_row().
+
+    Entries are upserted so a batch can be staged again when resuming a sync that
+    was interrupted before its checkpoint was saved.
+    """
+    insert = _dialect_insert(database.db_session.get_bind().dialect.name)
+    stage = ArchiveRecordStage.__table__
+    statement = insert(stage)
+    return statement.on_conflict_do_update(
+        index_elements=[stage.c.wam_id],
+        set_={
+            column.name: statement.excluded[column.name]
+            for column in stage.columns
+            if column.name not in ("id", "wam_id", "created_at")
+        },
+    )
+
+
+def _upsert_statement():
+    """
+    Build an INSERT ... SELECT ... ON CONFLICT (wam_id) DO UPDATE statement copying
+    staged entries into archive_records.
+
+    Existing rows are only rewritten when their record_hash or source_fingerprint
+    differs from the staged one.
+    """
+    insert = _dialect_insert(database.db_session.get_bind().dialect.name)
+    table = ArchiveRecord.__table__
+    stage = ArchiveRecordStage.__table__
+    columns = [
+        column.name
+        for column in table.columns
+        if column.name not in ("id", "created_at", "updated_at")
+    ]
+    now = datetime.now(timezone.utc)
+
+    # SQLite needs a WHERE clause to tell ON CONFLICT apart from a join constraint
+    statement = insert(table).from_select(
+        [*columns, "created_at", "updated_at"],
+        select(
+            *(stage.c[name] for name in columns),
+            literal(now, DateTime()),
+            literal(now, DateTime()),
+        ).where(true()),
+    )
+    updated_columns = {
+        name: statement.excluded[name] for name in columns if name != "wam_id"
+    }
+    updated_columns["updated_at"] = now
+
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.wam_id],
+        set_=updated_columns,
+        where=or_(
+            table.c.record_hash != statement.excluded.record_hash,
+            table.c.source_fingerprint.is_distinct_from(
+                statement.excluded.source_fingerprint
+            ),
+        ),
+    )
+
+
+def _dialect_insert(dialect):
+    """Get the insert() construct supporting ON CONFLICT for a database dialect."""
+    if dialect == "postgresql":
+        return postgresql.insert
+    if dialect == "sqlite":
+        return sqlite.insert
+    raise NotImplementedError(f"Upserts are not supported for {dialect}")
+
+
+def _clear_cache(dry_run: bool, characters=None):
     """
     Clear the archive service cache.
 
+    When the characters changed by a sync are given, only their listings are cleared,
+    and the rest keep their cache entries. The first pages of the listings that are
+    cleared are rendered and cached again straight away, so visitors never start
+    from a cold listing. Cached searches are always cleared.
+
     Args:
         dry_run: If True, skip cache clearing
+        characters: first_character values to refresh, or None to clear everything
     """
     if not dry_run:
-        click.echo("\nClearing archive caches...")
+        if characters is None:
+            click.echo("\nClearing archive caches...")
+        elif not characters:
+            click.echo("\nNo archive listings changed, keeping caches")
+            return
+        else:
+            click.echo(
+                f"\nRefreshing archive caches for: {', '.join(sorted(characters))}"
+            )
         try:
             cache.delete("archive:characters")
-            cache.delete_memoized(get_records_by_character)
-            click.echo("Caches cleared")
+            # Any change can change the results of any search
+            invalidate_search()
+            invalidate_listings(characters)
+
+            # Read from the primary database, as a read replica may not have the
+            # changes yet, and what is cached now is kept
+            available_characters = list_available_characters(database.db_session)
+            cache.set("archive:characters", available_characters)
+            pages = 0
+            for character in available_characters:
+                if characters is not None and character not in characters:
+                    continue
+                pages += prerender_listing(character, database.db_session)
+                # Workers with snapshots read listings from them instead
+                if not current_app.config["ARCHIVE_SNAPSHOT"]:
+                    # The first page, which every visit to the listing starts from
+                    cache_records_page(character, session=database.db_session)
+            click.echo(
+                f"Caches {'cleared' if characters is None else 'refreshed'}, "
+                f"{pages} listing pages rendered"
+            )
         except Exception as e:
             logger.error("Failed to clear archive caches: %s", str(e))
             click.secho(f"Failed to clear caches: {e}")
@@ -463,6 +1435,10 @@ def _clear_cache(dry_run: bool):
 
 def _rebuild_fts_index(dry_run: bool):
     """Rebuild FTS5 search index from archive_records content table."""
+    if database.db_session.get_bind().dialect.name != "sqlite":
+        # PostgreSQL's search_vector is a generated column, so is never out of date
+        click.echo("\nSearch index does not need rebuilding")
+        return
     if not dry_run:
         click.echo("\nRebuilding search index...")
         try:
@@ -472,6 +1448,8 @@ def _rebuild_fts_index(dry_run: bool):
                 )
             )
             database.db_session.commit()
+            # Searches of an index that was out of step could have been cached
+            invalidate_search()
             click.echo("Search index rebuilt")
         except Exception as e:
             logger.error("Failed to rebuild FTS5 index: %s", str(e))
@@ -1,6 +1,62 @@
+from datetime import datetime, timezone
+
+from flask import current_app, jsonify
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
 from app.healthcheck import bp
+from app.lib import database
+from app.lib.models import ArchiveSyncState
 
 
 @bp.route("/live/")
 def healthcheck():
     return "ok"
+
+
+@bp.route("/ready/")
+def ready():
+    """
+    Report whether the archive data can be served, and how fresh it is.
+
+    Ready once the database is reachable and a sync has completed, so a new
+    container can serve the last synced data while its own sync runs.
+
+    Returns:
+        JSON response (200 if ready, otherwise 503) with format:
+        {
+            "ready": true,
+            "database": true,
+            "generation": 3,
+            "last_synced_at": "2025-01-01T00:00:00+00:00",
+            "age_seconds": 1234.5
+        }
+    """
+    status = {
+        "ready": False,
+        "database": False,
+        "generation": None,
+        "last_synced_at": None,
+        "age_seconds": None,
+    }
+    try:
+        database.read_session.execute(text("SELECT 1"))
+        status["database"] = True
+        sync_state = database.read_session.query(ArchiveSyncState).first()
+    except SQLAlchemyError as e:
+        current_app.logger.error(f"Readiness check failed to query database: {e}")
+        sync_state = None
+
+    if sync_state is not None and sync_state.last_synced_at is not None:
+        last_synced_at = sync_state.last_synced_at.replace(tzinfo=timezone.utc)
+        status["ready"] = True
+        status["generation"] = sync_state.generation
+        status["last_synced_at"] = last_synced_at.isoformat()
+        status["age_seconds"] = (
+            datetime.now(timezone.utc) - last_synced_at
+        ).total_seconds()
+
+    response = jsonify(status)
+    response.status_code = 200 if status["ready"] else 503
+    response.cache_control.no_store = True
+    return response
@@ -1,26 +1,57 @@
+import base64
+import hashlib
+import json
 import re
+import uuid
+from collections import namedtuple
 
 from flask import current_app
-from sqlalchemy import func, text
-from sqlalchemy.exc import OperationalError
+from sqlalchemy import func, select, text, tuple_
+from sqlalchemy.exc import OperationalError, ProgrammingError
 
 from app.lib import database
+from app.lib.archive_snapshot import ArchiveSnapshot, SnapshotHolder
 from app.lib.cache import cache
-from app.lib.models import ArchiveRecord
+from app.lib.models import ArchiveRecord, ArchiveSyncState
 from app.lib.util import ARCHIVE_SEARCH_MAX_LENGTH
 
+# Listing versions outlive the cached pages they are part of the keys of, which
+# expire after CACHE_DEFAULT_TIMEOUT, as caches with a threshold (e.g.
+# FileSystemCache) evict the entries that expire soonest first
+LISTING_VERSION_TIMEOUT = 24 * 60 * 60
+
 
-@cache.cached(timeout=0, key_prefix="archive:characters")
 def get_available_characters():
     """
-    Get list of characters that have archive records.
+    Get list of characters that have archive records, from the snapshot or cache.
 
     Returns:
         list: Sorted list of unique first characters (e.g., ['0-9', 'a', 'b', ...])
     """
+    if current_app.config["ARCHIVE_SNAPSHOT"]:
+        return list(get_snapshot().characters)
+    return _get_cached_available_characters()
+
+
+@cache.cached(key_prefix="archive:characters")
+def _get_cached_available_characters():
+    return list_available_characters()
+
+
+def list_available_characters(session=None):
+    """
+    Get list of characters that have archive records, from the database.
+
+    Args:
+        session: Session to read from, or None for the read session
+
+    Returns:
+        list: Sorted list of unique first characters (e.g., ['0-9', 'a', 'b', ...])
+    """
+    session = session or database.read_session
     try:
         characters = (
-            database.db_session.query(ArchiveRecord.first_character)
+            session.query(ArchiveRecord.first_character)
             .distinct()
             .order_by(ArchiveRecord.first_character)
             .all()
@@ -31,59 +62,360 @@ def get_available_characters():
         raise
 
 
-@cache.memoize(timeout=0)
-def get_records_by_character(character):
+# Columns of each record in a character listing
+LISTING_COLUMNS = (
+    ArchiveRecord.id,
+    ArchiveRecord.profile_name,
+    ArchiveRecord.record_url,
+    ArchiveRecord.archive_link,
+    ArchiveRecord.domain_type,
+    ArchiveRecord.first_capture_display,
+    ArchiveRecord.latest_capture_display,
+    ArchiveRecord.ongoing,
+    ArchiveRecord.wam_id,
+    ArchiveRecord.description,
+    ArchiveRecord.sort_name,
+    ArchiveRecord.first_character,
+)
+
+# A record in a snapshot, with the listing columns
+ListingRecord = namedtuple("ListingRecord", [column.key for column in LISTING_COLUMNS])
+
+
+def character_listing_query(character, direction="after", position=None):
     """
-    Get archive records filtered by first character.
+    Build the query for the records of a character listing, in (sort_name, id) order.
+
+    Only the listing columns are selected, and the rows are read in index order
+    from ix_archive_records_first_character_sort_name_id, so no sort is needed.
 
     Args:
         character: Character to filter by (e.g., 'a', '0-9')
+        direction: "after" for the records following position in order, or
+            "before" for the records preceding it, in reverse order
+        position: (sort_name, id) of the record to start from, or None to start
+            from the first record
 
     Returns:
-        dict: Dictionary with 'items' (list of records) and 'meta' (pagination info)
+        Select: The query
     """
-    try:
-        # Build base query
-        query = (
-            database.db_session.query(ArchiveRecord)
-            .filter(ArchiveRecord.first_character == character)
-            .order_by(ArchiveRecord.sort_name)
+    key = tuple_(ArchiveRecord.sort_name, ArchiveRecord.id)
+    query = select(*LISTING_COLUMNS).where(ArchiveRecord.first_character == character)
+    if direction == "before":
+        return query.where(key < tuple_(*position)).order_by(
+            ArchiveRecord.sort_name.desc(), ArchiveRecord.id.desc()
         )
+    if position is not None:
+        query = query.where(key > tuple_(*position))
+    return query.order_by(ArchiveRecord.sort_name, ArchiveRecord.id)
+
+
+class InvalidCursorError(ValueError):
+    """A listing cursor that wasn't made by encode_cursor()."""
+
 
-        total_count = query.count()
-        records = query.all()
-
-        # Convert to dictionaries
-        items = [
-            {
-                "id": record.id,
-                "profile_name": record.profile_name,
-                "record_url": record.record_url,
-                "archive_link": record.archive_link,
-                "domain_type": record.domain_type,
-                "first_capture_display": record.first_capture_display,
-                "latest_capture_display": record.latest_capture_display,
-                "ongoing": record.ongoing,
-                "wam_id": record.wam_id,
-                "description": record.description,
-                "sort_name": record.sort_name,
-                "first_character": record.first_character,
-            }
-            for record in records
-        ]
-
-        return {
-            "items": items,
-            "meta": {
-                "total_count": total_count,
-            },
-        }
+def encode_cursor(direction, record):
+    """
+    Make an opaque cursor for the records after or before a record in a listing.
+
+    Args:
+        direction: "after" or "before"
+        record: Listing record dict, with sort_name and id
+
+    Returns:
+        str: URL safe cursor
+    """
+    value = json.dumps([direction, record["sort_name"], record["id"]])
+    return base64.urlsafe_b64encode(value.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Read a cursor made by encode_cursor().
+
+    Args:
+        cursor: Cursor from a listing's meta
+
+    Returns:
+        tuple: direction and the (sort_name, id) position
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    try:
+        value = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        direction, sort_name, record_id = json.loads(value)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError(f"Invalid cursor '{cursor}'") from e
+    if (
+        direction not in ("after", "before")
+        or not isinstance(sort_name, str)
+        or not isinstance(record_id, int)
+    ):
+        raise InvalidCursorError(f"Invalid cursor '{cursor}'")
+    return direction, (sort_name, record_id)
+
+
+def get_records_page(character, cursor=None, limit=None, session=None):
+    """
+    Get a page of archive records filtered by first character, without caching.
+
+    Pages are found by keyset (the (sort_name, id) of the record the cursor was made
+    from) rather than by offset, so every page is as quick to get as the first.
+
+    Args:
+        character: Character to filter by (e.g., 'a', '0-9')
+        cursor: next_cursor or previous_cursor of another page, or None for the
+            first page
+        limit: Maximum number of records, or None for all of them
+        session: Session to read from, or None for the read session
+
+    Returns:
+        dict: Dictionary with 'items' (list of records) and 'meta' (total_count,
+        limit and the next_cursor and previous_cursor, if there are more records)
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    session = session or database.read_session
+    direction, position = decode_cursor(cursor) if cursor else ("after", None)
+    try:
+        query = character_listing_query(character, direction, position)
+        if limit is not None:
+            # One more than the limit to find out if there is another page
+            query = query.limit(limit + 1)
+        # Plain rows rather than ORM entities, so there is no identity map to fill
+        items = [dict(row) for row in session.execute(query).mappings()]
+        total_count = session.scalar(
+            select(func.count())
+            .select_from(ArchiveRecord)
+            .where(ArchiveRecord.first_character == character)
+        )
     except Exception as e:
         current_app.logger.error(
             f"Failed to get archive records for character '{character}': {e}"
         )
         raise
 
+    more = limit is not None and len(items) > limit
+    items = items[:limit]
+    if direction == "before":
+        items.reverse()
+    return _listing_page(items, total_count, limit, direction, position, more)
+
+
+def _listing_page(items, total_count, limit, direction, position, more):
+    """
+    Build a page of a character listing.
+
+    Args:
+        items: Records of the page, in listing order
+        total_count: Number of records in the listing
+        limit: Maximum number of records in a page
+        direction: Direction of the cursor the page was found from
+        position: Position of the cursor the page was found from, or None
+        more: Whether there are more records beyond the page in the direction
+    """
+    if direction == "before":
+        has_next, has_previous = True, more
+    else:
+        has_next, has_previous = more, position is not None
+
+    return {
+        "items": items,
+        "meta": {
+            "total_count": total_count,
+            "limit": limit,
+            "next_cursor": (
+                encode_cursor("after", items[-1]) if items and has_next else None
+            ),
+            "previous_cursor": (
+                encode_cursor("before", items[0]) if items and has_previous else None
+            ),
+        },
+    }
+
+
+def get_records_by_character(character, cursor=None, limit=None):
+    """
+    Get a page of archive records filtered by first character, from the snapshot
+    or cache.
+
+    Without a snapshot, each page is cached separately for CACHE_DEFAULT_TIMEOUT,
+    along with the version of the character's listing, which invalidate_listings()
+    changes when the character's records do.
+
+    Args:
+        character: Character to filter by (e.g., 'a', '0-9')
+        cursor: next_cursor or previous_cursor of another page, or None for the
+            first page
+        limit: Maximum number of records, ARCHIVE_PAGE_SIZE if None, and at most
+            ARCHIVE_LIMIT_MAX
+
+    Returns:
+        dict: Dictionary with 'items' (list of records) and 'meta' (pagination info)
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    direction, position = decode_cursor(cursor) if cursor else ("after", None)
+    limit = _listing_limit(limit)
+    if current_app.config["ARCHIVE_SNAPSHOT"]:
+        snapshot = get_snapshot()
+        records, more = snapshot.listing_page(character, direction, position, limit)
+        return _listing_page(
+            [record._asdict() for record in records],
+            snapshot.listing_count(character),
+            limit,
+            direction,
+            position,
+            more,
+        )
+    return _get_cached_records_page(
+        character, _listing_version(character), cursor, limit
+    )
+
+
+@cache.memoize()
+def _get_cached_records_page(character, version, cursor, limit):
+    return get_records_page(character, cursor, limit)
+
+
+def cache_records_page(character, cursor=None, limit=None, session=None):
+    """
+    Cache a page of a character listing for get_records_by_character(), read from
+    the given session rather than the read session, which can lag behind the
+    primary database straight after a sync.
+
+    Args:
+        character: Character of the listing
+        cursor: Cursor of the page, or None for the first page
+        limit: Number of records, as for get_records_by_character()
+        session: Session to read from, or None for the read session
+    """
+    limit = _listing_limit(limit)
+    key = _get_cached_records_page.make_cache_key(
+        _get_cached_records_page.uncached,
+        character,
+        _listing_version(character),
+        cursor,
+        limit,
+    )
+    cache.set(key, get_records_page(character, cursor, limit, session))
+
+
+def _listing_limit(limit):
+    return min(
+        limit or current_app.config["ARCHIVE_PAGE_SIZE"],
+        current_app.config["ARCHIVE_LIMIT_MAX"],
+    )
+
+
+def _listing_version(character):
+    # Made of a version for every listing and one for the character's listing
+    return ".".join(
+        _cache_version(key)
+        for key in ("archive:listing-version", f"archive:listing-version:{character}")
+    )
+
+
+def _cache_version(key):
+    version = cache.get(key)
+    if version is None:
+        # Never fall back to a version whose pages could be out of date
+        version = uuid.uuid4().hex
+        if not cache.add(key, version, timeout=LISTING_VERSION_TIMEOUT):
+            version = cache.get(key) or version
+    return version
+
+
+def invalidate_listings(characters=None):
+    """
+    Make the cached and rendered pages of character listings out of date.
+
+    Args:
+        characters: first_character values whose records changed, or None for all
+    """
+    if characters is None:
+        keys = ["archive:listing-version"]
+    else:
+        keys = [f"archive:listing-version:{character}" for character in characters]
+    cache.set_many(
+        {key: uuid.uuid4().hex for key in keys}, timeout=LISTING_VERSION_TIMEOUT
+    )
+
+
+def get_listing_html(records):
+    """
+    Get the records of a page of a listing, as rendered by the sync or a previous
+    request.
+
+    Rendered records are kept under the records themselves, so they are only ever
+    used for the same records, whether these were read from a snapshot, the cache
+    or the database.
+
+    Args:
+        records: Records of the page
+
+    Returns:
+        str: The rendered records, or None if they have not been rendered within
+        CACHE_DEFAULT_TIMEOUT seconds
+    """
+    return cache.get(_listing_html_key(records))
+
+
+def set_listing_html(records, html):
+    """
+    Keep the rendered records of a page of a listing for CACHE_DEFAULT_TIMEOUT
+    seconds.
+
+    Args:
+        records: Records of the page
+        html: The rendered records
+    """
+    cache.set(_listing_html_key(records), html)
+
+
+def _listing_html_key(records):
+    digest = hashlib.sha256(json.dumps(records, sort_keys=True).encode()).hexdigest()
+    return f"archive:listing-html:{digest}"
+
+
+def render_listing_records(records):
+    """Render the records of a page of a listing, as the A-to-Z page would."""
+    template = current_app.jinja_env.get_template("components/atoz_records.html")
+    return str(template.module.atoz_records(records))
+
+
+def prerender_listing(character, session=None):
+    """
+    Render the first ARCHIVE_PRERENDER_PAGES pages of a character listing, which
+    most visits to the listing start from, for render_atoz_archive_page() to use.
+
+    Pages must be read from the primary database straight after a sync, as a read
+    replica can still hold the records from before it.
+
+    Args:
+        character: Character of the listing
+        session: Session to read from, or None for the read session
+
+    Returns:
+        int: The number of pages rendered
+    """
+    limit = current_app.config["ARCHIVE_PAGE_SIZE"]
+    cursor = None
+    pages = 0
+    while pages < current_app.config["ARCHIVE_PRERENDER_PAGES"]:
+        result = get_records_page(character, cursor, limit, session)
+        if not result["items"]:
+            break
+        set_listing_html(result["items"], render_listing_records(result["items"]))
+        pages += 1
+        cursor = result["meta"]["next_cursor"]
+        if cursor is None:
+            break
+    return pages
+
 
 def get_record_count():
     """
@@ -92,60 +424,254 @@ def get_record_count():
     Returns:
         int: Total number of records in database
     """
+    if current_app.config["ARCHIVE_SNAPSHOT"]:
+        return get_snapshot().record_count
     try:
-        count = database.db_session.query(func.count(ArchiveRecord.id)).scalar()
+        count = database.read_session.query(func.count(ArchiveRecord.id)).scalar()
         return count or 0
     except Exception as e:
         current_app.logger.error(f"Failed to get record count: {e}")
         raise
 
 
-def search_records(query):
+def get_snapshot():
+    """
+    Get this worker's snapshot of the character listings, made again whenever a
+    sync has changed the data generation since it was made.
+
+    The generation is checked at most once every ARCHIVE_SNAPSHOT_CHECK_INTERVAL
+    seconds, and a new snapshot made in the background, so requests only wait
+    for the first one.
+
+    Returns:
+        ArchiveSnapshot: The snapshot
     """
-    Full-text search across archive records (profile_name and description) using FTS5.
+    holder = current_app.extensions.get("archive_snapshot")
+    if holder is None:
+        holder = current_app.extensions.setdefault(
+            "archive_snapshot",
+            SnapshotHolder(
+                current_app.config["ARCHIVE_SNAPSHOT_CHECK_INTERVAL"],
+                teardown=_remove_read_session,
+            ),
+        )
+    try:
+        return holder.get(_data_generation, _load_snapshot)
+    except Exception as e:
+        current_app.logger.error(f"Failed to load archive snapshot: {e}")
+        raise
+
+
+def _remove_read_session():
+    database.read_session.remove()
+
+
+# Listing columns with the same few values for every record, of which a snapshot
+# keeps one copy of each value
+_SHARED_VALUE_COLUMNS = (
+    "domain_type",
+    "first_capture_display",
+    "latest_capture_display",
+    "first_character",
+)
+
+
+def _load_snapshot(generation):
+    shared_columns = [
+        index
+        for index, column in enumerate(LISTING_COLUMNS)
+        if column.key in _SHARED_VALUE_COLUMNS
+    ]
+    values = {}
+    records = []
+    for row in database.read_session.execute(select(*LISTING_COLUMNS)):
+        fields = list(row)
+        for index in shared_columns:
+            fields[index] = values.setdefault(fields[index], fields[index])
+        records.append(ListingRecord._make(fields))
+    return ArchiveSnapshot(generation, records)
+
+
+def _data_generation(session=None):
+    """Get the generation of the last sync that changed any records."""
+    session = session or database.read_session
+    return session.scalar(select(ArchiveSyncState.generation)) or 0
+
+
+def search_records(query, limit=None, offset=0):
+    """
+    Full-text search across archive records (profile_name, description and
+    archive_link), from the cache.
+
+    Pages are cached under the sanitised query, so queries that only differ in
+    characters _sanitize_fts_query() removes share them, and the data generation
+    of the last sync that changed any records, which invalidate_search() makes
+    searches look up again.
 
     Args:
         query: Search string (e.g. "government digital")
+        limit: Maximum number of records, ARCHIVE_PAGE_SIZE if None, and at most
+            ARCHIVE_LIMIT_MAX
+        offset: Number of matches to skip, from the best ranked
 
     Returns:
-        dict: Dictionary with 'items' (list of records) and 'meta' (count info)
+        dict: Dictionary with 'items' (list of records) and 'meta' (count and
+            pagination info). total_count is at most ARCHIVE_SEARCH_MAX_RESULTS,
+            and total_count_capped is True if more records than that match.
     """
+    limit = min(
+        limit or current_app.config["ARCHIVE_PAGE_SIZE"],
+        current_app.config["ARCHIVE_LIMIT_MAX"],
+        max(current_app.config["ARCHIVE_SEARCH_MAX_RESULTS"] - offset, 0),
+    )
     sanitised_query = _sanitize_fts_query(query)
-
     if not sanitised_query:
-        return {
-            "items": [],
-            "meta": {
-                "total_count": 0,
-            },
-        }
+        # Nothing to search for, so nothing to cache
+        return search_page(sanitised_query, limit, offset)
+    return _get_cached_search_page(sanitised_query, _search_generation(), limit, offset)
 
-    try:
-        sql = text("""
-            SELECT ar.*
-            FROM archive_records ar
-            INNER JOIN archive_records_fts fts ON ar.id = fts.rowid
-            WHERE archive_records_fts MATCH :query
-            ORDER BY rank, ar.sort_name
-        """)
 
-        result = database.db_session.execute(sql, {"query": sanitised_query})
-        rows = result.fetchall()
+@cache.memoize()
+def _get_cached_search_page(sanitised_query, generation, limit, offset):
+    return search_page(sanitised_query, limit, offset)
+
+
+def _search_generation():
+    generation = cache.get("archive:search-generation")
+    if generation is None:
+        # From the primary database, as a read replica may not have caught up with
+        # the sync that cleared it, and expiring, so it is never kept out of date
+        generation = _data_generation(database.db_session)
+        cache.add("archive:search-generation", generation)
+    return generation
+
+
+def invalidate_search():
+    """
+    Make every cached search out of date.
+
+    Searches look up the data generation again, so once a sync has published its
+    changes, pages cached for the previous generation are never used again and
+    are left to expire. Pages cached for the current generation are cleared too,
+    for when the cache is cleared without a sync.
+    """
+    cache.delete("archive:search-generation")
+    cache.delete_memoized(_get_cached_search_page)
+
+
+def search_page(sanitised_query, limit, offset):
+    """
+    Full-text search across archive records, using FTS5 on SQLite and a tsvector
+    column on PostgreSQL.
+
+    Only the first ARCHIVE_SEARCH_MAX_RESULTS matches can be paged through, and
+    matches are only counted up to that many, so the cost of a search does not
+    grow with how many records it matches.
+
+    Args:
+        sanitised_query: Search string from _sanitize_fts_query()
+        limit: Maximum number of records
+        offset: Number of matches to skip, from the best ranked
 
-        items = [dict(row._mapping) for row in rows]
+    Returns:
+        dict: Dictionary with 'items' (list of records) and 'meta' (count and
+            pagination info), as returned by search_records()
+    """
+    max_results = current_app.config["ARCHIVE_SEARCH_MAX_RESULTS"]
+    meta = {
+        "total_count": 0,
+        "total_count_capped": False,
+        "limit": limit,
+        "offset": offset,
+    }
+
+    query = sanitised_query
+    dialect = database.read_session.get_bind().dialect.name
+    if dialect == "postgresql":
+        query = _fts_to_tsquery(query)
+
+    if not query:
+        return {"items": [], "meta": meta}
 
-        return {
-            "items": items,
-            "meta": {
-                "total_count": len(items),
-            },
-        }
-    except OperationalError:
-        return {"items": [], "meta": {"total_count": 0, "error": "invalid_query"}}
+    try:
+        # One more than the maximum to find out if the count is capped
+        total_count = database.read_session.execute(
+            _search_count_sql(dialect),
+            {"query": query, "max_results": max_results + 1},
+        ).scalar()
+        items = []
+        if limit and offset < total_count:
+            result = database.read_session.execute(
+                _search_sql(dialect),
+                {"query": query, "limit": limit, "offset": offset},
+            )
+            items = [dict(row) for row in result.mappings()]
+    except (OperationalError, ProgrammingError):
+        database.read_session.rollback()
+        return {"items": [], "meta": {**meta, "error": "invalid_query"}}
     except Exception as e:
-        current_app.logger.error(f"Failed to search archive records for '{query}': {e}")
+        current_app.logger.error(
+            f"Failed to search archive records for '{sanitised_query}': {e}"
+        )
         raise
 
+    return {
+        "items": items,
+        "meta": {
+            **meta,
+            "total_count": min(total_count, max_results),
+            "total_count_capped": total_count > max_results,
+        },
+    }
+
+
+def _search_sql(dialect):
+    """Get a page of the search query for a database dialect, best matches first."""
+    columns = ", ".join(f"ar.{column.name}" for column in ArchiveRecord.__table__.c)
+    if dialect == "postgresql":
+        # search_vector is generated from the searched columns, with a GIN index
+        return text(f"""
+            SELECT {columns}
+            FROM archive_records ar, to_tsquery('simple', :query) query
+            WHERE ar.search_vector @@ query
+            ORDER BY ts_rank(ar.search_vector, query) DESC, ar.sort_name, ar.id
+            LIMIT :limit OFFSET :offset
+        """)
+    if dialect == "sqlite":
+        return text(f"""
+            SELECT {columns}
+            FROM archive_records ar
+            INNER JOIN archive_records_fts fts ON ar.id = fts.rowid
+            WHERE archive_records_fts MATCH :query
+            ORDER BY rank, ar.sort_name, ar.id
+            LIMIT :limit OFFSET :offset
+        """)
+    raise NotImplementedError(f"Search is not supported for {dialect}")
+
+
+def _search_count_sql(dialect):
+    """Get a query counting up to :max_results search matches for a database dialect."""
+    if dialect == "postgresql":
+        return text("""
+            SELECT count(*) FROM (
+                SELECT 1
+                FROM archive_records
+                WHERE search_vector @@ to_tsquery('simple', :query)
+                LIMIT :max_results
+            ) matches
+        """)
+    if dialect == "sqlite":
+        # Every row of the index is a record, so there is no need to join
+        return text("""
+            SELECT count(*) FROM (
+                SELECT 1
+                FROM archive_records_fts
+                WHERE archive_records_fts MATCH :query
+                LIMIT :max_results
+            ) matches
+        """)
+    raise NotImplementedError(f"Search is not supported for {dialect}")
+
 
 def _sanitize_fts_query(query):
     """
@@ -177,4 +703,66 @@ def _sanitize_fts_query(query):
     if query.count("(") != query.count(")"):
         query = re.sub(r"[()]", "", query)
 
-    return query.strip()
+    # Collapse whitespace, so queries that only differ in spacing are the same
+    return re.sub(r"\s+", " ", query).strip()
+
+
+def _fts_to_tsquery(query):
+    """
+    Convert a query from _sanitize_fts_query() into PostgreSQL tsquery syntax, with
+    the same meaning as in FTS5:
+
+    - Terms next to each other must all match:
+      government digital -> government & digital
+    - Prefix wildcard: digit* -> digit:*
+    - Phrase search: "government digital" -> (government <-> digital)
+    - Boolean operators and grouping: (health OR digital) NOT service ->
+      (health | digital) & ! service
+
+    Operators without a term on both sides, empty groups and unmatched parentheses
+    are dropped, so the result is always a valid tsquery.
+    """
+    groups = [[]]
+    for phrase, word, bracket in re.findall(r'"([^"]*)"|(\w+\*?)|([()])', query):
+        if phrase:
+            terms = [_tsquery_term(term) for term in re.findall(r"\w+\*?", phrase)]
+            _add_tsquery_operand(
+                groups[-1], f"({' <-> '.join(terms)})" if terms else ""
+            )
+        elif word in _TSQUERY_OPERATORS:
+            if groups[-1] and groups[-1][-1] not in _TSQUERY_OPERATORS.values():
+                groups[-1].append(_TSQUERY_OPERATORS[word])
+        elif word:
+            _add_tsquery_operand(groups[-1], _tsquery_term(word))
+        elif bracket == "(":
+            groups.append([])
+        elif len(groups) > 1:
+            group = _join_tsquery(groups.pop())
+            _add_tsquery_operand(groups[-1], f"({group})" if group else "")
+
+    while len(groups) > 1:
+        group = _join_tsquery(groups.pop())
+        _add_tsquery_operand(groups[-1], f"({group})" if group else "")
+    return _join_tsquery(groups[0])
+
+
+_TSQUERY_OPERATORS = {"AND": "&", "OR": "|", "NOT": "& !"}
+
+
+def _tsquery_term(word):
+    return f"{word[:-1]}:*" if word.endswith("*") else word
+
+
+def _add_tsquery_operand(group, operand):
+    if not operand:
+        return
+    if group and group[-1] not in _TSQUERY_OPERATORS.values():
+        # Implicit AND, as in FTS5
+        group.append("&")
+    group.append(operand)
+
+
+def _join_tsquery(group):
+    if group and group[-1] in _TSQUERY_OPERATORS.values():
+        group = group[:-1]
+    return " ".join(group)
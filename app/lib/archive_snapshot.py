@@ -0,0 +1,149 @@
+import bisect
+import logging
+import threading
+import time
+from operator import attrgetter
+
+logger = logging.getLogger(__name__)
+
+_listing_key = attrgetter("sort_name", "id")
+
+
+class ArchiveSnapshot:
+    """
+    The records of every A-Z character listing at one data generation.
+
+    Records are grouped by first_character and sorted by (sort_name, id) once, when
+    the snapshot is made, and the snapshot is never changed after that, so every
+    request a worker handles can share it without locking.
+    """
+
+    __slots__ = ("_listings", "characters", "generation", "record_count")
+
+    def __init__(self, generation, records):
+        """
+        Args:
+            generation: Data generation the records were read at
+            records: Named tuples of listing records, with at least
+                first_character, sort_name and id, in any order
+        """
+        listings = {}
+        for record in records:
+            listings.setdefault(record.first_character, []).append(record)
+        self.generation = generation
+        self._listings = {
+            character: tuple(sorted(character_records, key=_listing_key))
+            for character, character_records in listings.items()
+        }
+        self.characters = tuple(sorted(self._listings))
+        self.record_count = sum(map(len, self._listings.values()))
+
+    def listing_count(self, character):
+        """Get the number of records in a character listing."""
+        return len(self._listings.get(character, ()))
+
+    def listing_page(self, character, direction="after", position=None, limit=None):
+        """
+        Get the records of a character listing either side of a position, as
+        character_listing_query() would.
+
+        Args:
+            character: Character to filter by (e.g., 'a', '0-9')
+            direction: "after" for the records following position, or "before" for
+                the records preceding it
+            position: (sort_name, id) of the record to start from, or None to start
+                from the first record
+            limit: Maximum number of records, or None for all of them
+
+        Returns:
+            tuple: The records, in listing order, and whether there are more records
+            beyond them in the direction
+        """
+        records = self._listings.get(character, ())
+        if direction == "before":
+            end = bisect.bisect_left(records, tuple(position), key=_listing_key)
+            start = 0 if limit is None else max(end - limit, 0)
+            return records[start:end], start > 0
+        start = (
+            0
+            if position is None
+            else bisect.bisect_right(records, tuple(position), key=_listing_key)
+        )
+        end = len(records) if limit is None else start + limit
+        return records[start:end], end < len(records)
+
+
+class SnapshotHolder:
+    """
+    The snapshot of one worker, made again when the data generation changes.
+
+    The generation is checked at most once every check_interval seconds, in a
+    background thread that makes the new snapshot while requests are served from
+    the previous one. Requests only wait for the first snapshot. So a worker serves
+    a snapshot for up to that long, plus the time a new snapshot takes to make,
+    after a sync has published.
+    """
+
+    def __init__(self, check_interval, teardown=None):
+        """
+        Args:
+            check_interval: Seconds between checks of the data generation
+            teardown: Function called when the background thread finishes, e.g. to
+                remove its database session
+        """
+        self.check_interval = check_interval
+        self.teardown = teardown
+        self.snapshot = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+        self._refresh_thread = None
+
+    def get(self, get_generation, load):
+        """
+        Get the current snapshot, checking the generation if it is due.
+
+        Args:
+            get_generation: Function returning the current data generation
+            load: Function making the snapshot for a generation
+
+        Returns:
+            ArchiveSnapshot: The snapshot
+        """
+        if self._is_fresh():
+            return self.snapshot
+        with self._lock:
+            # Another thread may have checked while this one waited for the lock
+            if self.snapshot is None:
+                self.snapshot = load(get_generation())
+                self._checked_at = time.monotonic()
+                return self.snapshot
+            # Returned as it is, as the new snapshot may be made before this returns
+            snapshot = self.snapshot
+            if not self._is_fresh() and not self._is_refreshing():
+                self._checked_at = time.monotonic()
+                self._refresh_thread = threading.Thread(
+                    target=self._refresh, args=(get_generation, load), daemon=True
+                )
+                self._refresh_thread.start()
+            return snapshot
+
+    def _refresh(self, get_generation, load):
+        try:
+            generation = get_generation()
+            if generation != self.snapshot.generation:
+                self.snapshot = load(generation)
+        except Exception:
+            # The previous snapshot is served until the next check
+            logger.exception("Failed to make a new archive snapshot")
+        finally:
+            if self.teardown is not None:
+                self.teardown()
+
+    def _is_fresh(self):
+        return (
+            self.snapshot is not None
+            and time.monotonic() - self._checked_at < self.check_interval
+        )
+
+    def _is_refreshing(self):
+        return self._refresh_thread is not None and self._refresh_thread.is_alive()
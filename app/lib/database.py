@@ -1,6 +1,10 @@
+import os
+import re
 from datetime import datetime, timezone
+from urllib.parse import quote
 
-from sqlalchemy import Column, DateTime, Integer, create_engine
+from sqlalchemy import Column, DateTime, Integer, create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import (
     DeclarativeBase,
     Mapped,
@@ -28,17 +32,127 @@ class Base(DeclarativeBase):
 engine = None
 db_session = None
 
+# For request handling, read-only where the database allows it (see init_db)
+read_engine = None
+read_session = None
+
+# Config keys for the PRAGMAs applied to every new SQLite connection
+SQLITE_PRAGMAS = {
+    "SQLITE_JOURNAL_MODE": "journal_mode",
+    "SQLITE_SYNCHRONOUS": "synchronous",
+    "SQLITE_MMAP_SIZE": "mmap_size",
+    "SQLITE_CACHE_SIZE": "cache_size",
+    "SQLITE_TEMP_STORE": "temp_store",
+    "SQLITE_BUSY_TIMEOUT": "busy_timeout",
+}
+
 
 def init_db(app):
-    global engine, db_session
+    """
+    Create the engines and scoped sessions for the app.
 
-    engine = create_engine(app.config["SQLALCHEMY_DATABASE_URI"])
+    engine and db_session are used by the sync and anything else that writes.
+    read_engine and read_session are used to handle requests, and connect to
+    SQLALCHEMY_READ_DATABASE_URI (e.g. a PostgreSQL replica) if it is set. Otherwise
+    SQLite file databases are opened read-only, and any other database shares the
+    read-write engine.
+    """
+    global engine, db_session, read_engine, read_session
 
-    session_factory = sessionmaker(bind=engine)
-    db_session = scoped_session(session_factory)
+    uri = app.config["SQLALCHEMY_DATABASE_URI"]
+    engine = _create_engine(uri, app.config)
+    db_session = scoped_session(sessionmaker(bind=engine))
+
+    read_uri = app.config.get("SQLALCHEMY_READ_DATABASE_URI") or sqlite_read_only_uri(
+        uri
+    )
+    read_engine = _create_engine(read_uri, app.config, True) if read_uri else engine
+    read_session = scoped_session(sessionmaker(bind=read_engine))
 
     @app.teardown_appcontext
     def shutdown_session(exception=None):
         db_session.remove()
+        read_session.remove()
 
     return db_session
+
+
+def sqlite_read_only_uri(uri):
+    """
+    Get a URL that opens a SQLite database file read-only.
+
+    Args:
+        uri: SQLAlchemy database URI
+
+    Returns:
+        URL | None: The read-only URL, or None if uri is not for a SQLite file
+    """
+    url = make_url(uri)
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return None
+    if url.database.startswith("file:"):
+        # Already a SQLite URI filename
+        return None
+    path = quote(os.path.abspath(url.database))
+    return url.set(
+        database=f"file:{path}", query={**url.query, "mode": "ro", "uri": "true"}
+    )
+
+
+def _create_engine(uri, config, read_only=False):
+    url = make_url(uri)
+    options = {
+        "pool_recycle": config.get("SQLALCHEMY_POOL_RECYCLE", -1),
+        "pool_pre_ping": config.get("SQLALCHEMY_POOL_PRE_PING", False),
+    }
+    # In-memory SQLite databases use a pool of one connection per thread
+    if url.get_backend_name() != "sqlite" or url.database not in (None, "", ":memory:"):
+        options["pool_size"] = config.get("SQLALCHEMY_POOL_SIZE", 5)
+        options["max_overflow"] = config.get("SQLALCHEMY_MAX_OVERFLOW", 10)
+
+    new_engine = create_engine(url, **options)
+    if new_engine.dialect.name == "sqlite":
+        pragmas = sqlite_pragmas(config)
+        if read_only:
+            # The journal mode is a property of the database, set by the writer
+            pragmas.pop("journal_mode", None)
+        set_sqlite_pragmas(new_engine, pragmas)
+    return new_engine
+
+
+def sqlite_pragmas(config):
+    """
+    Get the PRAGMAs to apply to SQLite connections from the app config.
+
+    Args:
+        config: App config with the SQLITE_* keys in SQLITE_PRAGMAS
+
+    Returns:
+        dict: {pragma: value} for every setting that is not empty
+
+    Raises:
+        ValueError: If a value is not a plain word or number
+    """
+    pragmas = {}
+    for key, pragma in SQLITE_PRAGMAS.items():
+        value = str(config.get(key) or "").strip()
+        if not value:
+            continue
+        # Values are interpolated into the PRAGMA statement, which can't be bound
+        if not re.fullmatch(r"-?\w+", value):
+            raise ValueError(f"Invalid {key}: {value!r}")
+        pragmas[pragma] = value
+    return pragmas
+
+
+def set_sqlite_pragmas(engine, pragmas):
+    """Apply PRAGMAs to every new connection made by a SQLite engine."""
+
+    @event.listens_for(engine, "connect")
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma, value in pragmas.items():
+                cursor.execute(f"PRAGMA {pragma} = {value}")
+        finally:
+            cursor.close()
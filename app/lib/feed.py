@@ -0,0 +1,218 @@
+import codecs
+import gzip
+import json
+import zlib
+
+try:
+    from compression import zstd  # Python 3.14+
+except ImportError:
+    zstd = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+FEED_CHUNK_SIZE = 64 * 1024
+
+# Most characters a single element of a feed can take up, far more than any entry
+# needs, so a malformed element fails without buffering the rest of the feed
+MAX_ELEMENT_SIZE = 16 * FEED_CHUNK_SIZE
+
+# Content-Encoding values for the compression formats a feed can be read in
+CONTENT_ENCODINGS = {"gzip": "gzip", "x-gzip": "gzip", "zstd": "zstd"}
+
+_EXTENSIONS = {".gz": "gzip", ".gzip": "gzip", ".zst": "zstd", ".zstd": "zstd"}
+
+_MAGIC_NUMBERS = {b"\x1f\x8b": "gzip", b"\x28\xb5\x2f\xfd": "zstd"}
+
+_WHITESPACE = " \t\n\r"
+
+# Parser states for iter_json_array
+_OPEN = "open"  # expecting '['
+_FIRST = "first"  # expecting the first value or ']'
+_VALUE = "value"  # expecting a value after ','
+_NEXT = "next"  # expecting ',' or ']'
+
+
+class FeedCompressionError(Exception):
+    """The feed could not be decompressed."""
+
+
+def zstd_available():
+    """Whether zstd compressed feeds can be read."""
+    return zstd is not None or zstandard is not None
+
+
+def accept_encoding():
+    """Accept-Encoding header value for the compression formats that can be read."""
+    return "gzip, zstd" if zstd_available() else "gzip"
+
+
+def detect_compression(name, head=b""):
+    """
+    Detect how a feed is compressed from its file extension or its first bytes.
+
+    Args:
+        name: File name, path or URL path of the feed
+        head: The first few bytes of the feed, for when the extension is not known
+
+    Returns:
+        str | None: "gzip", "zstd" or None if the feed is not compressed
+    """
+    for extension, compression in _EXTENSIONS.items():
+        if name.lower().endswith(extension):
+            return compression
+    for magic_number, compression in _MAGIC_NUMBERS.items():
+        if head.startswith(magic_number):
+            return compression
+    return None
+
+
+def iter_feed_chunks(feed_file, compression=None, chunk_size=FEED_CHUNK_SIZE):
+    """
+    Read a feed in chunks, decompressing it as it is read.
+
+    Args:
+        feed_file: Binary file object containing the feed
+        compression: "gzip", "zstd" or None if the feed is not compressed
+        chunk_size: Maximum number of decompressed bytes per chunk
+
+    Yields:
+        bytes: Chunks of the (decompressed) feed
+
+    Raises:
+        FeedCompressionError: While iterating, if the feed can't be decompressed
+    """
+    if compression is None:
+        yield from iter(lambda: feed_file.read(chunk_size), b"")
+        return
+
+    reader = _decompressing_reader(feed_file, compression)
+    try:
+        while chunk := reader.read(chunk_size):
+            yield chunk
+    except (OSError, EOFError, zlib.error, *_zstd_errors()) as e:
+        raise FeedCompressionError(
+            f"Failed to decompress {compression} feed: {e}"
+        ) from e
+
+
+def _decompressing_reader(feed_file, compression):
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=feed_file, mode="rb")
+    if compression == "zstd":
+        if zstd is not None:
+            return zstd.ZstdFile(feed_file, mode="rb")
+        if zstandard is not None:
+            return zstandard.ZstdDecompressor().stream_reader(feed_file)
+        raise FeedCompressionError(
+            "Reading zstd compressed feeds requires Python 3.14+ or the "
+            "zstandard package"
+        )
+    raise FeedCompressionError(f"Unsupported feed compression: {compression}")
+
+
+def _zstd_errors():
+    return tuple(module.ZstdError for module in (zstd, zstandard) if module is not None)
+
+
+def iter_json_array(chunks, max_element_size=MAX_ELEMENT_SIZE):
+    """
+    Incrementally parse a top-level JSON array, yielding one element at a time.
+
+    Only the current element and the unparsed remainder of the latest chunk are held
+    in memory, so memory use depends on the size of a single element rather than the
+    size of the whole document. An element that still can't be decoded once more
+    than max_element_size characters of it have been read is treated as invalid,
+    so memory stays bounded even when the document is not.
+
+    Args:
+        chunks: Iterable of bytes (e.g. response.iter_content()) making up the document
+        max_element_size: Most characters a single element can take up
+
+    Yields:
+        Each decoded element of the array, in order
+
+    Raises:
+        json.JSONDecodeError: If the document is not a valid JSON array
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8-sig")()
+    chunks = iter(chunks)
+    buffer = ""
+    pos = 0
+    eof = False
+    state = _OPEN
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+
+        if pos < len(buffer):
+            char = buffer[pos]
+
+            if state == _OPEN:
+                if char != "[":
+                    raise json.JSONDecodeError("Expecting '['", buffer, pos)
+                state = _FIRST
+                pos += 1
+                continue
+
+            if char == "]" and state in (_FIRST, _NEXT):
+                _check_trailing(buffer, pos + 1, chunks, utf8)
+                return
+
+            if state == _NEXT:
+                if char != ",":
+                    raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+                state = _VALUE
+                pos += 1
+                continue
+
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof or len(buffer) - pos > max_element_size:
+                    raise
+                end = None
+
+            # A value is only complete once its delimiter has been read, otherwise it
+            # may be truncated (e.g. the number 12 when the next chunk starts with 3)
+            if end is not None and (eof or _is_delimited(buffer, end)):
+                yield value
+                state = _NEXT
+                pos = end
+                continue
+
+        if eof:
+            raise json.JSONDecodeError("Unexpected end of data", buffer, pos)
+
+        # Drop consumed input before reading the next chunk
+        buffer = buffer[pos:]
+        pos = 0
+        try:
+            buffer += utf8.decode(next(chunks))
+        except StopIteration:
+            buffer += utf8.decode(b"", final=True)
+            eof = True
+
+
+def _is_delimited(buffer, pos):
+    """Check whether the next non-whitespace character is an array delimiter."""
+    while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+        pos += 1
+    return pos < len(buffer) and buffer[pos] in ",]"
+
+
+def _check_trailing(buffer, pos, chunks, utf8):
+    """Raise if anything other than whitespace follows the closing bracket."""
+    remainder = buffer[pos:]
+    for chunk in chunks:
+        remainder += utf8.decode(chunk)
+        if remainder.strip(_WHITESPACE):
+            break
+        remainder = ""
+    remainder += utf8.decode(b"", final=True)
+    if remainder.strip(_WHITESPACE):
+        raise json.JSONDecodeError("Extra data", remainder, 0)
@@ -1,12 +1,23 @@
-from sqlalchemy import Boolean, Integer, String, Text, UniqueConstraint
+from datetime import datetime
+
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    DateTime,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.lib.database import Base
 
 
-class ArchiveRecord(Base):
-    __tablename__ = "archive_records"
-    __table_args__ = (UniqueConstraint("wam_id", name="uq_archive_records_wam_id"),)
+class ArchiveRecordColumns:
+    """Columns shared by archive_records and archive_records_stage."""
 
     profile_name: Mapped[str] = mapped_column(Text, nullable=False)
     record_url: Mapped[str] = mapped_column(Text, nullable=False)
@@ -19,9 +30,117 @@ class ArchiveRecord(Base):
     description: Mapped[str] = mapped_column(Text, nullable=False)
 
     # Computed fields for sorting and filtering
-    sort_name: Mapped[str] = mapped_column(Text, nullable=False, index=True)
-    first_character: Mapped[str] = mapped_column(String(3), nullable=False, index=True)
-    record_hash: Mapped[str] = mapped_column(String(32), nullable=False, index=True)
+    # Compared by code point, as SQLite and Python do, rather than by the locale of
+    # a PostgreSQL database, so every listing is in the same order wherever it is
+    # read from
+    sort_name: Mapped[str] = mapped_column(
+        Text().with_variant(Text(collation="C"), "postgresql"), nullable=False
+    )
+    first_character: Mapped[str] = mapped_column(String(3), nullable=False)
+    record_hash: Mapped[str] = mapped_column(String(32), nullable=False)
+
+    # Fingerprint of the raw feed entry, used to skip validating unchanged entries
+    source_fingerprint: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+
+
+class ArchiveRecord(ArchiveRecordColumns, Base):
+    __tablename__ = "archive_records"
+    __table_args__ = (
+        UniqueConstraint("wam_id", name="uq_archive_records_wam_id"),
+        Index("ix_archive_records_sort_name", "sort_name"),
+        # Lists a character in keyset order without a sort, and its leading column
+        # serves lookups by first_character alone
+        Index(
+            "ix_archive_records_first_character_sort_name_id",
+            "first_character",
+            "sort_name",
+            "id",
+        ),
+        Index("ix_archive_records_record_hash", "record_hash"),
+    )
 
     def __repr__(self):
         return f"<ArchiveRecord(id={self.id}, wam_id={self.wam_id})>"
+
+
+class ArchiveRecordStage(ArchiveRecordColumns, Base):
+    """
+    New and changed archive records from a sync in progress, which are applied to
+    archive_records in a single transaction once the whole feed has been processed.
+    """
+
+    __tablename__ = "archive_records_stage"
+    __table_args__ = (
+        UniqueConstraint("wam_id", name="uq_archive_records_stage_wam_id"),
+    )
+
+    def __repr__(self):
+        return f"<ArchiveRecordStage(id={self.id}, wam_id={self.wam_id})>"
+
+
+class ArchiveSyncState(Base):
+    """
+    Single row recording the archive feed as of the last successful sync, used to
+    skip syncs when the feed has not changed.
+    """
+
+    __tablename__ = "archive_sync_state"
+
+    source_url: Mapped[str] = mapped_column(Text, nullable=False)
+    etag: Mapped[str | None] = mapped_column(Text, nullable=True)
+    last_modified: Mapped[str | None] = mapped_column(Text, nullable=True)
+    feed_digest: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    last_synced_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # Incremented each time a sync publishes changes, so other nodes can tell when
+    # their caches are out of date
+    generation: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+
+    def __repr__(self):
+        return f"<ArchiveSyncState(id={self.id}, source_url={self.source_url})>"
+
+
+class ArchiveSyncCheckpoint(Base):
+    """
+    One row per batch committed by a sync in progress, so an interrupted sync of the
+    same feed can resume after the last batch. Cleared when the sync is published.
+    """
+
+    __tablename__ = "archive_sync_checkpoints"
+
+    source_url: Mapped[str] = mapped_column(Text, nullable=False)
+    feed_digest: Mapped[str] = mapped_column(String(64), nullable=False)
+    # Number of feed entries processed up to and including this batch
+    entries_processed: Mapped[int] = mapped_column(Integer, nullable=False)
+    # JSON encoded sync stats as of this batch
+    stats: Mapped[str] = mapped_column(Text, nullable=False)
+    # wam_ids of the valid entries in this batch, as 8-byte signed integers
+    wam_ids: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+    def __repr__(self):
+        return (
+            f"<ArchiveSyncCheckpoint(id={self.id}, "
+            f"entries_processed={self.entries_processed})>"
+        )
+
+
+class ArchiveSyncLock(Base):
+    """
+    Lease held by the node running a scheduled sync, so only one node syncs at a
+    time. A lease that is not renewed before it expires can be taken by another node.
+    """
+
+    __tablename__ = "archive_sync_locks"
+    __table_args__ = (UniqueConstraint("name", name="uq_archive_sync_locks_name"),)
+
+    name: Mapped[str] = mapped_column(String(64), nullable=False)
+    holder: Mapped[str | None] = mapped_column(Text, nullable=True)
+    expires_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # When the last scheduled sync finished, on any node
+    last_run_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return (
+            f"<ArchiveSyncLock(id={self.id}, name={self.name}, holder={self.holder})>"
+        )
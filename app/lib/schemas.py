@@ -1,5 +1,4 @@
 import hashlib
-import json
 
 from pydantic import (
     BaseModel,
@@ -8,6 +7,7 @@ from pydantic import (
     HttpUrl,
     PositiveInt,
     computed_field,
+    model_validator,
 )
 
 from app.lib.util import DIGITS_CATEGORY, normalize_archive_letter
@@ -28,11 +28,22 @@ class ArchiveRecordSchema(BaseModel):
     wam_id: PositiveInt = Field(alias="wamId")
     description: str | None = Field(alias="description")
 
+    # Fingerprint of the raw entry, see source_fingerprint()
+    source_fingerprint: int = Field(alias="sourceFingerprint")
+
     model_config = ConfigDict(
         validate_by_alias=True,  # Allow alias names from JSON (camelCase)
         str_strip_whitespace=True,
     )
 
+    @model_validator(mode="before")
+    @classmethod
+    def add_source_fingerprint(cls, data):
+        """Fingerprint the raw entry before any fields are validated or normalised."""
+        if isinstance(data, dict):
+            data = {**data, "sourceFingerprint": source_fingerprint(data)}
+        return data
+
     @computed_field
     @property
     def sort_name(self) -> str:
@@ -70,18 +81,63 @@ class ArchiveRecordSchema(BaseModel):
         # If normalization returns empty (invalid input), default to '0-9'
         return normalized if normalized else DIGITS_CATEGORY
 
-    @computed_field
     @property
     def record_hash(self) -> str:
         """
-        Compute MD5 hash of record data for change detection.
+        Hash of the saved record data for change detection, see compute_record_hash().
+        """
+        return self.to_row()["record_hash"]
+
+    def to_row(self) -> dict:
+        """
+        Get the archive_records column values for the entry, including record_hash.
+
+        The model is serialised once, and the hash computed from that serialisation.
         """
-        # Get model data excluding wam_id and computed fields
-        data = self.model_dump(
-            mode="json",  # Converts HttpUrl JSON-serializable value
-            exclude={"wam_id", "sort_name", "first_character", "record_hash"},
-            by_alias=False,
-        )
-
-        json_str = json.dumps(data, sort_keys=True)
-        return hashlib.md5(json_str.encode()).hexdigest()
+        row = self.model_dump(mode="json", by_alias=False)
+        row["record_hash"] = compute_record_hash(row)
+        return row
+
+
+# Saved fields that record_hash is computed from, in a fixed order
+RECORD_HASH_FIELDS = tuple(
+    name
+    for name in ArchiveRecordSchema.model_fields
+    if name not in ("wam_id", "source_fingerprint")
+)
+
+
+def compute_record_hash(row: dict) -> str:
+    """
+    Compute a 128-bit BLAKE2b hash of the saved fields of a record.
+
+    Args:
+        row: Column values as saved (URLs as strings), e.g. from to_row()
+
+    Returns:
+        str: 32 character hex digest
+    """
+    values = repr(tuple(row[name] for name in RECORD_HASH_FIELDS))
+    return hashlib.blake2b(values.encode(), digest_size=16).hexdigest()
+
+
+# Raw JSON keys of every saved field that can change for a given wam_id, which is
+# the field name for fields without an alias (e.g. ongoing)
+SOURCE_FINGERPRINT_KEYS = tuple(
+    field.alias or name
+    for name, field in ArchiveRecordSchema.model_fields.items()
+    if name not in ("wam_id", "source_fingerprint")
+)
+
+
+def source_fingerprint(raw_entry: dict) -> int:
+    """
+    Compute a cheap 64-bit fingerprint of the saved fields of a raw JSON entry.
+
+    Unlike record_hash this needs no validation, so it can be compared with the
+    stored fingerprint to skip unchanged entries before they are validated. Fields
+    that aren't saved (e.g. generatedOn) are ignored.
+    """
+    values = repr(tuple(raw_entry.get(key) for key in SOURCE_FINGERPRINT_KEYS))
+    digest = hashlib.blake2b(values.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
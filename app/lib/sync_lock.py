@@ -0,0 +1,130 @@
+import logging
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.lib import database
+from app.lib.models import ArchiveSyncLock
+
+logger = logging.getLogger(__name__)
+
+SYNC_LOCK_NAME = "archive-sync"
+
+_locks = ArchiveSyncLock.__table__
+
+
+class SyncLock:
+    """
+    Lease on a row in archive_sync_locks, shared by every node using the database.
+
+    While held, the lease is renewed in a background thread every third of its time
+    to live, so it only expires if the holder stops (e.g. the node is killed). Every
+    statement runs in its own transaction on its own connection, independently of
+    the scoped session.
+    """
+
+    def __init__(self, ttl, name=SYNC_LOCK_NAME, holder=None):
+        self.ttl = ttl
+        self.name = name
+        self.holder = holder or (
+            f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        )
+        self._stop_renewing = None
+
+    def acquire(self):
+        """
+        Take the lease if it is free, has expired or is already held by this holder.
+
+        Returns:
+            bool: True if the lease is now held by this holder
+        """
+        if not self._update_lease(
+            or_(
+                _locks.c.holder.is_(None),
+                _locks.c.holder == self.holder,
+                _locks.c.expires_at < _now(),
+            )
+        ):
+            try:
+                with database.engine.begin() as connection:
+                    connection.execute(
+                        _locks.insert().values(
+                            name=self.name,
+                            holder=self.holder,
+                            expires_at=_now() + timedelta(seconds=self.ttl),
+                        )
+                    )
+            except IntegrityError:
+                # Another node holds the lease, or took it first
+                return False
+
+        self._stop_renewing = threading.Event()
+        threading.Thread(
+            target=self._renew, args=(self._stop_renewing,), daemon=True
+        ).start()
+        return True
+
+    def release(self, record_run=False):
+        """
+        Stop renewing the lease and free it.
+
+        Args:
+            record_run: Whether to record that a scheduled sync has just finished
+        """
+        if self._stop_renewing is not None:
+            self._stop_renewing.set()
+            self._stop_renewing = None
+
+        values = {"holder": None, "expires_at": None, "updated_at": _now()}
+        if record_run:
+            values["last_run_at"] = _now()
+        with database.engine.begin() as connection:
+            connection.execute(
+                update(_locks)
+                .where(_locks.c.name == self.name, _locks.c.holder == self.holder)
+                .values(**values)
+            )
+
+    def ran_within(self, seconds):
+        """Whether a scheduled sync finished on any node within the last seconds."""
+        with database.engine.connect() as connection:
+            last_run_at = connection.execute(
+                select(_locks.c.last_run_at).where(_locks.c.name == self.name)
+            ).scalar()
+        return last_run_at is not None and last_run_at > _now() - timedelta(
+            seconds=seconds
+        )
+
+    def _update_lease(self, condition):
+        with database.engine.begin() as connection:
+            result = connection.execute(
+                update(_locks)
+                .where(_locks.c.name == self.name, condition)
+                .values(
+                    holder=self.holder,
+                    expires_at=_now() + timedelta(seconds=self.ttl),
+                    updated_at=_now(),
+                )
+            )
+        return result.rowcount == 1
+
+    def _renew(self, stop_renewing):
+        while not stop_renewing.wait(self.ttl / 3):
+            try:
+                renewed = self._update_lease(_locks.c.holder == self.holder)
+            except Exception as e:
+                logger.warning("Failed to renew archive sync lock: %s", str(e))
+                continue
+            if not renewed:
+                logger.warning("Archive sync lock was taken by another node")
+                return
+
+
+def _now():
+    # Naive UTC, as stored by the DateTime columns
+    return datetime.now(timezone.utc).replace(tzinfo=None)
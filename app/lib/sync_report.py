@@ -0,0 +1,92 @@
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+
+class SyncReport:
+    """
+    Timings and throughput for each phase of an archive data sync.
+
+    Each phase accumulates its duration in seconds along with any counts (e.g.
+    entries, rows, bytes), so a phase can be added to many times, once per batch.
+    """
+
+    def __init__(self):
+        self.started_at = datetime.now(timezone.utc)
+        self.outcome = None
+        self.phases = {}
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name, **counts):
+        """Time the body of a with block as part of a phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start, **counts)
+
+    def add(self, name, seconds, **counts):
+        """Add a duration and counts to a phase."""
+        phase = self.phases.setdefault(name, {"seconds": 0.0})
+        phase["seconds"] += seconds
+        for key, value in counts.items():
+            phase[key] = phase.get(key, 0) + value
+
+    def add_batch(self, name, seconds, **counts):
+        """Add a duration and counts to a phase, also recording them as a batch."""
+        self.add(name, seconds, **counts)
+        batch = {"seconds": seconds, **counts}
+        self.phases[name].setdefault("batches", []).append(_with_rates(batch))
+
+    def timed(self, name, iterable):
+        """Yield from an iterable, adding the time taken to produce each item."""
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add(name, time.perf_counter() - start)
+                return
+            self.add(name, time.perf_counter() - start)
+            yield item
+
+    def as_dict(self, stats=None):
+        """
+        Summarise the sync, adding a per second rate for every count in each phase.
+
+        Args:
+            stats: Dict of sync stats (created, updated, etc.) to include
+
+        Returns:
+            dict: JSON serialisable summary of the sync
+        """
+        return {
+            "started_at": self.started_at.isoformat(),
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            "seconds": time.perf_counter() - self._start,
+            "outcome": self.outcome,
+            "stats": dict(stats or {}),
+            "phases": {
+                name: _with_rates(dict(phase)) for name, phase in self.phases.items()
+            },
+            "peak_rss_bytes": _peak_rss_bytes(resource.RUSAGE_SELF),
+            "peak_rss_workers_bytes": _peak_rss_bytes(resource.RUSAGE_CHILDREN),
+        }
+
+
+def _with_rates(phase):
+    seconds = phase["seconds"]
+    for key, value in list(phase.items()):
+        if key != "seconds" and isinstance(value, int):
+            phase[f"{key}_per_sec"] = value / seconds if seconds > 0 else None
+    return phase
+
+
+def _peak_rss_bytes(who):
+    peak_rss = resource.getrusage(who).ru_maxrss
+    # Reported in bytes on macOS and kilobytes on Linux
+    return peak_rss if sys.platform == "darwin" else peak_rss * 1024
@@ -1,8 +1,11 @@
+import math
 from enum import StrEnum
 
 from flask import current_app, make_response, render_template, request
 
 from app.lib import archive_service
+from app.lib.pagination import pagination_object
+from app.lib.query import qs_update
 from app.lib.util import (
     ARCHIVE_SEARCH_MAX_LENGTH,
     DIGITS_CATEGORY,
@@ -27,12 +30,15 @@ def render_atoz_archive_page(page_data):
 
     Query parameters:
     - character: Character to filter by (a-z, or '0-9' for digits)
+    - cursor: Page of the character listing, from its previous and next links
     - q: Full-text search query (takes precedence over character)
+    - page: Page of the search results
 
     Search results responses include X-Robots-Tag: noindex.
     """
     character = normalize_archive_letter(request.args.get("character", ""))
     search_query = request.args.get("q", "").strip()
+    cursor = request.args.get("cursor") or None
 
     try:
         available_characters = archive_service.get_available_characters()
@@ -41,18 +47,37 @@ def render_atoz_archive_page(page_data):
         return render_template("errors/server.html"), 500
 
     records = None
+    records_html = None
+    pagination = None
+    search_meta = None
     display_mode = DisplayMode.INDEX
 
     if search_query:
         display_mode = DisplayMode.SEARCH
         try:
-            result = archive_service.search_records(search_query)
+            page = int(request.args.get("page", 1))
+        except ValueError:
+            return render_template("errors/bad_request.html"), 400
+        if page < 1:
+            return render_template("errors/bad_request.html"), 400
+        page_size = current_app.config["ARCHIVE_PAGE_SIZE"]
+        try:
+            result = archive_service.search_records(
+                search_query, page_size, (page - 1) * page_size
+            )
             records = result.get("items", [])
         except Exception as e:
             current_app.logger.error(
                 f"Failed to get archive records on page {page_data['id']}: {e}"
             )
             return render_template("errors/server.html"), 500
+        search_meta = result["meta"]
+        pages = math.ceil(search_meta["total_count"] / page_size)
+        if page > max(pages, 1):
+            # Past the last page, or the most results that can be paged through
+            return render_template("errors/page-not-found.html"), 404
+        if pages > 1:
+            pagination = pagination_object(page, pages, request.args)
     elif character:
         display_mode = DisplayMode.LISTING
         if character not in available_characters:
@@ -61,18 +86,29 @@ def render_atoz_archive_page(page_data):
             )
             return render_template("errors/page-not-found.html"), 404
         try:
-            result = archive_service.get_records_by_character(character)
+            result = archive_service.get_records_by_character(character, cursor)
             records = result.get("items", [])
+        except archive_service.InvalidCursorError:
+            return render_template("errors/bad_request.html"), 400
         except Exception as e:
             current_app.logger.error(
                 f"Failed to get archive records on page {page_data['id']}: {e}"
             )
             return render_template("errors/server.html"), 500
+        if not records and cursor:
+            # The records either side of the cursor have since been removed
+            return render_template("errors/page-not-found.html"), 404
         if not records:
             current_app.logger.error(
                 f"Character '{character}' is in available_characters but returned no records"
             )
             return render_template("errors/server.html"), 500
+        pagination = _listing_pagination(result["meta"])
+        # Looked up by the records that are paginated, so they always match
+        records_html = archive_service.get_listing_html(records)
+        if records_html is None:
+            records_html = archive_service.render_listing_records(records)
+            archive_service.set_listing_html(records, records_html)
 
     display_character = (
         character
@@ -87,11 +123,14 @@ def render_atoz_archive_page(page_data):
             "pages/atoz_page.html",
             page_data=page_data,
             records=records,
+            records_html=records_html,
             selected_character=character,
             display_character=display_character,
             available_characters=available_characters,
             search_query=search_query,
             search_max_length=ARCHIVE_SEARCH_MAX_LENGTH,
+            search_meta=search_meta,
+            pagination=pagination,
             display_mode=display_mode,
             DisplayMode=DisplayMode,
         )
@@ -101,3 +140,19 @@ def render_atoz_archive_page(page_data):
         response.headers["X-Robots-Tag"] = "noindex"
 
     return response
+
+
+def _listing_pagination(meta):
+    """Build the previous and next links for a page of a character listing."""
+    pagination = {}
+    if meta.get("previous_cursor"):
+        pagination["previous"] = {
+            "href": f"?{qs_update(request.args, 'cursor', meta['previous_cursor'])}",
+            "title": "Previous page of records",
+        }
+    if meta.get("next_cursor"):
+        pagination["next"] = {
+            "href": f"?{qs_update(request.args, 'cursor', meta['next_cursor'])}",
+            "title": "Next page of records",
+        }
+    return pagination or None
@@ -0,0 +1,119 @@
+"""
+Compare rendering an A-Z listing page with and without its records rendered already.
+
+A SQLite database of the given number of records is created, then the first page
+and a page from the middle of the largest character listing are rendered by
+render_atoz_archive_page():
+
+- inline: the records of the page rendered on every request, as before
+- rendered: the records inserted as rendered by prerender_listing(), or by the
+  first request for a page it does not render
+
+The median time of each is printed, along with the time prerender_listing() takes
+to render the first ARCHIVE_PRERENDER_PAGES pages of the listing.
+
+Usage:
+    python -m benchmarks.atoz_render --records 50000
+"""
+
+import statistics
+import time
+from functools import partial
+from unittest.mock import patch
+
+import click
+
+from app.commands import _record_row
+from app.lib import archive_service, database
+from app.lib.archive_service import encode_cursor, get_snapshot, prerender_listing
+from app.lib.models import ArchiveRecord
+from app.lib.schemas import ArchiveRecordSchema
+from app.wagtail.pages.atoz_archive_page import render_atoz_archive_page
+from benchmarks.database import benchmark_app
+from benchmarks.synthetic import iter_entries
+
+PAGE_DATA = {
+    "id": 1,
+    "title": "A to Z Archive",
+    "intro": "",
+    "meta": {"url": "/archive/atoz/", "type": "ukgwa.AToZArchivePage"},
+}
+
+
+def _timed(render, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        render()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+@click.command()
+@click.option("--records", type=int, default=50_000)
+@click.option("--repeat", type=int, default=100, help="Timed renders of each page")
+def main(records, repeat):
+    with benchmark_app(
+        # Templates are rendered as in production, without debug logging
+        DEBUG=False,
+        EXPLAIN_TEMPLATE_LOADING=False,
+        CACHE_DEFAULT_TIMEOUT=0,
+        ARCHIVE_SNAPSHOT=True,
+        ARCHIVE_SNAPSHOT_CHECK_INTERVAL=3600,
+    ) as app:
+        database.db_session.execute(
+            ArchiveRecord.__table__.insert(),
+            [
+                _record_row(ArchiveRecordSchema(**entry))
+                for entry in iter_entries(records)
+            ],
+        )
+        database.db_session.commit()
+
+        snapshot = get_snapshot()
+        character = max(snapshot.characters, key=snapshot.listing_count)
+        page_size = app.config["ARCHIVE_PAGE_SIZE"]
+        # The page starting after the last record of a page half way through
+        listing, _ = snapshot.listing_page(character)
+        middle = listing[(len(listing) // page_size // 2) * page_size - 1]
+        cursor = encode_cursor("after", middle._asdict())
+        pages = {
+            "first": f"/?character={character}",
+            "middle": f"/?character={character}&cursor={cursor}",
+        }
+
+        def render(url):
+            with app.test_request_context(url):
+                response = render_atoz_archive_page(PAGE_DATA)
+            assert response.status_code == 200, response.status_code
+
+        timings = {}
+        with (
+            patch.object(archive_service, "get_listing_html", return_value=None),
+            patch.object(archive_service, "set_listing_html"),
+        ):
+            for page, url in pages.items():
+                render(url)
+                timings["inline", page] = _timed(partial(render, url), repeat)
+
+        start = time.perf_counter()
+        rendered_pages = prerender_listing(character)
+        prerender = time.perf_counter() - start
+        for page, url in pages.items():
+            render(url)
+            timings["rendered", page] = _timed(partial(render, url), repeat)
+
+    click.echo(
+        f"{records} records, '{character}' has {snapshot.listing_count(character)}, "
+        f"pages of {page_size}\n"
+    )
+    click.echo(f"{'records':>8} {'page':>6} {'ms':>8}")
+    for (source, page), seconds in timings.items():
+        click.echo(f"{source:>8} {page:>6} {seconds * 1000:>8.2f}")
+    click.echo(
+        f"\nprerender_listing(): {rendered_pages} pages in {prerender * 1000:.0f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Compare the A-Z listing query for the largest character with the previous ORM query.
+
+A SQLite database of the given number of records is created, then the listing for
+the character with the most records is timed:
+
+- before: the ORM query replaced by the projection, with the single column
+  first_character index it used
+- after: get_records_page() for the whole listing, with the
+  (first_character, sort_name, id) index
+- page: get_records_page() for a page of ARCHIVE_PAGE_SIZE records from the middle
+  of the listing, found by keyset
+
+The query plan of each is printed along with the timings, which are uncached.
+
+Usage:
+    python -m benchmarks.character_listing --records 50000
+"""
+
+import statistics
+import time
+
+import click
+from sqlalchemy import func, select
+
+from app.commands import _record_row
+from app.lib import database
+from app.lib.archive_service import (
+    character_listing_query,
+    decode_cursor,
+    encode_cursor,
+    get_records_page,
+)
+from app.lib.models import ArchiveRecord
+from app.lib.schemas import ArchiveRecordSchema
+from benchmarks.database import benchmark_app
+from benchmarks.synthetic import iter_entries
+
+COMPOSITE_INDEX = "ix_archive_records_first_character_sort_name_id"
+
+
+def orm_records_by_character(character):
+    """The ORM get_records_by_character() implementation the projection replaced."""
+    query = (
+        database.read_session.query(ArchiveRecord)
+        .filter(ArchiveRecord.first_character == character)
+        .order_by(ArchiveRecord.sort_name)
+    )
+    total_count = query.count()
+    items = [
+        {
+            "id": record.id,
+            "profile_name": record.profile_name,
+            "record_url": record.record_url,
+            "archive_link": record.archive_link,
+            "domain_type": record.domain_type,
+            "first_capture_display": record.first_capture_display,
+            "latest_capture_display": record.latest_capture_display,
+            "ongoing": record.ongoing,
+            "wam_id": record.wam_id,
+            "description": record.description,
+            "sort_name": record.sort_name,
+            "first_character": record.first_character,
+        }
+        for record in query.all()
+    ]
+    return {"items": items, "meta": {"total_count": total_count}}
+
+
+def _query_plan(statement):
+    compiled = statement.compile(
+        database.engine, compile_kwargs={"literal_binds": True}
+    )
+    with database.engine.connect() as connection:
+        return [
+            row[-1]
+            for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}")
+        ]
+
+
+def _timed(get_records, character, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        get_records(character)
+        timings.append(time.perf_counter() - start)
+        database.read_session.remove()
+    return statistics.median(timings)
+
+
+@click.command()
+@click.option("--records", type=int, default=50_000)
+@click.option("--repeat", type=int, default=20, help="Timed runs of each query")
+def main(records, repeat):
+    with benchmark_app() as app:
+        database.db_session.execute(
+            ArchiveRecord.__table__.insert(),
+            [
+                _record_row(ArchiveRecordSchema(**entry))
+                for entry in iter_entries(records)
+            ],
+        )
+        database.db_session.commit()
+        character, count = database.db_session.execute(
+            select(ArchiveRecord.first_character, func.count())
+            .group_by(ArchiveRecord.first_character)
+            .order_by(func.count().desc())
+            .limit(1)
+        ).one()
+
+        def use_indexes(drop, create):
+            with database.engine.begin() as connection:
+                connection.exec_driver_sql(f"DROP INDEX {drop}")
+                connection.exec_driver_sql(create)
+                connection.exec_driver_sql("ANALYZE")
+            database.read_engine.dispose()
+
+        use_indexes(
+            COMPOSITE_INDEX,
+            "CREATE INDEX ix_archive_records_first_character "
+            "ON archive_records (first_character)",
+        )
+        before_plan = _query_plan(
+            select(ArchiveRecord)
+            .where(ArchiveRecord.first_character == character)
+            .order_by(ArchiveRecord.sort_name)
+        )
+        before = _timed(orm_records_by_character, character, repeat)
+
+        use_indexes(
+            "ix_archive_records_first_character",
+            f"CREATE INDEX {COMPOSITE_INDEX} "
+            "ON archive_records (first_character, sort_name, id)",
+        )
+        after_plan = _query_plan(character_listing_query(character))
+        listing = get_records_page(character)
+        after = _timed(get_records_page, character, repeat)
+
+        page_size = app.config["ARCHIVE_PAGE_SIZE"]
+        cursor = encode_cursor("after", listing["items"][count // 2])
+        page_plan = _query_plan(
+            character_listing_query(character, *decode_cursor(cursor))
+        )
+        page = _timed(
+            lambda character: get_records_page(character, cursor, page_size),
+            character,
+            repeat,
+        )
+
+    click.echo(f"{records} records, '{character}' has {count}\n")
+    click.echo(f"{'query':>6} {'ms':>8} {'records/sec':>12}  plan")
+    for name, seconds, returned, plan in (
+        ("before", before, count, before_plan),
+        ("after", after, count, after_plan),
+        ("page", page, page_size, page_plan),
+    ):
+        click.echo(
+            f"{name:>6} {seconds * 1000:>8.1f} {returned / seconds:>12.0f}  "
+            + "; ".join(plan)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Helpers for running benchmarks against a throwaway SQLite database.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+import config
+from app import create_app
+from app.lib import database
+
+
+@contextmanager
+def benchmark_app(database_path=None, **config_overrides):
+    """
+    Create the app against a SQLite database and push an app context.
+
+    Tables are created from the models, so no migrations are needed.
+
+    Args:
+        database_path: SQLite file to use, or None for a temporary one
+        config_overrides: Config values to set, e.g. SQLITE_JOURNAL_MODE=""
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = database_path or os.path.join(tmp, "benchmark.db")
+        benchmark_config = type(
+            "Benchmark",
+            (config.Test,),
+            {"SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}", **config_overrides},
+        )
+
+        app = create_app(benchmark_config)
+        with app.app_context():
+            database.Base.metadata.create_all(database.engine)
+            try:
+                yield app
+            finally:
+                database.db_session.remove()
+                database.read_session.remove()
+                database.engine.dispose()
+                database.read_engine.dispose()
@@ -0,0 +1,74 @@
+"""
+Compare deleting stale records via a temporary table anti-join with NOT IN.
+
+Each run loads the given number of records into a fresh SQLite database, then deletes
+the 1% of them that are missing from the source wam_ids.
+
+Usage:
+    python -m benchmarks.delete_entries --records 500000
+    python -m benchmarks.delete_entries --records 100000 --records 500000
+"""
+
+import time
+from array import array
+
+import click
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.commands import _record_row, publish_entries
+from app.lib import database
+from app.lib.models import ArchiveRecord
+from app.lib.schemas import ArchiveRecordSchema
+from benchmarks.database import benchmark_app
+from benchmarks.synthetic import iter_entries
+
+
+def not_in_delete_entries(source_wam_ids, dry_run):
+    """The NOT IN deletion replaced by the anti-join in publish_entries()."""
+    query = database.db_session.query(ArchiveRecord).filter(
+        ArchiveRecord.wam_id.not_in(list(source_wam_ids))
+    )
+    record_count = query.count()
+    query.delete(synchronize_session=False)
+    database.db_session.commit()
+    return record_count
+
+
+def anti_join_delete_entries(source_wam_ids, dry_run):
+    return publish_entries(source_wam_ids, dry_run)
+
+
+def _load_records(count):
+    row = _record_row(ArchiveRecordSchema(**next(iter_entries(1))))
+    rows = [{**row, "wam_id": wam_id} for wam_id in range(1, count + 1)]
+    database.db_session.execute(ArchiveRecord.__table__.insert(), rows)
+    database.db_session.commit()
+
+
+@click.command()
+@click.option("--records", "record_counts", type=int, multiple=True, default=[500_000])
+def main(record_counts):
+    click.echo(f"{'records':>8} {'path':>9} {'deleted':>8} {'seconds':>8}")
+    for records in record_counts:
+        # Every 100th record is missing from the source
+        source_wam_ids = array(
+            "q", (wam_id for wam_id in range(1, records + 1) if wam_id % 100)
+        )
+        for name, delete in (
+            ("not in", not_in_delete_entries),
+            ("anti-join", anti_join_delete_entries),
+        ):
+            with benchmark_app():
+                _load_records(records)
+                start = time.perf_counter()
+                try:
+                    deleted = delete(source_wam_ids, dry_run=False)
+                except SQLAlchemyError as e:
+                    click.echo(f"{records:>8} {name:>9} failed: {e.orig}")
+                    continue
+                seconds = time.perf_counter() - start
+            click.echo(f"{records:>8} {name:>9} {deleted:>8} {seconds:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Peak RSS of reading the archive feed with json.loads vs the streaming parser.
+
+Each measurement runs in a fresh interpreter so ru_maxrss only reflects that run.
+
+Usage:
+    python -m benchmarks.feed_memory
+    python -m benchmarks.feed_memory --entries 100000 --entries 1000000
+"""
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from itertools import islice
+
+import click
+
+from app.lib.feed import FEED_CHUNK_SIZE, iter_json_array
+from benchmarks.synthetic import write_feed
+
+
+def _read_chunks(path):
+    with open(path, "rb") as f:
+        while chunk := f.read(FEED_CHUNK_SIZE):
+            yield chunk
+
+
+def _consume(entries, batch_size):
+    entries = iter(entries)
+    total = 0
+    while batch := list(islice(entries, batch_size)):
+        total += len(batch)
+    return total
+
+
+@click.command()
+@click.option(
+    "--entries", "sizes", type=int, multiple=True, default=[100_000, 1_000_000]
+)
+@click.option("--batch-size", type=int, default=5000)
+@click.option("--mode", type=click.Choice(["load", "stream"]), hidden=True)
+@click.option("--path", type=click.Path(), hidden=True)
+def main(sizes, batch_size, mode, path):
+    if mode:
+        # Child process: read the feed and report peak RSS as JSON
+        start = time.perf_counter()
+        if mode == "load":
+            with open(path, "rb") as f:
+                total = _consume(json.loads(f.read()), batch_size)
+        else:
+            total = _consume(iter_json_array(_read_chunks(path)), batch_size)
+        click.echo(
+            json.dumps(
+                {
+                    "entries": total,
+                    "seconds": round(time.perf_counter() - start, 2),
+                    # ru_maxrss is reported in KiB on Linux
+                    "peak_rss_mib": round(
+                        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1
+                    ),
+                }
+            )
+        )
+        return
+
+    click.echo(
+        f"{'entries':>10} {'feed MiB':>9} {'mode':>7} {'seconds':>8} "
+        f"{'peak RSS MiB':>13}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            feed_path = os.path.join(tmp, f"feed-{size}.json")
+            write_feed(feed_path, size)
+            feed_mib = os.path.getsize(feed_path) / 1024 / 1024
+            for child_mode in ("load", "stream"):
+                output = subprocess.run(
+                    [
+                        sys.executable,
+                        "-m",
+                        "benchmarks.feed_memory",
+                        "--mode",
+                        child_mode,
+                        "--path",
+                        feed_path,
+                        "--batch-size",
+                        str(batch_size),
+                    ],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout
+                result = json.loads(output)
+                click.echo(
+                    f"{size:>10} {feed_mib:>9.1f} {child_mode:>7} "
+                    f"{result['seconds']:>8} {result['peak_rss_mib']:>13}"
+                )
+            os.remove(feed_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Latency of A-Z listing queries while a sync writes to the same SQLite database.
+
+For each connection profile, a database of the given number of records is created.
+A writer process then repeatedly stages and publishes a change to every record,
+as a sync of a feed where every entry has changed would, while this process times
+the (uncached) A-Z listing query for random characters. Reads that can't get a
+lock within busy_timeout fail, and are counted.
+
+Profiles:
+
+- default: SQLite defaults (rollback journal, synchronous=FULL, 2 MiB page cache)
+- tuned: the SQLITE_* settings in config.py (WAL, synchronous=NORMAL, etc.)
+
+Usage:
+    python -m benchmarks.reader_latency --records 50000
+    python -m benchmarks.reader_latency --records 50000 --cycles 5 --profile tuned
+"""
+
+import contextlib
+import io
+import multiprocessing
+import os
+import random
+import statistics
+import tempfile
+import time
+
+import click
+from sqlalchemy.exc import OperationalError
+
+from app.commands import _record_row, publish_entries, save_entries
+from app.lib import database
+from app.lib.archive_service import get_records_page
+from app.lib.database import SQLITE_PRAGMAS
+from app.lib.schemas import ArchiveRecordSchema
+from app.lib.util import DIGITS_CATEGORY
+from benchmarks.database import benchmark_app
+from benchmarks.synthetic import iter_entries
+
+PROFILES = {
+    "default": dict.fromkeys(SQLITE_PRAGMAS, ""),
+    "tuned": {},
+}
+
+CHARACTERS = [DIGITS_CATEGORY, *"abcdefghijklmnopqrstuvwxyz"]
+
+
+def _rows(records, suffix=""):
+    return [
+        _record_row(
+            ArchiveRecordSchema(
+                **{**entry, "description": entry["description"] + suffix}
+            )
+        )
+        for entry in iter_entries(records)
+    ]
+
+
+def _write(database_path, profile, records, cycles, ready, results):
+    """Writer process: publish a change to every record, cycles times."""
+    versions = [_rows(records, " (updated)"), _rows(records)]
+    wam_ids = [row["wam_id"] for row in versions[0]]
+    publish_seconds = []
+    with (
+        benchmark_app(database_path, **PROFILES[profile]),
+        # Keep save_entries() progress out of the results
+        contextlib.redirect_stdout(io.StringIO()),
+    ):
+        ready.set()
+        for cycle in range(cycles):
+            rows = versions[cycle % 2]
+            start = time.perf_counter()
+            save_entries(rows, len(rows), 1000, False)
+            publish_entries(wam_ids, False)
+            publish_seconds.append(time.perf_counter() - start)
+    results.put(publish_seconds)
+
+
+def _read_until(writer):
+    latencies = []
+    failed = 0
+    while writer.is_alive():
+        start = time.perf_counter()
+        try:
+            get_records_page(random.choice(CHARACTERS))
+        except OperationalError:
+            failed += 1
+            database.read_session.rollback()
+        else:
+            latencies.append(time.perf_counter() - start)
+        database.read_session.remove()
+    return latencies, failed
+
+
+def _percentile(values, percent):
+    return (
+        statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+        if len(values) > 1
+        else 0
+    )
+
+
+def run(profile, records, cycles):
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        database_path = os.path.join(tmp, "benchmark.db")
+        with benchmark_app(database_path, **PROFILES[profile]):
+            database.db_session.execute(
+                database.Base.metadata.tables["archive_records"].insert(),
+                _rows(records),
+            )
+            database.db_session.commit()
+
+            ready = context.Event()
+            results = context.Queue()
+            writer = context.Process(
+                target=_write,
+                args=(database_path, profile, records, cycles, ready, results),
+            )
+            writer.start()
+            ready.wait()
+            latencies, failed = _read_until(writer)
+            publish_seconds = results.get()
+            writer.join()
+
+    return {
+        "reads": len(latencies),
+        "failed": failed,
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p95_ms": _percentile(latencies, 95) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "max_ms": max(latencies, default=0) * 1000,
+        "publish_seconds": statistics.mean(publish_seconds),
+    }
+
+
+@click.command()
+@click.option("--records", type=int, default=50_000)
+@click.option("--cycles", type=int, default=3, help="Publishes by the writer")
+@click.option(
+    "--profile",
+    "profiles",
+    type=click.Choice(list(PROFILES)),
+    multiple=True,
+    default=list(PROFILES),
+)
+def main(records, cycles, profiles):
+    click.echo(
+        f"{records} records, {cycles} publishes of every record, "
+        f"{os.cpu_count()} CPUs\n"
+    )
+    click.echo(
+        f"{'profile':>8} {'reads':>6} {'failed':>6} {'p50 ms':>7} {'p95 ms':>7} "
+        f"{'p99 ms':>7} {'max ms':>8} {'publish s':>10}"
+    )
+    for profile in profiles:
+        result = run(profile, records, cycles)
+        click.echo(
+            f"{profile:>8} {result['reads']:>6} {result['failed']:>6} "
+            f"{result['p50_ms']:>7.1f} {result['p95_ms']:>7.1f} "
+            f"{result['p99_ms']:>7.1f} {result['max_ms']:>8.1f} "
+            f"{result['publish_seconds']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
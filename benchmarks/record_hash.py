@@ -0,0 +1,81 @@
+"""
+Per-entry cost of validating an entry and converting it to an archive_records row.
+
+Compares the current path, which serialises the model once and hashes it with
+BLAKE2b, with the previous one, which serialised it again (and re-encoded it as
+sorted JSON) for an MD5 record_hash computed field, then once more for the row.
+
+Usage:
+    python -m benchmarks.record_hash --entries 50000
+"""
+
+import hashlib
+import json
+import time
+
+import click
+from pydantic import computed_field
+
+from app.commands import _record_row
+from app.lib.schemas import ArchiveRecordSchema
+from benchmarks.synthetic import iter_entries
+
+
+class MD5ArchiveRecordSchema(ArchiveRecordSchema):
+    """The record_hash computed field replaced by ArchiveRecordSchema.to_row()."""
+
+    @computed_field
+    @property
+    def record_hash(self) -> str:
+        data = self.model_dump(
+            mode="json",
+            exclude={
+                "wam_id",
+                "source_fingerprint",
+                "sort_name",
+                "first_character",
+                "record_hash",
+            },
+            by_alias=False,
+        )
+        json_str = json.dumps(data, sort_keys=True)
+        return hashlib.md5(json_str.encode(), usedforsecurity=False).hexdigest()
+
+
+def md5_row(raw_entry):
+    validated = MD5ArchiveRecordSchema(**raw_entry)
+    return {
+        "wam_id": validated.wam_id,
+        **validated.model_dump(mode="json", by_alias=False, exclude={"wam_id"}),
+    }
+
+
+def blake2b_row(raw_entry):
+    return _record_row(ArchiveRecordSchema(**raw_entry))
+
+
+def _timed(to_row, raw_entries):
+    start = time.perf_counter()
+    for raw_entry in raw_entries:
+        to_row(raw_entry)
+    return time.perf_counter() - start
+
+
+@click.command()
+@click.option("--entries", type=int, default=50_000)
+@click.option("--repeat", type=int, default=3)
+def main(entries, repeat):
+    raw_entries = list(iter_entries(entries))
+
+    click.echo(f"{entries} entries, best of {repeat}\n")
+    click.echo(f"{'path':>8} {'seconds':>8} {'µs/entry':>9} {'entries/sec':>12}")
+    for name, to_row in (("md5", md5_row), ("blake2b", blake2b_row)):
+        seconds = min(_timed(to_row, raw_entries) for _ in range(repeat))
+        click.echo(
+            f"{name:>8} {seconds:>8.2f} {seconds / entries * 1e6:>9.1f} "
+            f"{entries / seconds:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Compare staging and publishing entries in bulk with the previous ORM unit-of-work path.
+
+Each scenario runs against a fresh SQLite database:
+
+- insert: every entry is new
+- update: every entry has changed since the last sync
+- unchanged: every entry matches the stored hash
+
+Usage:
+    python -m benchmarks.save_entries --entries 50000
+"""
+
+import time
+
+import click
+
+from app.commands import _record_row, publish_entries, save_entries
+from app.lib import database
+from app.lib.models import ArchiveRecord
+from app.lib.schemas import ArchiveRecordSchema
+from benchmarks.database import benchmark_app
+from benchmarks.synthetic import iter_entries
+
+
+def orm_save_entries(validated_entries, commit_batch_size):
+    """The ORM implementation of save_entries() replaced by the bulk upsert."""
+    for batch_start in range(0, len(validated_entries), commit_batch_size):
+        batch = validated_entries[batch_start : batch_start + commit_batch_size]
+        existing_records = {
+            r.wam_id: r
+            for r in database.db_session.query(ArchiveRecord)
+            .filter(ArchiveRecord.wam_id.in_([v.wam_id for v in batch]))
+            .all()
+        }
+        with database.db_session.no_autoflush:
+            for validated in batch:
+                data = _record_row(validated)
+                del data["wam_id"]
+                existing = existing_records.get(validated.wam_id)
+                if existing is None:
+                    database.db_session.add(
+                        ArchiveRecord(wam_id=validated.wam_id, **data)
+                    )
+                elif existing.record_hash != validated.record_hash:
+                    for field, value in data.items():
+                        setattr(existing, field, value)
+        database.db_session.commit()
+        database.db_session.expire_all()
+
+
+def bulk_save_entries(validated_entries, commit_batch_size):
+    rows = [_record_row(validated) for validated in validated_entries]
+    save_entries(rows, len(rows), commit_batch_size, False)
+    publish_entries([row["wam_id"] for row in rows], False)
+
+
+def _validated(count, suffix=""):
+    return [
+        ArchiveRecordSchema(**{**entry, "description": entry["description"] + suffix})
+        for entry in iter_entries(count)
+    ]
+
+
+def _timed(save, validated_entries, commit_batch_size):
+    start = time.perf_counter()
+    save(validated_entries, commit_batch_size)
+    return time.perf_counter() - start
+
+
+@click.command()
+@click.option("--entries", type=int, default=50_000)
+@click.option("--commit-batch-size", type=int, default=1000)
+def main(entries, commit_batch_size):
+    original = _validated(entries)
+    changed = _validated(entries, suffix=" (updated)")
+
+    click.echo(f"{entries} entries, commit batches of {commit_batch_size}\n")
+    click.echo(f"{'scenario':>10} {'path':>5} {'seconds':>8} {'rows/sec':>10}")
+    for name, save in (("orm", orm_save_entries), ("bulk", bulk_save_entries)):
+        timings = {}
+        with benchmark_app():
+            timings["insert"] = _timed(save, original, commit_batch_size)
+            timings["update"] = _timed(save, changed, commit_batch_size)
+            timings["unchanged"] = _timed(save, changed, commit_batch_size)
+        for scenario, seconds in timings.items():
+            click.echo(
+                f"{scenario:>10} {name:>5} {seconds:>8.2f} {entries / seconds:>10.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Compare full-text search with the previous unbounded search query.
+
+A SQLite database of the given number of records is created, with the FTS5 search
+index from the migrations. The synthetic descriptions are drawn from a small
+vocabulary, so most queries match most records. For each query:
+
+- before: every match fetched and ranked, as search_records() did before paging
+- first: search_records() for the first page of ARCHIVE_PAGE_SIZE results
+- last: search_records() for the last page within ARCHIVE_SEARCH_MAX_RESULTS
+
+The median time and the peak memory allocated by Python are printed for each.
+
+Usage:
+    python -m benchmarks.search --records 50000
+"""
+
+import importlib.util
+import statistics
+import time
+import tracemalloc
+from functools import partial
+from pathlib import Path
+
+import click
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import text
+
+from app.commands import _record_row
+from app.lib import database
+from app.lib.archive_service import _sanitize_fts_query, search_records
+from app.lib.models import ArchiveRecord
+from app.lib.schemas import ArchiveRecordSchema
+from benchmarks.database import benchmark_app
+from benchmarks.synthetic import iter_entries
+
+MIGRATIONS = Path(__file__).parents[1] / "migrations" / "versions"
+
+QUERIES = ["heritage", "gov*", '"national archive" OR digital']
+
+
+def create_search_index():
+    """Create the FTS5 table and its triggers by running their migrations."""
+    with database.engine.begin() as connection:
+        operations = Operations(MigrationContext.configure(connection))
+        for filename in (
+            "4db4f118b950_add_archive_link_to_fts5_search.py",
+            "e5b27a9c4f10_add_fts5_sync_triggers.py",
+        ):
+            spec = importlib.util.spec_from_file_location(
+                filename, MIGRATIONS / filename
+            )
+            migration = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(migration)
+            with Operations.context(operations.migration_context):
+                migration.upgrade()
+
+
+def unbounded_search_records(query):
+    """The implementation of search_records() replaced by the paged search."""
+    result = database.read_session.execute(
+        text("""
+            SELECT ar.*
+            FROM archive_records ar
+            INNER JOIN archive_records_fts fts ON ar.id = fts.rowid
+            WHERE archive_records_fts MATCH :query
+            ORDER BY rank, ar.sort_name
+        """),
+        {"query": _sanitize_fts_query(query)},
+    )
+    items = [dict(row._mapping) for row in result.fetchall()]
+    return {"items": items, "meta": {"total_count": len(items)}}
+
+
+def _timed(search, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        search()
+        timings.append(time.perf_counter() - start)
+        database.read_session.remove()
+
+    tracemalloc.start()
+    result = search()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    database.read_session.remove()
+    return statistics.median(timings), peak, result
+
+
+@click.command()
+@click.option("--records", type=int, default=50_000)
+@click.option("--repeat", type=int, default=10, help="Timed runs of each search")
+def main(records, repeat):
+    with benchmark_app() as app:
+        create_search_index()
+        database.db_session.execute(
+            ArchiveRecord.__table__.insert(),
+            [
+                _record_row(ArchiveRecordSchema(**entry))
+                for entry in iter_entries(records)
+            ],
+        )
+        database.db_session.commit()
+
+        page_size = app.config["ARCHIVE_PAGE_SIZE"]
+        last_offset = app.config["ARCHIVE_SEARCH_MAX_RESULTS"] - page_size
+
+        click.echo(f"{records} records, pages of {page_size}\n")
+        click.echo(
+            f"{'query':>30} {'search':>7} {'ms':>8} {'peak KiB':>9} "
+            f"{'returned':>9} {'total':>7}"
+        )
+        for query in QUERIES:
+            for name, search in (
+                ("before", partial(unbounded_search_records, query)),
+                ("first", partial(search_records, query, page_size)),
+                ("last", partial(search_records, query, page_size, last_offset)),
+            ):
+                seconds, peak, result = _timed(search, repeat)
+                meta = result["meta"]
+                capped = "+" if meta.get("total_count_capped") else " "
+                click.echo(
+                    f"{query:>30} {name:>7} {seconds * 1000:>8.1f} "
+                    f"{peak / 1024:>9.0f} {len(result['items']):>9} "
+                    f"{meta['total_count']:>6}{capped}"
+                )
+
+
+if __name__ == "__main__":
+    main()
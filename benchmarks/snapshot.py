@@ -0,0 +1,126 @@
+"""
+Memory per worker of the A-Z listing snapshot, and reads from it compared with the
+cache.
+
+A SQLite database of the given number of records is created, then:
+
+- memory: the memory allocated by Python for the snapshot, which each worker
+  holds, and for the same records as dicts, as they were cached
+- reads: the median time to get the first page and a page from the middle of the
+  largest character listing from the snapshot, and from a FileSystemCache that
+  already holds them, as get_records_by_character() does without a snapshot
+
+Usage:
+    python -m benchmarks.snapshot --records 50000
+"""
+
+import gc
+import statistics
+import tempfile
+import time
+import tracemalloc
+from functools import partial
+
+import click
+from sqlalchemy import select
+
+from app.commands import _record_row
+from app.lib import database
+from app.lib.archive_service import (
+    LISTING_COLUMNS,
+    _load_snapshot,
+    encode_cursor,
+    get_records_by_character,
+)
+from app.lib.cache import cache
+from app.lib.models import ArchiveRecord
+from app.lib.schemas import ArchiveRecordSchema
+from benchmarks.database import benchmark_app
+from benchmarks.synthetic import iter_entries
+
+
+def _allocated(load):
+    """Memory allocated by Python for what load returns, and the value itself."""
+    gc.collect()
+    tracemalloc.start()
+    value = load()
+    gc.collect()
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return allocated, value
+
+
+def _timed(read, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        read()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+@click.command()
+@click.option("--records", type=int, default=50_000)
+@click.option("--repeat", type=int, default=200, help="Timed runs of each read")
+def main(records, repeat):
+    with (
+        tempfile.TemporaryDirectory() as cache_dir,
+        benchmark_app(
+            CACHE_TYPE="FileSystemCache",
+            CACHE_DIR=cache_dir,
+            CACHE_DEFAULT_TIMEOUT=0,
+            ARCHIVE_SNAPSHOT=True,
+            ARCHIVE_SNAPSHOT_CHECK_INTERVAL=3600,
+        ) as app,
+    ):
+        database.db_session.execute(
+            ArchiveRecord.__table__.insert(),
+            [
+                _record_row(ArchiveRecordSchema(**entry))
+                for entry in iter_entries(records)
+            ],
+        )
+        database.db_session.commit()
+
+        dicts_bytes, rows = _allocated(
+            lambda: [
+                dict(row)
+                for row in database.read_session.execute(
+                    select(*LISTING_COLUMNS)
+                ).mappings()
+            ]
+        )
+        del rows
+        database.read_session.remove()
+
+        snapshot_bytes, snapshot = _allocated(lambda: _load_snapshot(0))
+        database.read_session.remove()
+
+        character = max(snapshot.characters, key=snapshot.listing_count)
+        listing, _ = snapshot.listing_page(character)
+        cursor = encode_cursor("after", listing[len(listing) // 2]._asdict())
+
+        timings = {}
+        for source, enabled in (("snapshot", True), ("cache", False)):
+            app.config["ARCHIVE_SNAPSHOT"] = enabled
+            cache.clear()
+            for page, page_cursor in (("first", None), ("middle", cursor)):
+                # Fill the cache, when reading from it
+                get_records_by_character(character, page_cursor)
+                timings[source, page] = _timed(
+                    partial(get_records_by_character, character, page_cursor), repeat
+                )
+        cache.clear()
+
+    click.echo(
+        f"{records} records, '{character}' has {snapshot.listing_count(character)}\n"
+    )
+    click.echo(f"snapshot: {snapshot_bytes / 1024 / 1024:.1f} MiB allocated")
+    click.echo(f"   dicts: {dicts_bytes / 1024 / 1024:.1f} MiB allocated\n")
+    click.echo(f"{'source':>8} {'page':>6} {'ms':>8}")
+    for (source, page), seconds in timings.items():
+        click.echo(f"{source:>8} {page:>6} {seconds * 1000:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
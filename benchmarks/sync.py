@@ -0,0 +1,215 @@
+"""
+End-to-end benchmark of flask sync-archive-data against a synthetic feed.
+
+Two versions of a feed are generated (see benchmarks.synthetic.iter_feed) and
+served from a local HTTP server, then synced into a new SQLite database created
+with the migrations. Each sync runs in a fresh interpreter, in these scenarios:
+
+- fresh: the first version into the empty database
+- changed: the second version into the database populated by the first
+- unchanged: the second version again, which the server answers 304 Not Modified
+
+Wall time, entries and rows written per second, and peak RSS of each sync are
+written to a JSON results file along with each sync report. Everything runs
+locally, so no network access is needed.
+
+Usage:
+    python -m benchmarks.sync --entries 100000
+    python -m benchmarks.sync --entries 100000 --change-rate 0.05 --gzip -- --workers 2
+"""
+
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import click
+
+from benchmarks.synthetic import write_feed
+
+PROJECT_ROOT = Path(__file__).parents[1]
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def feed_server(directory):
+    """Serve files from directory over HTTP on a free local port, yielding its URL."""
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0), partial(_QuietHandler, directory=directory)
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _run(args, env):
+    return subprocess.run(
+        [sys.executable, "-m", *args],
+        cwd=PROJECT_ROOT,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+
+
+def _sync(url, report_path, sync_args, env):
+    start = time.perf_counter()
+    _run(
+        [
+            "flask",
+            "--app",
+            "main",
+            "sync-archive-data",
+            "--url",
+            url,
+            "--report-json",
+            str(report_path),
+            *sync_args,
+        ],
+        env,
+    )
+    wall_seconds = time.perf_counter() - start
+    report = json.loads(report_path.read_text())
+
+    stats = report["stats"]
+    rows = stats["created"] + stats["updated"] + max(stats["deleted"], 0)
+    return {
+        "wall_seconds": wall_seconds,
+        # Excluding interpreter and app startup
+        "sync_seconds": report["seconds"],
+        "outcome": report["outcome"],
+        "stats": stats,
+        "entries_per_sec": stats["total"] / wall_seconds,
+        "rows_per_sec": rows / wall_seconds,
+        "peak_rss_bytes": report["peak_rss_bytes"],
+        "peak_rss_workers_bytes": report["peak_rss_workers_bytes"],
+        "phases": {
+            name: {key: value for key, value in phase.items() if key != "batches"}
+            for name, phase in report["phases"].items()
+        },
+    }
+
+
+@click.command(context_settings={"ignore_unknown_options": True})
+@click.option("--entries", type=int, default=100_000)
+@click.option("--seed", type=int, default=0)
+@click.option("--change-rate", type=float, default=0.02)
+@click.option("--delete-rate", type=float, default=0.01)
+@click.option("--duplicate-rate", type=float, default=0.001)
+@click.option("--invalid-rate", type=float, default=0.001)
+@click.option("--gzip", "compress", is_flag=True, help="Serve the feed gzipped")
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False, writable=True),
+    default="sync-benchmark.json",
+    show_default=True,
+)
+@click.argument("sync_args", nargs=-1, type=click.UNPROCESSED)
+def main(
+    entries,
+    seed,
+    change_rate,
+    delete_rate,
+    duplicate_rate,
+    invalid_rate,
+    compress,
+    output,
+    sync_args,
+):
+    feed_options = {
+        "change_rate": change_rate,
+        "delete_rate": delete_rate,
+        "duplicate_rate": duplicate_rate,
+        "invalid_rate": invalid_rate,
+    }
+    feed_name = "feed.json.gz" if compress else "feed.json"
+    started_at = datetime.now(timezone.utc)
+
+    with tempfile.TemporaryDirectory() as tmp_name:
+        tmp = Path(tmp_name)
+        served = tmp / "served"
+        served.mkdir()
+
+        click.echo(f"Generating 2 versions of a {entries} entry feed...")
+        versions = []
+        for version in (0, 1):
+            path = tmp / f"v{version}-{feed_name}"
+            write_feed(path, entries, seed, version=version, **feed_options)
+            # Whole seconds apart, as Last-Modified has a resolution of one second
+            mtime = time.time() - 3600 + version * 60
+            os.utime(path, (mtime, mtime))
+            versions.append(path)
+
+        env = {
+            **os.environ,
+            "CONFIG": "config.Production",
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp / 'benchmark.db'}",
+            "CACHE_TYPE": "SimpleCache",
+        }
+        _run(["alembic", "upgrade", "head"], env)
+
+        results = []
+        with feed_server(served) as server_url:
+            url = f"{server_url}/{feed_name}"
+            for scenario, version in (("fresh", 0), ("changed", 1), ("unchanged", 1)):
+                shutil.copy2(versions[version], served / feed_name)
+                click.echo(f"Syncing {scenario}...")
+                result = _sync(url, tmp / f"{scenario}.json", sync_args, env)
+                results.append({"scenario": scenario, **result})
+
+        summary = {
+            "started_at": started_at.isoformat(),
+            "entries": entries,
+            "seed": seed,
+            **feed_options,
+            "gzip": compress,
+            "sync_args": list(sync_args),
+            "feed_bytes": [path.stat().st_size for path in versions],
+            "platform": {
+                "python": platform.python_version(),
+                "sqlite": sqlite3.sqlite_version,
+                "machine": platform.machine(),
+                "cpus": os.cpu_count(),
+            },
+            "results": results,
+        }
+
+    with open(output, "w") as f:
+        json.dump(summary, f, indent=2)
+
+    click.echo(
+        f"\n{'scenario':>10} {'outcome':>12} {'seconds':>8} {'entries/sec':>12} "
+        f"{'rows/sec':>10} {'peak RSS MiB':>13}"
+    )
+    for result in results:
+        click.echo(
+            f"{result['scenario']:>10} {result['outcome']:>12} "
+            f"{result['wall_seconds']:>8.2f} {result['entries_per_sec']:>12.0f} "
+            f"{result['rows_per_sec']:>10.0f} "
+            f"{result['peak_rss_bytes'] / 1024 / 1024:>13.1f}"
+        )
+    click.echo(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
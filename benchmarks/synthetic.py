@@ -0,0 +1,130 @@
+"""
+Synthetic archive feed entries matching the schema documented in app/commands.py.
+"""
+
+import gzip
+import json
+import random
+
+DOMAIN_TYPES = [
+    "Central government",
+    "Local government",
+    "Non-departmental public body",
+    "Public inquiry",
+    "Royal household",
+]
+
+WORDS = [
+    "agency",
+    "archive",
+    "board",
+    "commission",
+    "council",
+    "department",
+    "digital",
+    "education",
+    "environment",
+    "government",
+    "health",
+    "heritage",
+    "national",
+    "office",
+    "review",
+    "service",
+    "transport",
+    "trust",
+]
+
+
+def make_entry(wam_id, rng):
+    """Build a single feed entry with realistic field sizes."""
+    name = " ".join(rng.choice(WORDS).title() for _ in range(rng.randint(2, 5)))
+    if rng.random() < 0.2:
+        name = f"The {name}"
+    slug = name.lower().replace(" ", "")
+    first_year = rng.randint(1996, 2020)
+    latest_year = rng.randint(first_year, 2026)
+    return {
+        "profileName": name,
+        "entryUrl": f"https://www.{slug}.gov.uk/",
+        "archiveLink": f"https://webarchive.nationalarchives.gov.uk/ukgwa/*/https://www.{slug}.gov.uk/",
+        "domainType": rng.choice(DOMAIN_TYPES),
+        "firstCapture": f"{first_year}-01-01T00:00:00Z",
+        "firstCaptureDisplay": str(first_year),
+        "latestCapture": f"{latest_year}-12-31T00:00:00Z",
+        "latestCaptureDisplay": str(latest_year),
+        "ongoing": latest_year == 2026,
+        "wamId": wam_id,
+        "wamLink": f"https://wam.example.com/{wam_id}",
+        "parentId": None,
+        "generatedOn": "2026-01-01T00:00:00Z",
+        "currentDepartments": [rng.choice(WORDS).title()],
+        "previousDepartments": [],
+        "description": " ".join(rng.choice(WORDS) for _ in range(rng.randint(10, 40))),
+    }
+
+
+def iter_entries(count, seed=0):
+    rng = random.Random(seed)
+    for wam_id in range(1, count + 1):
+        yield make_entry(wam_id, rng)
+
+
+def iter_feed(
+    count,
+    seed=0,
+    version=0,
+    change_rate=0.0,
+    delete_rate=0.0,
+    duplicate_rate=0.0,
+    invalid_rate=0.0,
+):
+    """
+    Entries of one version of a feed, starting from the entries of iter_entries().
+
+    Version 0 is the baseline. Each later version changes the description of a
+    change_rate fraction of the baseline entries and replaces a delete_rate fraction
+    of them with new entries, so the feed stays the same size. In every version, a
+    duplicate_rate fraction of entries appear twice and an invalid_rate fraction
+    have an invalid URL. The same arguments always give the same entries.
+    """
+    rng = random.Random(f"{seed}:{version}")
+    if not version:
+        change_rate = delete_rate = 0.0
+    deleted = 0
+    new_wam_ids = iter(range(count * (version + 1) + 1, count * (version + 2) + 1))
+
+    def _vary(entry):
+        if rng.random() < invalid_rate:
+            entry = {**entry, "entryUrl": "not a url"}
+        yield entry
+        if rng.random() < duplicate_rate:
+            yield entry
+
+    for entry in iter_entries(count, seed):
+        change = rng.random()
+        if change < delete_rate:
+            deleted += 1
+            continue
+        if change < delete_rate + change_rate:
+            entry["description"] += f" (changed in version {version})"
+        yield from _vary(entry)
+
+    for _ in range(deleted):
+        yield from _vary(make_entry(next(new_wam_ids), rng))
+
+
+def write_feed(path, count, seed=0, **feed_options):
+    """
+    Write a JSON array feed to path without holding all entries in memory.
+
+    Paths ending .gz are gzip compressed. Other arguments are passed to iter_feed().
+    """
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "wt") as f:
+        f.write("[")
+        for i, entry in enumerate(iter_feed(count, seed, **feed_options)):
+            if i:
+                f.write(",")
+            f.write(json.dumps(entry))
+        f.write("]")
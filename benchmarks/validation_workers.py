@@ -0,0 +1,52 @@
+"""
+Validation throughput of sync-archive-data with different numbers of workers.
+
+Every entry is treated as new, so each one goes through full Pydantic validation.
+
+Usage:
+    python -m benchmarks.validation_workers --entries 100000
+    python -m benchmarks.validation_workers --workers 1 --workers 4
+"""
+
+import os
+import time
+from itertools import islice
+
+import click
+
+from app.commands import _validate_batches
+from benchmarks.synthetic import iter_entries
+
+
+def _iter_batches(entries, batch_size):
+    entries = iter(entries)
+    while batch := list(islice(entries, batch_size)):
+        yield batch
+
+
+@click.command()
+@click.option("--entries", type=int, default=100_000)
+@click.option("--batch-size", type=int, default=5000)
+@click.option(
+    "--workers", "worker_counts", type=int, multiple=True, default=[1, 2, 4, 8]
+)
+def main(entries, batch_size, worker_counts):
+    raw_entries = list(iter_entries(entries))
+
+    click.echo(f"{entries} entries, batches of {batch_size}, {os.cpu_count()} CPUs\n")
+    click.echo(f"{'workers':>8} {'seconds':>8} {'entries/sec':>12}")
+    for workers in worker_counts:
+        batches = _iter_batches(raw_entries, batch_size)
+
+        start = time.perf_counter()
+        validated = sum(
+            len(result[0]) for _, result in _validate_batches(batches, {}, workers)
+        )
+        seconds = time.perf_counter() - start
+
+        assert validated == entries
+        click.echo(f"{workers:>8} {seconds:>8.2f} {entries / seconds:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -42,6 +42,22 @@ class Production(Features):
     ITEMS_PER_SITEMAP: int = int(os.environ.get("ITEMS_PER_SITEMAP", "500"))
 
     PAGINATION_PAGE_SIZE: int = int(os.environ.get("PAGINATION_PAGE_SIZE", "12"))
+    # Records per page of an A-to-Z character listing or search results, and the most an
+    # API request can ask for with limit
+    ARCHIVE_PAGE_SIZE: int = int(os.environ.get("ARCHIVE_PAGE_SIZE", "100"))
+    ARCHIVE_LIMIT_MAX: int = int(os.environ.get("ARCHIVE_LIMIT_MAX", "1000"))
+    # Serve A-to-Z listings from a snapshot of the records in each worker, checking
+    # for a new data generation to load at most once every CHECK_INTERVAL seconds
+    ARCHIVE_SNAPSHOT: bool = strtobool(os.getenv("ARCHIVE_SNAPSHOT", "True"))
+    ARCHIVE_SNAPSHOT_CHECK_INTERVAL: int = int(
+        os.environ.get("ARCHIVE_SNAPSHOT_CHECK_INTERVAL", "10")
+    )
+    # The most search matches that are counted and can be paged through
+    ARCHIVE_SEARCH_MAX_RESULTS: int = int(
+        os.environ.get("ARCHIVE_SEARCH_MAX_RESULTS", "1000")
+    )
+    # Pages from the start of each changed A-to-Z listing that a sync renders
+    ARCHIVE_PRERENDER_PAGES: int = int(os.environ.get("ARCHIVE_PRERENDER_PAGES", "3"))
 
     COOKIE_DOMAIN: str = os.environ.get("COOKIE_DOMAIN", "")
 
@@ -75,6 +91,8 @@ class Production(Features):
     CACHE_DEFAULT_TIMEOUT: int = int(os.environ.get("CACHE_DEFAULT_TIMEOUT", "900"))
     CACHE_IGNORE_ERRORS: bool = True
     CACHE_DIR: str = os.environ.get("CACHE_DIR", "/tmp")
+    # Most entries a FileSystemCache holds before evicting those that expire soonest
+    CACHE_THRESHOLD: int = int(os.environ.get("CACHE_THRESHOLD", "5000"))
     CACHE_REDIS_URL: str = os.environ.get("CACHE_REDIS_URL", "")
 
     GA4_ID: str = os.environ.get("GA4_ID", "")
@@ -84,6 +102,33 @@ class Production(Features):
         "SQLALCHEMY_DATABASE_URI",
         f"sqlite:///{os.path.join(os.path.dirname(__file__), 'app.db')}",
     )
+    # Used to handle requests, e.g. a PostgreSQL replica. If not set, SQLite databases
+    # are opened read-only and other databases use SQLALCHEMY_DATABASE_URI
+    SQLALCHEMY_READ_DATABASE_URI: str = os.environ.get(
+        "SQLALCHEMY_READ_DATABASE_URI", ""
+    )
+    SQLALCHEMY_POOL_SIZE: int = int(os.environ.get("SQLALCHEMY_POOL_SIZE", "5"))
+    SQLALCHEMY_MAX_OVERFLOW: int = int(os.environ.get("SQLALCHEMY_MAX_OVERFLOW", "10"))
+    # Seconds before a pooled connection is replaced, -1 to keep connections open
+    SQLALCHEMY_POOL_RECYCLE: int = int(os.environ.get("SQLALCHEMY_POOL_RECYCLE", "-1"))
+    # Test connections when they are taken from the pool, e.g. after a failover
+    SQLALCHEMY_POOL_PRE_PING: bool = strtobool(
+        os.getenv("SQLALCHEMY_POOL_PRE_PING", "False")
+    )
+
+    # Applied as PRAGMAs to every new SQLite connection, an empty value leaves the
+    # SQLite default. See https://www.sqlite.org/pragma.html
+    SQLITE_JOURNAL_MODE: str = os.environ.get("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS: str = os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_MMAP_SIZE: str = os.environ.get("SQLITE_MMAP_SIZE", "268435456")  # 256 MiB
+    SQLITE_CACHE_SIZE: str = os.environ.get("SQLITE_CACHE_SIZE", "-65536")  # 64 MiB
+    SQLITE_TEMP_STORE: str = os.environ.get("SQLITE_TEMP_STORE", "MEMORY")
+    SQLITE_BUSY_TIMEOUT: str = os.environ.get("SQLITE_BUSY_TIMEOUT", "5000")  # ms
+
+    # Scheduled archive sync (flask archive-sync-daemon), all in seconds
+    ARCHIVE_SYNC_INTERVAL: int = int(os.environ.get("ARCHIVE_SYNC_INTERVAL", "3600"))
+    ARCHIVE_SYNC_JITTER: int = int(os.environ.get("ARCHIVE_SYNC_JITTER", "300"))
+    ARCHIVE_SYNC_LOCK_TTL: int = int(os.environ.get("ARCHIVE_SYNC_LOCK_TTL", "300"))
 
 
 class Staging(Production):
@@ -111,6 +156,9 @@ class Test(Production):
     CACHE_TYPE: str = "SimpleCache"
     CACHE_DEFAULT_TIMEOUT: int = 1
 
+    # Tests of listings use the database, or enable snapshots themselves
+    ARCHIVE_SNAPSHOT: bool = False
+
     FORCE_HTTPS: bool = False
     PREFERRED_URL_SCHEME: str = "http"
 
@@ -4,8 +4,35 @@ set -e
 echo "Running database migrations..."
 poetry run alembic upgrade head
 
-echo "Syncing archive data..."
-poetry run flask sync-archive-data
+if [ "${ARCHIVE_SYNC_DAEMON:-true}" != "true" ]; then
+  echo "Starting application..."
+  exec "$@"
+fi
+
+# Sync in the background, so the application starts straight away on the last
+# synced data. /healthcheck/ready/ reports when there is data to serve.
+echo "Starting archive data sync daemon..."
+poetry run flask archive-sync-daemon &
+daemon=$!
 
 echo "Starting application..."
-exec "$@"
+"$@" &
+app=$!
+
+# Pass on the signals that stop the container to both, so the daemon can release
+# its sync lease rather than leaving it to expire
+trap 'kill -TERM "$app" "$daemon" 2>/dev/null' TERM INT
+
+# The container runs for as long as the application does. wait returns early when
+# a signal is trapped, so wait again until the application has exited.
+set +e
+while kill -0 "$app" 2>/dev/null; do
+  wait "$app"
+done
+wait "$app"
+status=$?
+
+echo "Stopping archive data sync daemon..."
+kill -TERM "$daemon" 2>/dev/null
+wait "$daemon"
+exit "$status"
@@ -24,6 +24,13 @@ if config.config_file_name is not None:
 target_metadata = Base.metadata
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    """Leave out the search index objects, which migrations create by dialect."""
+    if type_ == "table" and name.startswith("archive_records_fts"):
+        return False
+    return name not in ("search_vector", "ix_archive_records_search_vector")
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -40,6 +47,7 @@ def run_migrations_offline() -> None:
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
         render_as_batch=True,  # Enable batch mode for SQLite
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -64,6 +72,7 @@ def run_migrations_online() -> None:
             connection=connection,
             target_metadata=target_metadata,
             render_as_batch=True,  # Enable batch mode for SQLite
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,97 @@
+"""rehash archive records with blake2b
+
+Revision ID: 1f8c2d7e4b90
+Revises: d96174713a7b
+Create Date: 2026-10-17 03:12:44.208315
+
+"""
+
+import hashlib
+import json
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "1f8c2d7e4b90"
+down_revision: Union[str, Sequence[str], None] = "d96174713a7b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rows rehashed per statement
+BATCH_SIZE = 5000
+
+# Copied from app.lib.schemas as of this revision, so the migration doesn't change
+# if the schema does
+RECORD_HASH_FIELDS = (
+    "profile_name",
+    "record_url",
+    "archive_link",
+    "domain_type",
+    "first_capture_display",
+    "latest_capture_display",
+    "ongoing",
+    "description",
+)
+
+
+def blake2b_record_hash(row):
+    values = repr(tuple(row[name] for name in RECORD_HASH_FIELDS))
+    return hashlib.blake2b(values.encode(), digest_size=16).hexdigest()
+
+
+def md5_record_hash(row):
+    data = {name: row[name] for name in RECORD_HASH_FIELDS}
+    return hashlib.md5(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+
+def _rehash(table_name, record_hash):
+    table = sa.table(
+        table_name,
+        sa.column("id", sa.Integer),
+        sa.column("record_hash", sa.String),
+        sa.column("ongoing", sa.Boolean),
+        *(sa.column(name, sa.Text) for name in RECORD_HASH_FIELDS if name != "ongoing"),
+    )
+    update = (
+        table.update()
+        .where(table.c.id == sa.bindparam("row_id"))
+        .values(record_hash=sa.bindparam("new_record_hash"))
+    )
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        rows = (
+            connection.execute(
+                sa.select(table)
+                .where(table.c.id > last_id)
+                .order_by(table.c.id)
+                .limit(BATCH_SIZE)
+            )
+            .mappings()
+            .all()
+        )
+        if not rows:
+            return
+        connection.execute(
+            update,
+            [
+                {"row_id": row["id"], "new_record_hash": record_hash(row)}
+                for row in rows
+            ],
+        )
+        last_id = rows[-1]["id"]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The record_hash column is unchanged (32 hex characters), only its contents
+    for table_name in ("archive_records", "archive_records_stage"):
+        _rehash(table_name, blake2b_record_hash)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table_name in ("archive_records", "archive_records_stage"):
+        _rehash(table_name, md5_record_hash)
@@ -20,6 +20,10 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     """Upgrade schema."""
+    # FTS5 is SQLite only, PostgreSQL is searched with archive_records.search_vector
+    if op.get_context().dialect.name != "sqlite":
+        return
+
     # Create FTS5 virtual table for search using external content table pattern
     op.execute("""
         CREATE VIRTUAL TABLE archive_records_fts USING fts5(
@@ -39,4 +43,7 @@ def upgrade() -> None:
 
 def downgrade() -> None:
     """Downgrade schema."""
+    if op.get_context().dialect.name != "sqlite":
+        return
+
     op.execute("DROP TABLE IF EXISTS archive_records_fts")
@@ -20,6 +20,9 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     """Upgrade schema."""
+    if op.get_context().dialect.name != "sqlite":
+        return
+
     # Drop FTS5 virtual table and recreate to include the archive_link
     op.execute("DROP TABLE IF EXISTS archive_records_fts")
     op.execute("""
@@ -41,6 +44,9 @@ def upgrade() -> None:
 
 def downgrade() -> None:
     """Downgrade schema."""
+    if op.get_context().dialect.name != "sqlite":
+        return
+
     # Drop FTS5 virtual table and recreate without the archive_link
     op.execute("DROP TABLE IF EXISTS archive_records_fts")
     op.execute("""
@@ -0,0 +1,58 @@
+"""add postgresql full-text search
+
+Revision ID: 9e4a7c2b5d13
+Revises: 1f8c2d7e4b90
+Create Date: 2026-10-17 16:05:27.913402
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "9e4a7c2b5d13"
+down_revision: Union[str, Sequence[str], None] = "1f8c2d7e4b90"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLite is searched with the archive_records_fts FTS5 table instead
+    if op.get_context().dialect.name != "postgresql":
+        return
+
+    # Generated from the same columns as archive_records_fts, and tokenised like the
+    # FTS5 default tokenizer (lower case, no stemming or stop words)
+    op.add_column(
+        "archive_records",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "to_tsvector('simple', profile_name || ' ' || description || ' ' "
+                "|| archive_link)",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_archive_records_search_vector",
+        "archive_records",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_context().dialect.name != "postgresql":
+        return
+
+    op.drop_index("ix_archive_records_search_vector", table_name="archive_records")
+    op.drop_column("archive_records", "search_vector")
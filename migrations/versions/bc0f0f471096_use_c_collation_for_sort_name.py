@@ -0,0 +1,52 @@
+"""use c collation for sort_name
+
+Revision ID: bc0f0f471096
+Revises: 42dfffc6a092
+Create Date: 2026-10-17 21:14:36.118402
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "bc0f0f471096"
+down_revision: Union[str, Sequence[str], None] = "42dfffc6a092"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("archive_records", "archive_records_stage")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLite already compares text by code point, as Python does when paging the
+    # listing snapshot. PostgreSQL rebuilds the indexes on sort_name as it changes.
+    if op.get_context().dialect.name != "postgresql":
+        return
+
+    for table in TABLES:
+        op.alter_column(
+            table,
+            "sort_name",
+            type_=sa.Text(collation="C"),
+            existing_type=sa.Text(),
+            existing_nullable=False,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_context().dialect.name != "postgresql":
+        return
+
+    for table in TABLES:
+        op.alter_column(
+            table,
+            "sort_name",
+            type_=sa.Text(),
+            existing_type=sa.Text(collation="C"),
+            existing_nullable=False,
+        )
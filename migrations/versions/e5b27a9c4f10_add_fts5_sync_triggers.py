@@ -0,0 +1,68 @@
+"""add fts5 sync triggers
+
+Revision ID: e5b27a9c4f10
+Revises: d83a0b5c61f2
+Create Date: 2026-10-17 14:22:51.318904
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa  # noqa: F401
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e5b27a9c4f10"
+down_revision: Union[str, Sequence[str], None] = "d83a0b5c61f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_context().dialect.name != "sqlite":
+        return
+
+    # Keep the external content FTS5 index in sync with archive_records row by row,
+    # so a sync only re-tokenises the records it changes
+    op.execute("""
+        CREATE TRIGGER archive_records_fts_insert AFTER INSERT ON archive_records
+        BEGIN
+            INSERT INTO archive_records_fts(rowid, profile_name, description, archive_link)
+            VALUES (new.id, new.profile_name, new.description, new.archive_link);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER archive_records_fts_delete AFTER DELETE ON archive_records
+        BEGIN
+            INSERT INTO archive_records_fts(
+                archive_records_fts, rowid, profile_name, description, archive_link
+            )
+            VALUES ('delete', old.id, old.profile_name, old.description, old.archive_link);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER archive_records_fts_update
+        AFTER UPDATE OF profile_name, description, archive_link ON archive_records
+        BEGIN
+            INSERT INTO archive_records_fts(
+                archive_records_fts, rowid, profile_name, description, archive_link
+            )
+            VALUES ('delete', old.id, old.profile_name, old.description, old.archive_link);
+            INSERT INTO archive_records_fts(rowid, profile_name, description, archive_link)
+            VALUES (new.id, new.profile_name, new.description, new.archive_link);
+        END
+    """)
+
+    # Bring the index up to date with any changes since the last full rebuild
+    op.execute("INSERT INTO archive_records_fts(archive_records_fts) VALUES('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_context().dialect.name != "sqlite":
+        return
+
+    op.execute("DROP TRIGGER IF EXISTS archive_records_fts_update")
+    op.execute("DROP TRIGGER IF EXISTS archive_records_fts_delete")
+    op.execute("DROP TRIGGER IF EXISTS archive_records_fts_insert")
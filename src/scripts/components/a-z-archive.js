@@ -11,6 +11,7 @@ import {
   createAccordion,
   renderError,
   renderLoading,
+  renderMoreRecordsButton,
   renderRecords,
   resetPanelToBrowseFallback,
   updateLiveRegion,
@@ -161,7 +162,8 @@ export default class AtoZArchive {
     renderLoading(panel);
 
     try {
-      const records = await this.api.getRecordsForLetter(letter);
+      const { records, nextCursor } =
+        await this.api.getRecordsForLetter(letter);
       const elapsed = Date.now() - loadStarted;
       if (elapsed < MIN_LOADER_MS) {
         await new Promise((r) => setTimeout(r, MIN_LOADER_MS - elapsed));
@@ -172,7 +174,7 @@ export default class AtoZArchive {
         await new Promise((r) => setTimeout(r, LOADER_FADEOUT_MS));
       }
       panel.removeAttribute("aria-busy");
-      renderRecords(panel, records);
+      this.renderLetterRecords(panel, letter, records, nextCursor);
       return records;
     } catch (_error) {
       const elapsed = Date.now() - loadStarted;
@@ -190,6 +192,33 @@ export default class AtoZArchive {
     }
   }
 
+  renderLetterRecords(panel, letter, records, nextCursor) {
+    renderRecords(panel, records);
+    if (!nextCursor) {
+      return;
+    }
+
+    renderMoreRecordsButton(panel, async () => {
+      const loaded = await this.api.getMoreRecordsForLetter(letter);
+      // Ignore pages that arrive after a search has replaced the letter's records.
+      if (this.activeQuery) {
+        return;
+      }
+      this.renderLetterRecords(
+        panel,
+        letter,
+        loaded.records,
+        loaded.nextCursor,
+      );
+      // Move focus to the first of the records just loaded.
+      const firstNew = panel.querySelectorAll("li")[records.length];
+      const link = firstNew && firstNew.querySelector("a");
+      if (link) {
+        link.focus();
+      }
+    });
+  }
+
   /**
    * Show user-visible message when the initial characters API fails.
    * Keeps static (server-rendered) content visible; no enhanced A–Z.
@@ -432,8 +461,16 @@ export default class AtoZArchive {
     const staticGrouped = this.parseStaticRecords();
 
     // Only seed browse cache from a letter page, not from search result pages
-    // (search pages may include partial per-letter subsets).
-    if (this.selectedCharacter && staticGrouped.has(this.selectedCharacter)) {
+    // (search pages may include partial per-letter subsets), and only when the
+    // letter fits on one page.
+    const isPaged = Boolean(
+      this.staticContent.querySelector("[data-az-pagination]"),
+    );
+    if (
+      this.selectedCharacter &&
+      !isPaged &&
+      staticGrouped.has(this.selectedCharacter)
+    ) {
       this.api.seedRecords(
         this.selectedCharacter,
         staticGrouped.get(this.selectedCharacter),
@@ -1,3 +1,6 @@
+/** Records per API request, loaded as each page is asked for. */
+const RECORDS_PAGE_LIMIT = 100;
+
 export default class ArchiveApiClient {
   constructor(charactersUrl, recordsApiUrl) {
     this.charactersUrl = charactersUrl;
@@ -21,8 +24,15 @@ export default class ArchiveApiClient {
     return Array.isArray(payload.characters) ? payload.characters : [];
   }
 
-  async fetchRecords(letter) {
-    const query = new URLSearchParams({ character: letter });
+  async fetchRecords(letter, cursor = null) {
+    // A page of the letter's records, and the cursor of the next page if any.
+    const query = new URLSearchParams({
+      character: letter,
+      limit: RECORDS_PAGE_LIMIT,
+    });
+    if (cursor) {
+      query.set("cursor", cursor);
+    }
     const response = await fetch(`${this.recordsApiUrl}?${query.toString()}`, {
       headers: {
         Accept: "application/json",
@@ -34,11 +44,14 @@ export default class ArchiveApiClient {
     }
 
     const payload = await response.json();
-    return Array.isArray(payload.items) ? payload.items : [];
+    return {
+      records: Array.isArray(payload.items) ? payload.items : [],
+      nextCursor: payload.meta ? payload.meta.next_cursor : null,
+    };
   }
 
   seedRecords(letter, records) {
-    this.recordsByLetter.set(letter, records);
+    this.recordsByLetter.set(letter, { records, nextCursor: null });
   }
 
   hasRecords(letter) {
@@ -56,16 +69,34 @@ export default class ArchiveApiClient {
       return this.recordsByLetter.get(letter);
     }
 
+    return this.loadRecords(letter, null);
+  }
+
+  /* eslint-disable-next-line require-await */
+  async getMoreRecordsForLetter(letter) {
+    const loaded = this.recordsByLetter.get(letter);
+    if (!loaded || !loaded.nextCursor) {
+      return loaded;
+    }
+
+    return this.loadRecords(letter, loaded.nextCursor, loaded.records);
+  }
+
+  loadRecords(letter, cursor, previousRecords = []) {
     // Reuse a pending request so repeated opens of the same letter don't duplicate calls.
     if (this.loadingByLetter.has(letter)) {
       return this.loadingByLetter.get(letter);
     }
 
-    const promise = this.fetchRecords(letter)
-      .then((items) => {
-        this.recordsByLetter.set(letter, items);
+    const promise = this.fetchRecords(letter, cursor)
+      .then(({ records, nextCursor }) => {
+        const loaded = {
+          records: [...previousRecords, ...records],
+          nextCursor,
+        };
+        this.recordsByLetter.set(letter, loaded);
         this.loadingByLetter.delete(letter);
-        return items;
+        return loaded;
       })
       .catch((error) => {
         this.loadingByLetter.delete(letter);
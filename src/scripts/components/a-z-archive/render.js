@@ -20,6 +20,7 @@ const CLASSES = {
   listingItemTitle: "listing-item__title heading heading--four",
   listingItemUrl: "listing-item__url supporting",
   listingItemDate: "listing-item__date supporting",
+  moreButton: "tna-button tna-button--secondary",
 };
 
 export function createLink(href, text, className) {
@@ -92,6 +93,31 @@ export function renderRecords(panel, records) {
   panel.appendChild(list);
 }
 
+export function renderMoreRecordsButton(panel, onClick) {
+  // Further pages of a letter are only loaded when asked for.
+  const wrapper = document.createElement("p");
+  wrapper.className = CLASSES.marginTopXs;
+
+  const button = document.createElement("button");
+  button.type = "button";
+  button.className = CLASSES.moreButton;
+  button.textContent = "Show more records";
+  button.addEventListener("click", async () => {
+    button.disabled = true;
+    button.textContent = "Loading...";
+    try {
+      await onClick();
+    } catch (_error) {
+      button.disabled = false;
+      button.textContent = "Could not load more records. Try again";
+    }
+  });
+
+  wrapper.appendChild(button);
+  panel.appendChild(wrapper);
+  return button;
+}
+
 export function renderLoading(panel) {
   panel.innerHTML = "";
 
@@ -0,0 +1,70 @@
+import unittest
+
+from app import create_app
+from app.commands import _record_row
+from app.lib import database
+from app.lib.cache import cache
+from app.lib.models import ArchiveRecord
+from app.lib.schemas import ArchiveRecordSchema
+
+
+class ArchiveRecordsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("config.Test")
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        database.Base.metadata.create_all(database.engine)
+        cache.clear()
+        for wam_id in range(1, 6):
+            validated = ArchiveRecordSchema(
+                profileName=f"Digital Service {wam_id}",
+                entryUrl=f"https://example{wam_id}.gov.uk/",
+                archiveLink=f"https://webarchive.example.com/{wam_id}",
+                firstCaptureDisplay="2010",
+                latestCaptureDisplay="2024",
+                wamId=wam_id,
+                description="",
+            )
+            database.db_session.add(ArchiveRecord(**_record_row(validated)))
+        database.db_session.commit()
+
+    def tearDown(self):
+        database.db_session.remove()
+        database.Base.metadata.drop_all(database.engine)
+        self.app_context.pop()
+
+    def test_pages_with_cursor_and_limit(self):
+        rv = self.client.get("/api/archive/records?character=d&limit=2")
+        self.assertEqual(rv.status_code, 200)
+        self.assertEqual([item["wam_id"] for item in rv.json["items"]], [1, 2])
+        self.assertEqual(rv.json["meta"]["total_count"], 5)
+        self.assertEqual(rv.json["meta"]["limit"], 2)
+        self.assertIsNone(rv.json["meta"]["previous_cursor"])
+
+        wam_ids = []
+        cursor = rv.json["meta"]["next_cursor"]
+        while cursor:
+            rv = self.client.get(
+                f"/api/archive/records?character=d&limit=2&cursor={cursor}"
+            )
+            wam_ids.extend(item["wam_id"] for item in rv.json["items"])
+            cursor = rv.json["meta"]["next_cursor"]
+        self.assertEqual(wam_ids, [3, 4, 5])
+
+    def test_default_page_size(self):
+        self.app.config["ARCHIVE_PAGE_SIZE"] = 3
+        rv = self.client.get("/api/archive/records?character=d")
+        self.assertEqual(len(rv.json["items"]), 3)
+        self.assertIsNotNone(rv.json["meta"]["next_cursor"])
+
+    def test_invalid_limit(self):
+        for limit in ("0", "-1", "ten"):
+            with self.subTest(limit=limit):
+                rv = self.client.get(f"/api/archive/records?character=d&limit={limit}")
+                self.assertEqual(rv.status_code, 400)
+
+    def test_invalid_cursor(self):
+        rv = self.client.get("/api/archive/records?character=d&cursor=nonsense")
+        self.assertEqual(rv.status_code, 400)
+        self.assertEqual(rv.json["message"], "Parameter 'cursor' is not valid")
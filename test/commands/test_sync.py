@@ -1,19 +1,46 @@
+import gzip
+import importlib.util
+import json
+import tempfile
 import unittest
-from unittest.mock import MagicMock, patch
+from array import array
+from pathlib import Path
+from unittest.mock import patch
 
+import requests_mock
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
 from click.testing import CliRunner
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import scoped_session, sessionmaker
 
 from app import create_app
 from app.commands import (
     _clear_cache,
+    _record_row,
+    _validate_batches,
+    get_sync_state,
+    publish_entries,
     save_entries,
-    save_entry,
     sync_archive_data,
     validate_entries,
 )
 from app.lib import archive_service, database
 from app.lib.cache import cache
-from app.lib.models import ArchiveRecord
+from app.lib.models import (
+    ArchiveRecord,
+    ArchiveRecordStage,
+    ArchiveSyncCheckpoint,
+    ArchiveSyncState,
+)
+from app.lib.schemas import (
+    SOURCE_FINGERPRINT_KEYS,
+    ArchiveRecordSchema,
+    source_fingerprint,
+)
+
+FEED_URL = "http://example.com/data.json"
 
 VALID_ENTRY = {
     "profileName": "Example Site",
@@ -36,8 +63,6 @@ VALID_ENTRY = {
 
 
 def _make_validated(wam_id=1, profile_name="Example Site"):
-    from app.lib.schemas import ArchiveRecordSchema  # noqa: PLC0415
-
     return ArchiveRecordSchema(
         **{**VALID_ENTRY, "wamId": wam_id, "profileName": profile_name}
     )
@@ -47,33 +72,58 @@ def _num_db_records():
     return database.db_session.query(ArchiveRecord).count()
 
 
+def _save_and_publish(*validated, dry_run=False, commit_batch_size=1000):
+    """Stage entries and publish them, keeping any existing records."""
+    rows = [_record_row(v) for v in validated]
+    result = save_entries(rows, len(rows), commit_batch_size, dry_run)
+    existing = [wam_id for (wam_id,) in database.db_session.query(ArchiveRecord.wam_id)]
+    publish_entries([*existing, *(row["wam_id"] for row in rows)], dry_run)
+    return result
+
+
+def _create_search_index():
+    """Create the FTS5 table and its triggers by running their migrations."""
+    versions = Path(__file__).parents[2] / "migrations" / "versions"
+    with database.engine.begin() as connection:
+        operations = Operations(MigrationContext.configure(connection))
+        for filename in (
+            "4db4f118b950_add_archive_link_to_fts5_search.py",
+            "e5b27a9c4f10_add_fts5_sync_triggers.py",
+        ):
+            spec = importlib.util.spec_from_file_location(filename, versions / filename)
+            migration = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(migration)
+            with Operations.context(operations.migration_context):
+                migration.upgrade()
+
+
 class ValidateEntriesTestCase(unittest.TestCase):
     def test_empty_input(self):
-        validated, errors = validate_entries([])
+        validated, errors, _ = validate_entries([])
         self.assertEqual(len(validated), 0)
         self.assertEqual(errors, 0)
 
     def test_valid_entry_is_accepted(self):
-        validated, errors = validate_entries([VALID_ENTRY])
+        validated, errors, _ = validate_entries([VALID_ENTRY])
         self.assertEqual(len(validated), 1)
         self.assertEqual(errors, 0)
 
     def test_invalid_entry_is_counted(self):
         invalid = {**VALID_ENTRY, "entryUrl": "not-a-url"}
-        validated, errors = validate_entries([invalid])
+        validated, errors, _ = validate_entries([invalid])
         self.assertEqual(len(validated), 0)
         self.assertEqual(errors, 1)
 
     def test_mixed_entries(self):
         invalid = {**VALID_ENTRY, "wamId": -1}
-        validated, errors = validate_entries([invalid, VALID_ENTRY])
+        validated, errors, _ = validate_entries([invalid, VALID_ENTRY])
         self.assertEqual(len(validated), 1)
         self.assertEqual(errors, 1)
 
     @patch("app.commands.logger")
     def test_duplicate_wam_id_is_rejected(self, mock_logger):
         duplicate = {**VALID_ENTRY, "profileName": "Duplicate Site"}
-        validated, errors = validate_entries([VALID_ENTRY, duplicate])
+        validated, errors, _ = validate_entries([VALID_ENTRY, duplicate])
         self.assertEqual(len(validated), 1)
         self.assertEqual(errors, 1)
         mock_logger.error.assert_called_once()
@@ -82,7 +132,89 @@ class ValidateEntriesTestCase(unittest.TestCase):
         self.assertEqual(args[1], VALID_ENTRY["wamId"])
 
 
-class SaveEntryTestCase(unittest.TestCase):
+class ValidateEntriesFingerprintTestCase(unittest.TestCase):
+    def test_unchanged_entry_skips_validation(self):
+        known = {1: source_fingerprint(VALID_ENTRY)}
+        with patch("app.commands.ArchiveRecordSchema") as mock_schema:
+            validated, errors, unchanged = validate_entries([VALID_ENTRY], known)
+        mock_schema.assert_not_called()
+        self.assertEqual(validated, [])
+        self.assertEqual(errors, 0)
+        self.assertEqual(unchanged, [1])
+
+    def test_changed_entry_is_validated(self):
+        known = {1: source_fingerprint(VALID_ENTRY)}
+        changed = {**VALID_ENTRY, "description": "A changed description"}
+        validated, _, unchanged = validate_entries([changed], known)
+        self.assertEqual(len(validated), 1)
+        self.assertEqual(unchanged, [])
+
+    def test_every_saved_field_changes_fingerprint(self):
+        self.assertNotIn(None, SOURCE_FINGERPRINT_KEYS)
+        changed = {**VALID_ENTRY, "ongoing": not VALID_ENTRY["ongoing"]}
+        self.assertNotEqual(
+            source_fingerprint(changed), source_fingerprint(VALID_ENTRY)
+        )
+
+    def test_unsaved_fields_do_not_change_fingerprint(self):
+        regenerated = {**VALID_ENTRY, "generatedOn": "2025-01-01", "parentId": 5}
+        self.assertEqual(
+            source_fingerprint(regenerated), source_fingerprint(VALID_ENTRY)
+        )
+
+    @patch("app.commands.logger")
+    def test_duplicate_of_unchanged_entry_is_rejected(self, mock_logger):
+        """The first entry for a wam_id wins whether or not it was validated."""
+        known = {1: source_fingerprint(VALID_ENTRY)}
+        duplicate = {**VALID_ENTRY, "profileName": "Duplicate Site"}
+        validated, errors, unchanged = validate_entries([VALID_ENTRY, duplicate], known)
+        self.assertEqual(validated, [])
+        self.assertEqual(unchanged, [1])
+        self.assertEqual(errors, 1)
+        self.assertIn("Duplicate wam_id", mock_logger.error.call_args[0][0])
+
+    def test_non_integer_wam_id_is_validated(self):
+        known = {1: source_fingerprint(VALID_ENTRY)}
+        validated, _, unchanged = validate_entries(
+            [{**VALID_ENTRY, "wamId": "1"}], known
+        )
+        self.assertEqual(len(validated), 1)
+        self.assertEqual(unchanged, [])
+
+
+class ValidateBatchesTestCase(unittest.TestCase):
+    def _batches(self):
+        invalid = {**VALID_ENTRY, "wamId": 3, "entryUrl": "not-a-url"}
+        duplicate = {**VALID_ENTRY, "wamId": 1, "profileName": "Duplicate Site"}
+        return [
+            [{**VALID_ENTRY, "wamId": wam_id} for wam_id in range(1, 3)] + [duplicate],
+            [invalid, {**VALID_ENTRY, "wamId": 4}],
+            [{**VALID_ENTRY, "wamId": wam_id} for wam_id in range(5, 9)],
+            [{**VALID_ENTRY, "wamId": 9}],
+        ]
+
+    def _summarise(self, results):
+        return [
+            (
+                batch_size,
+                validated,
+                errors,
+                unchanged,
+            )
+            for batch_size, (validated, errors, unchanged) in results
+        ]
+
+    def test_workers_match_serial_validation(self):
+        known = {6: source_fingerprint({**VALID_ENTRY, "wamId": 6})}
+        serial = self._summarise(_validate_batches(self._batches(), known))
+        parallel = self._summarise(_validate_batches(self._batches(), known, workers=2))
+        self.assertEqual(parallel, serial)
+        self.assertEqual([r[0] for r in serial], [3, 2, 4, 1])
+        self.assertEqual([r[2] for r in serial], [1, 1, 0, 0])
+        self.assertEqual(serial[2][3], [6])
+
+
+class SaveEntriesTestCase(unittest.TestCase):
     def setUp(self):
         self.app = create_app("config.Test")
         self.app_context = self.app.app_context()
@@ -94,34 +226,182 @@ class SaveEntryTestCase(unittest.TestCase):
         database.Base.metadata.drop_all(database.engine)
         self.app_context.pop()
 
+    def _save(self, *validated, dry_run=False, commit_batch_size=1000):
+        return _save_and_publish(
+            *validated, dry_run=dry_run, commit_batch_size=commit_batch_size
+        )
+
     def test_creates_new_record(self):
         validated = _make_validated()
         self.assertEqual(_num_db_records(), 0)
 
-        result = save_entry(validated, {})
+        result = self._save(validated)
         self.assertEqual(_num_db_records(), 1)
-        self.assertEqual(result, "created")
+        self.assertEqual(result["created"], 1)
+
+        record = database.db_session.query(ArchiveRecord).one()
+        self.assertEqual(record.wam_id, 1)
+        self.assertEqual(record.profile_name, "Example Site")
+        self.assertEqual(record.record_hash, validated.record_hash)
+        self.assertIsNotNone(record.created_at)
 
     def test_skips_unchanged_record(self):
-        """
-        The existing record is mocked to simulate an unchanged record (matching hash).
-        """
         validated = _make_validated()
-        existing = MagicMock(spec=ArchiveRecord)
-        existing.record_hash = validated.record_hash
-        result = save_entry(validated, {1: existing})
-        self.assertEqual(result, "skipped")
+        self._save(validated)
+        updated_at = database.db_session.query(ArchiveRecord).one().updated_at
+        database.db_session.remove()
+
+        result = self._save(_make_validated())
+        self.assertEqual(result["skipped"], 1)
+        self.assertEqual(result["updated"], 0)
+        record = database.db_session.query(ArchiveRecord).one()
+        self.assertEqual(record.updated_at, updated_at)
 
     def test_updates_changed_record(self):
-        """
-        The existing record is mocked with a different hash to simulate a record that
-        has changed since the last sync.
-        """
+        self._save(_make_validated(profile_name="Earlier Site"))
+        record_id = database.db_session.query(ArchiveRecord).one().id
+        database.db_session.remove()
+
+        changed = _make_validated(profile_name="The Enhanced Site")
+        result = self._save(changed)
+        self.assertEqual(result["updated"], 1)
+
+        record = database.db_session.query(ArchiveRecord).one()
+        self.assertEqual(record.id, record_id)
+        self.assertEqual(record.profile_name, "The Enhanced Site")
+        self.assertEqual(record.sort_name, "Enhanced Site")
+        self.assertEqual(record.record_hash, changed.record_hash)
+
+    def test_backfills_missing_fingerprint_on_unchanged_record(self):
+        """Records saved before fingerprints existed get one without an update."""
         validated = _make_validated()
-        existing = MagicMock(spec=ArchiveRecord)
-        existing.record_hash = "different_hash"
-        result = save_entry(validated, {1: existing})
-        self.assertEqual(result, "updated")
+        self._save(validated)
+        database.db_session.query(ArchiveRecord).update({"source_fingerprint": None})
+        database.db_session.commit()
+
+        result = self._save(validated)
+        self.assertEqual(result["skipped"], 1)
+        record = database.db_session.query(ArchiveRecord).one()
+        self.assertEqual(record.source_fingerprint, validated.source_fingerprint)
+
+    def test_counts_mixed_batches(self):
+        self._save(_make_validated(1), _make_validated(2, profile_name="Old Name"))
+        database.db_session.remove()
+
+        result = self._save(
+            _make_validated(1),
+            _make_validated(2, profile_name="New Name"),
+            _make_validated(3),
+            commit_batch_size=2,
+        )
+        self.assertEqual(
+            result, {"created": 1, "updated": 1, "skipped": 1, "database_errors": 0}
+        )
+        self.assertEqual(_num_db_records(), 3)
+
+    def test_dry_run_does_not_write(self):
+        result = self._save(_make_validated(), dry_run=True)
+        self.assertEqual(result["created"], 1)
+        self.assertEqual(_num_db_records(), 0)
+
+    def test_staging_a_batch_again_is_idempotent(self):
+        rows = [_record_row(_make_validated(1)), _record_row(_make_validated(2))]
+        save_entries(rows, len(rows), 1000, dry_run=False)
+        result = save_entries(rows, len(rows), 1000, dry_run=False)
+
+        self.assertEqual(result["database_errors"], 0)
+        self.assertEqual(database.db_session.query(ArchiveRecordStage).count(), 2)
+
+    def test_entries_are_staged_until_published(self):
+        self._save(_make_validated(1, profile_name="Old Name"))
+
+        rows = [_record_row(_make_validated(1, profile_name="New Name"))]
+        rows.append(_record_row(_make_validated(2)))
+        save_entries(rows, len(rows), 1000, dry_run=False)
+        self.assertEqual(database.db_session.query(ArchiveRecordStage).count(), 2)
+        record = database.db_session.query(ArchiveRecord).one()
+        self.assertEqual(record.profile_name, "Old Name")
+
+        publish_entries([1, 2], dry_run=False)
+        database.db_session.remove()
+        self.assertEqual(database.db_session.query(ArchiveRecordStage).count(), 0)
+        self.assertEqual(
+            [r.profile_name for r in database.db_session.query(ArchiveRecord)],
+            ["New Name", "Example Site"],
+        )
+
+
+class PublishEntriesTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("config.Test")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        database.Base.metadata.create_all(database.engine)
+        _save_and_publish(*(_make_validated(wam_id) for wam_id in range(1, 11)))
+
+    def tearDown(self):
+        database.db_session.remove()
+        database.Base.metadata.drop_all(database.engine)
+        self.app_context.pop()
+
+    def _wam_ids(self):
+        return sorted(
+            wam_id for (wam_id,) in database.db_session.query(ArchiveRecord.wam_id)
+        )
+
+    def test_deletes_records_not_in_source(self):
+        result = publish_entries(array("q", [2, 4, 6, 99]), dry_run=False)
+        self.assertEqual(result["deleted"], 7)
+        self.assertEqual(self._wam_ids(), [2, 4, 6])
+
+    def test_deletes_in_chunks(self):
+        result = publish_entries([1, 5, 1, 5], dry_run=False, chunk_size=3)
+        self.assertEqual(result["deleted"], 8)
+        self.assertEqual(self._wam_ids(), [1, 5])
+
+    def test_empty_source_deletes_everything(self):
+        self.assertEqual(publish_entries([], dry_run=False)["deleted"], 10)
+        self.assertEqual(_num_db_records(), 0)
+
+    def test_dry_run_counts_without_deleting(self):
+        self.assertEqual(publish_entries(range(1, 6), dry_run=True)["deleted"], 5)
+        self.assertEqual(_num_db_records(), 10)
+
+    def test_reports_changed_characters(self):
+        rows = [
+            _record_row(_make_validated(1, "Zulu")),
+            _record_row(_make_validated(3)),
+            _record_row(_make_validated(11, "Alpha")),
+        ]
+        save_entries(rows, len(rows), 1000, dry_run=False)
+
+        result = publish_entries(range(1, 12), dry_run=False)
+        # Record 1 moved from "e" to "z", record 3 is unchanged
+        self.assertEqual(result["changed_characters"], {"a", "e", "z"})
+
+        result = publish_entries(range(2, 12), dry_run=False)
+        self.assertEqual(result, {"deleted": 1, "changed_characters": {"z"}})
+
+        self.assertEqual(
+            publish_entries(range(2, 12), dry_run=False)["changed_characters"], set()
+        )
+
+    def test_failure_leaves_records_unchanged(self):
+        rows = [_record_row(_make_validated(11))]
+        save_entries(rows, len(rows), 1000, dry_run=False)
+
+        with patch(
+            "app.commands._upsert_statement", side_effect=SQLAlchemyError("Failed")
+        ):
+            self.assertEqual(publish_entries([11], dry_run=False)["deleted"], -1)
+
+        self.assertEqual(self._wam_ids(), list(range(1, 11)))
+
+    def test_can_run_repeatedly(self):
+        self.assertEqual(publish_entries(range(1, 9), dry_run=False)["deleted"], 2)
+        self.assertEqual(publish_entries(range(1, 9), dry_run=False)["deleted"], 0)
+        self.assertEqual(publish_entries(range(1, 3), dry_run=True)["deleted"], 6)
+        self.assertEqual(_num_db_records(), 8)
 
 
 class SyncArchiveDataTestCase(unittest.TestCase):
@@ -139,45 +419,540 @@ class SyncArchiveDataTestCase(unittest.TestCase):
 
     def _add_record(self, wam_id):
         validated = _make_validated(wam_id)
-        data = validated.model_dump(mode="json", by_alias=False, exclude={"wam_id"})
-        record = ArchiveRecord(wam_id=wam_id, **data)
+        record = ArchiveRecord(**_record_row(validated))
         database.db_session.add(record)
         database.db_session.commit()
 
-    @patch("app.commands.load_data")
+    def _sync(self, content, *args, headers=None, status_code=200):
+        """Run the sync command against a mocked feed, returning the mocker."""
+        if not isinstance(content, bytes):
+            content = json.dumps(content).encode()
+        with requests_mock.Mocker() as m:
+            m.get(
+                FEED_URL,
+                content=content,
+                headers=headers or {},
+                status_code=status_code,
+            )
+            self.runner.invoke(sync_archive_data, ["--url", FEED_URL, *args])
+        return m
+
     @patch("app.commands._clear_cache")
-    def test_removes_records_absent_from_source(
-        self, _mock_clear_cache, mock_load_data
-    ):
+    def test_removes_records_absent_from_source(self, _mock_clear_cache):
         """Records in the database but not in the source should be deleted."""
         self._add_record(1)
         self._add_record(2)
         self.assertEqual(_num_db_records(), 2)
 
         # Source only contains wam_id=1
-        mock_load_data.return_value = [{**VALID_ENTRY, "wamId": 1}]
-
-        self.runner.invoke(sync_archive_data, ["--url", "http://example.com/data.json"])
+        self._sync([{**VALID_ENTRY, "wamId": 1}])
 
         self.assertEqual(_num_db_records(), 1)
         remaining = database.db_session.query(ArchiveRecord).one()
         self.assertEqual(remaining.wam_id, 1)
 
-    @patch("app.commands.load_data")
     @patch("app.commands._clear_cache")
-    def test_dry_run_does_not_remove_records(self, _mock_clear_cache, mock_load_data):
+    def test_dry_run_does_not_remove_records(self, _mock_clear_cache):
         """Records absent from source should not be deleted during a dry run."""
         self._add_record(1)
         self._add_record(2)
         self.assertEqual(_num_db_records(), 2)
 
-        mock_load_data.return_value = [{**VALID_ENTRY, "wamId": 1}]
+        self._sync([{**VALID_ENTRY, "wamId": 1}], "--dry-run")
+
+        self.assertEqual(_num_db_records(), 2)
+
+    @patch("app.commands._clear_cache")
+    def test_streams_entries_from_feed(self, _mock_clear_cache):
+        """Entries are parsed from the response body and saved in validation batches."""
+        entries = [{**VALID_ENTRY, "wamId": wam_id} for wam_id in range(1, 6)]
+
+        self._sync(entries, "--validation-batch-size", "2")
+
+        self.assertEqual(_num_db_records(), 5)
+
+    @patch("app.commands._clear_cache")
+    def test_validates_with_worker_processes(self, _mock_clear_cache):
+        entries = [{**VALID_ENTRY, "wamId": wam_id} for wam_id in range(1, 8)]
+
+        self._sync(entries, "--validation-batch-size", "2", "--workers", "2")
+
+        self.assertEqual(_num_db_records(), 7)
+
+    @patch("app.commands._clear_cache")
+    def test_writes_report_json(self, _mock_clear_cache):
+        with tempfile.TemporaryDirectory() as tmp:
+            report_path = Path(tmp) / "report.json"
+            self._sync([VALID_ENTRY], "--report-json", str(report_path))
+            report = json.loads(report_path.read_text())
+
+        self.assertEqual(report["outcome"], "synced")
+        self.assertEqual(report["stats"]["created"], 1)
+        for phase in ("fetch", "parse", "validate", "write", "publish", "cache"):
+            self.assertIn(phase, report["phases"])
+        self.assertGreater(report["phases"]["fetch"]["bytes"], 0)
+        self.assertEqual(report["phases"]["validate"]["entries"], 1)
+        self.assertEqual(report["phases"]["write"]["rows"], 1)
+        self.assertEqual(len(report["phases"]["write"]["batches"]), 1)
+
+    def test_writes_report_json_when_not_modified(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            report_path = Path(tmp) / "report.json"
+            self._sync(b"", "--report-json", str(report_path), status_code=304)
+            report = json.loads(report_path.read_text())
 
-        self.runner.invoke(
-            sync_archive_data, ["--url", "http://example.com/data.json", "--dry-run"]
+        self.assertEqual(report["outcome"], "not_modified")
+
+    @patch("app.commands._clear_cache")
+    def test_truncated_feed_does_not_remove_records(self, _mock_clear_cache):
+        """A feed that fails part way through must not be used to delete records."""
+        self._add_record(1)
+        self._add_record(2)
+        entries = [{**VALID_ENTRY, "wamId": 1}, {**VALID_ENTRY, "wamId": 3}]
+        truncated = json.dumps(entries)[:-1].encode()
+
+        self._sync(truncated)
+
+        # Entries saved before the failure are not published either
+        self.assertEqual(
+            sorted(
+                wam_id for (wam_id,) in database.db_session.query(ArchiveRecord.wam_id)
+            ),
+            [1, 2],
         )
+        self.assertIsNone(get_sync_state())
+
+    @patch("app.commands._clear_cache")
+    def test_only_changed_entries_are_validated(self, _mock_clear_cache):
+        entries = [{**VALID_ENTRY, "wamId": 1}, {**VALID_ENTRY, "wamId": 2}]
+        self._sync(entries)
+
+        changed = [entries[0], {**entries[1], "description": "Changed"}]
+        with patch(
+            "app.commands.ArchiveRecordSchema", wraps=ArchiveRecordSchema
+        ) as mock_schema:
+            self._sync(changed)
+        self.assertEqual(mock_schema.call_count, 1)
 
         self.assertEqual(_num_db_records(), 2)
+        record = database.db_session.query(ArchiveRecord).filter_by(wam_id=2).one()
+        self.assertEqual(record.description, "Changed")
+
+    def _interrupted_sync(self, entries, failing_batch):
+        """Run a sync with batches of one entry that dies saving failing_batch."""
+        batches = 0
+
+        def save_entries_until_failure(*args, **kwargs):
+            nonlocal batches
+            batches += 1
+            if batches == failing_batch:
+                raise RuntimeError("Interrupted")
+            return save_entries(*args, **kwargs)
+
+        with patch("app.commands.save_entries", side_effect=save_entries_until_failure):
+            self._sync(entries, "--validation-batch-size", "1")
+
+    @patch("app.commands._clear_cache")
+    def test_resumes_after_last_checkpoint(self, _mock_clear_cache):
+        self._add_record(99)
+        entries = [{**VALID_ENTRY, "wamId": wam_id} for wam_id in (1, 2, 3)]
+        self._interrupted_sync(entries, failing_batch=3)
+
+        # Nothing is published until the sync finishes
+        self.assertEqual(_num_db_records(), 1)
+        self.assertEqual(database.db_session.query(ArchiveSyncCheckpoint).count(), 2)
+        database.db_session.remove()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            report_path = Path(tmp) / "report.json"
+            with patch(
+                "app.commands.ArchiveRecordSchema", wraps=ArchiveRecordSchema
+            ) as mock_schema:
+                self._sync(
+                    entries,
+                    "--validation-batch-size",
+                    "1",
+                    "--resume",
+                    "--report-json",
+                    str(report_path),
+                )
+            report = json.loads(report_path.read_text())
+
+        self.assertEqual(mock_schema.call_count, 1)
+        self.assertEqual(report["stats"]["total"], 3)
+        self.assertEqual(report["stats"]["created"], 3)
+        self.assertEqual(report["stats"]["deleted"], 1)
+        self.assertEqual(
+            sorted(
+                wam_id for (wam_id,) in database.db_session.query(ArchiveRecord.wam_id)
+            ),
+            [1, 2, 3],
+        )
+        self.assertEqual(database.db_session.query(ArchiveSyncCheckpoint).count(), 0)
+        self.assertEqual(database.db_session.query(ArchiveRecordStage).count(), 0)
+        self.assertIsNotNone(get_sync_state())
+
+    @patch("app.commands._clear_cache")
+    def test_resume_starts_over_for_a_different_feed(self, _mock_clear_cache):
+        entries = [{**VALID_ENTRY, "wamId": wam_id} for wam_id in (1, 2, 3)]
+        self._interrupted_sync(entries, failing_batch=3)
+        database.db_session.remove()
+
+        with patch(
+            "app.commands.ArchiveRecordSchema", wraps=ArchiveRecordSchema
+        ) as mock_schema:
+            self._sync(entries[1:], "--resume")
+
+        self.assertEqual(mock_schema.call_count, 2)
+        self.assertEqual(
+            sorted(
+                wam_id for (wam_id,) in database.db_session.query(ArchiveRecord.wam_id)
+            ),
+            [2, 3],
+        )
+
+    @patch("app.commands._clear_cache")
+    def test_sync_without_resume_discards_checkpoints(self, _mock_clear_cache):
+        entries = [{**VALID_ENTRY, "wamId": wam_id} for wam_id in (1, 2, 3)]
+        self._interrupted_sync(entries, failing_batch=2)
+        database.db_session.remove()
+
+        with patch(
+            "app.commands.ArchiveRecordSchema", wraps=ArchiveRecordSchema
+        ) as mock_schema:
+            self._sync(entries)
+
+        self.assertEqual(mock_schema.call_count, 3)
+        self.assertEqual(_num_db_records(), 3)
+        self.assertEqual(database.db_session.query(ArchiveSyncCheckpoint).count(), 0)
+
+    @patch("app.commands._clear_cache")
+    def test_force_validates_every_entry(self, _mock_clear_cache):
+        entries = [{**VALID_ENTRY, "wamId": 1}, {**VALID_ENTRY, "wamId": 2}]
+        self._sync(entries)
+
+        with patch(
+            "app.commands.ArchiveRecordSchema", wraps=ArchiveRecordSchema
+        ) as mock_schema:
+            self._sync(entries, "--force")
+        self.assertEqual(mock_schema.call_count, 2)
+        self.assertEqual(_num_db_records(), 2)
+
+    @patch("app.commands._clear_cache")
+    def test_updates_record_when_only_ongoing_changes(self, _mock_clear_cache):
+        self._sync([{**VALID_ENTRY, "ongoing": True}])
+        database.db_session.remove()
+
+        self._sync([{**VALID_ENTRY, "ongoing": False}])
+
+        self.assertFalse(database.db_session.query(ArchiveRecord).one().ongoing)
+
+    @patch("app.commands._clear_cache")
+    def test_records_sync_state(self, _mock_clear_cache):
+        """A successful sync records the feed validators and digest."""
+        self._sync(
+            [VALID_ENTRY],
+            headers={"ETag": '"v1"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"},
+        )
+
+        sync_state = get_sync_state()
+        self.assertEqual(sync_state.source_url, FEED_URL)
+        self.assertEqual(sync_state.etag, '"v1"')
+        self.assertEqual(sync_state.last_modified, "Wed, 01 Jan 2025 00:00:00 GMT")
+        self.assertEqual(len(sync_state.feed_digest), 64)
+        self.assertIsNotNone(sync_state.last_synced_at)
+
+    @patch("app.commands._clear_cache")
+    def test_sends_conditional_request_headers(self, _mock_clear_cache):
+        self._sync(
+            [VALID_ENTRY],
+            headers={"ETag": '"v1"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"},
+        )
+
+        m = self._sync(b"", status_code=304)
+
+        request_headers = m.last_request.headers
+        self.assertEqual(request_headers["If-None-Match"], '"v1"')
+        self.assertEqual(
+            request_headers["If-Modified-Since"], "Wed, 01 Jan 2025 00:00:00 GMT"
+        )
+
+    @patch("app.commands.validate_entries")
+    @patch("app.commands._clear_cache")
+    def test_not_modified_skips_sync(self, mock_clear_cache, mock_validate):
+        """A 304 response stops the sync without touching the database."""
+        self._add_record(1)
+        self._add_record(2)
+
+        self._sync(b"", status_code=304)
+
+        mock_validate.assert_not_called()
+        mock_clear_cache.assert_not_called()
+        self.assertEqual(_num_db_records(), 2)
+
+    @patch("app.commands._clear_cache")
+    def test_not_modified_records_sync_time(self, _mock_clear_cache):
+        self._sync([VALID_ENTRY], headers={"ETag": '"v1"'})
+        sync_state = get_sync_state()
+        last_synced_at = sync_state.last_synced_at
+        generation = sync_state.generation
+        database.db_session.remove()
+
+        self._sync(b"", status_code=304)
+
+        sync_state = get_sync_state()
+        self.assertGreater(sync_state.last_synced_at, last_synced_at)
+        self.assertEqual(sync_state.generation, generation)
+        self.assertEqual(sync_state.etag, '"v1"')
+
+    @patch("app.commands._clear_cache")
+    def test_sync_with_failed_batch_starts_new_generation(self, _mock_clear_cache):
+        self._sync([VALID_ENTRY], headers={"ETag": '"v1"'})
+        generation = get_sync_state().generation
+        database.db_session.remove()
+
+        batches = 0
+
+        def save_entries_failing_second_batch(*args, **kwargs):
+            nonlocal batches
+            batches += 1
+            if batches == 2:
+                return {"created": 0, "updated": 0, "skipped": 0, "database_errors": 1}
+            return save_entries(*args, **kwargs)
+
+        entries = [
+            {**VALID_ENTRY, "description": "Changed"},
+            {**VALID_ENTRY, "wamId": 2},
+        ]
+        with patch(
+            "app.commands.save_entries", side_effect=save_entries_failing_second_batch
+        ):
+            self._sync(
+                entries, "--validation-batch-size", "1", headers={"ETag": '"v2"'}
+            )
+
+        # The first batch is published, so readers must see a new generation
+        record = database.db_session.query(ArchiveRecord).one()
+        self.assertEqual(record.description, "Changed")
+        sync_state = get_sync_state()
+        self.assertEqual(sync_state.generation, generation + 1)
+        # The feed is not recorded as synced, so it is processed again next time
+        self.assertEqual(sync_state.etag, '"v1"')
+
+    @patch("app.commands._clear_cache")
+    def test_first_sync_starts_first_generation(self, _mock_clear_cache):
+        self._sync([VALID_ENTRY])
+        self.assertEqual(database.db_session.query(ArchiveSyncState).count(), 1)
+        sync_state = get_sync_state()
+        self.assertEqual(sync_state.generation, 1)
+        self.assertEqual(sync_state.source_url, FEED_URL)
+
+    @patch("app.commands._clear_cache")
+    def test_unchanged_digest_skips_sync(self, mock_clear_cache):
+        """A feed identical to the last synced one is not processed again."""
+        self._sync([VALID_ENTRY], headers={"ETag": '"v1"'})
+        mock_clear_cache.reset_mock()
+
+        # The server does not support conditional requests but the body is the same
+        with patch("app.commands.validate_entries") as mock_validate:
+            self._sync([VALID_ENTRY], headers={"ETag": '"v2"'})
+
+        mock_validate.assert_not_called()
+        mock_clear_cache.assert_not_called()
+        self.assertEqual(get_sync_state().etag, '"v2"')
+
+    @patch("app.commands._clear_cache")
+    def test_force_processes_unchanged_feed(self, mock_clear_cache):
+        self._sync([VALID_ENTRY], headers={"ETag": '"v1"'})
+        mock_clear_cache.reset_mock()
+
+        m = self._sync([VALID_ENTRY], "--force")
+
+        self.assertNotIn("If-None-Match", m.last_request.headers)
+        mock_clear_cache.assert_called_once()
+
+    @patch("app.commands._clear_cache")
+    def test_gzip_content_encoding(self, _mock_clear_cache):
+        entries = [{**VALID_ENTRY, "wamId": 1}, {**VALID_ENTRY, "wamId": 2}]
+        m = self._sync(
+            gzip.compress(json.dumps(entries).encode()),
+            headers={"Content-Encoding": "gzip"},
+        )
+
+        self.assertIn("gzip", m.last_request.headers["Accept-Encoding"])
+        self.assertEqual(_num_db_records(), 2)
+
+    @patch("app.commands._clear_cache")
+    def test_gzip_file_extension(self, _mock_clear_cache):
+        content = gzip.compress(json.dumps([VALID_ENTRY]).encode())
+        with requests_mock.Mocker() as m:
+            m.get("http://example.com/data.json.gz", content=content)
+            self.runner.invoke(
+                sync_archive_data, ["--url", "http://example.com/data.json.gz"]
+            )
+
+        self.assertEqual(_num_db_records(), 1)
+
+    @patch("app.commands._clear_cache")
+    def test_local_file(self, _mock_clear_cache):
+        entries = [{**VALID_ENTRY, "wamId": 1}, {**VALID_ENTRY, "wamId": 2}]
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, content in (
+                ("data.json", json.dumps(entries).encode()),
+                ("data.json.gz", gzip.compress(json.dumps(entries[:1]).encode())),
+            ):
+                path = Path(tmp) / name
+                path.write_bytes(content)
+                for url in (str(path), path.as_uri()):
+                    with self.subTest(url=url):
+                        result = self.runner.invoke(sync_archive_data, ["--url", url])
+                        self.assertEqual(result.exit_code, 0, result.output)
+                        self.assertEqual(get_sync_state().source_url, url)
+                        self.assertEqual(
+                            _num_db_records(), 2 if name == "data.json" else 1
+                        )
+
+    @patch("app.commands._clear_cache")
+    def test_stdin(self, _mock_clear_cache):
+        entries = [{**VALID_ENTRY, "wamId": 1}, {**VALID_ENTRY, "wamId": 2}]
+        for content in (
+            json.dumps(entries).encode(),
+            gzip.compress(json.dumps(entries).encode()),
+        ):
+            with self.subTest(compressed=content[:2] == b"\x1f\x8b"):
+                self.runner.invoke(
+                    sync_archive_data, ["--url", "-", "--force"], input=content
+                )
+                self.assertEqual(_num_db_records(), 2)
+
+    @patch("app.commands._clear_cache")
+    def test_missing_local_file_fails(self, mock_clear_cache):
+        self._add_record(1)
+
+        result = self.runner.invoke(
+            sync_archive_data, ["--url", "/nonexistent/data.json"]
+        )
+
+        self.assertIn("Failed to load data", result.output)
+        mock_clear_cache.assert_not_called()
+        self.assertEqual(_num_db_records(), 1)
+
+    @patch("app.commands._clear_cache")
+    def test_corrupt_gzip_feed_deletes_nothing(self, mock_clear_cache):
+        self._add_record(1)
+        self._add_record(2)
+
+        content = gzip.compress(json.dumps([{**VALID_ENTRY, "wamId": 1}]).encode())
+        result = self.runner.invoke(
+            sync_archive_data, ["--url", "-"], input=content[:-10]
+        )
+
+        self.assertIn("Failed to decompress gzip feed", result.output)
+        mock_clear_cache.assert_not_called()
+        self.assertEqual(_num_db_records(), 2)
+
+
+class SearchIndexTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("config.Test")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        database.Base.metadata.create_all(database.engine)
+        _create_search_index()
+        cache.clear()
+        self.runner = CliRunner()
+
+    def tearDown(self):
+        database.db_session.remove()
+        with database.engine.begin() as connection:
+            connection.execute(text("DROP TABLE IF EXISTS archive_records_fts"))
+        database.Base.metadata.drop_all(database.engine)
+        self.app_context.pop()
+
+    def _save(self, *validated):
+        _save_and_publish(*validated)
+
+    def _search(self, query):
+        database.db_session.remove()
+        # Saving and publishing outside a sync leaves cached searches in place
+        archive_service.invalidate_search()
+        return sorted(
+            item["wam_id"] for item in archive_service.search_records(query)["items"]
+        )
+
+    def _fts_integrity_check(self):
+        database.db_session.execute(
+            text(
+                "INSERT INTO archive_records_fts(archive_records_fts, rank) "
+                "VALUES('integrity-check', 1)"
+            )
+        )
+
+    def test_index_follows_inserts_updates_and_deletes(self):
+        self._save(_make_validated(1, "Alpha"), _make_validated(2, "Bravo"))
+        self.assertEqual(self._search("alpha"), [1])
+
+        self._save(_make_validated(1, "Charlie"))
+        self.assertEqual(self._search("alpha"), [])
+        self.assertEqual(self._search("charlie"), [1])
+
+        publish_entries([1], dry_run=False)
+        self.assertEqual(self._search("bravo"), [])
+        self.assertEqual(self._search("charlie"), [1])
+        self._fts_integrity_check()
+
+    def test_search_is_paged_and_count_is_capped(self):
+        self._save(*(_make_validated(wam_id, "Alpha") for wam_id in range(1, 6)))
+        self.app.config["ARCHIVE_SEARCH_MAX_RESULTS"] = 4
+
+        first = archive_service.search_records("alpha", limit=3)
+        second = archive_service.search_records("alpha", limit=3, offset=3)
+        past_window = archive_service.search_records("alpha", limit=3, offset=4)
+
+        # Equally ranked matches are ordered by sort_name, then id
+        self.assertEqual([item["wam_id"] for item in first["items"]], [1, 2, 3])
+        self.assertEqual([item["wam_id"] for item in second["items"]], [4])
+        self.assertEqual(second["meta"]["limit"], 1)
+        self.assertEqual(past_window["items"], [])
+        self.assertEqual(first["meta"]["total_count"], 4)
+        self.assertTrue(first["meta"]["total_count_capped"])
+
+        self.app.config["ARCHIVE_SEARCH_MAX_RESULTS"] = 5
+        result = archive_service.search_records("alpha")
+        self.assertEqual(result["meta"]["total_count"], 5)
+        self.assertFalse(result["meta"]["total_count_capped"])
+
+    @patch("app.commands._clear_cache")
+    @patch("app.commands._rebuild_fts_index")
+    def test_sync_does_not_rebuild_index(self, mock_rebuild, _mock_clear_cache):
+        with requests_mock.Mocker() as m:
+            m.get(FEED_URL, json=[{**VALID_ENTRY, "profileName": "Delta"}])
+            self.runner.invoke(sync_archive_data, ["--url", FEED_URL])
+
+        mock_rebuild.assert_not_called()
+        self.assertEqual(self._search("delta"), [1])
+        self._fts_integrity_check()
+
+    @patch("app.commands._clear_cache")
+    def test_rebuild_fts_option(self, _mock_clear_cache):
+        self._save(_make_validated(1, "Echo"))
+        database.db_session.execute(
+            text(
+                "INSERT INTO archive_records_fts(archive_records_fts) "
+                "VALUES('delete-all')"
+            )
+        )
+        database.db_session.commit()
+        self.assertEqual(self._search("echo"), [])
+
+        with requests_mock.Mocker() as m:
+            m.get(FEED_URL, status_code=304)
+            result = self.runner.invoke(
+                sync_archive_data, ["--url", FEED_URL, "--rebuild-fts"]
+            )
+
+        self.assertIn("Search index rebuilt", result.output)
+        self.assertEqual(self._search("echo"), [1])
 
 
 class ClearCacheTestCase(unittest.TestCase):
@@ -189,12 +964,43 @@ class ClearCacheTestCase(unittest.TestCase):
     def tearDown(self):
         self.app_context.pop()
 
+    @patch("app.commands.prerender_listing", return_value=1)
+    @patch("app.commands.cache_records_page")
+    @patch("app.commands.list_available_characters", return_value=["a", "b"])
     @patch("app.commands.cache")
-    @patch("app.commands.get_records_by_character")
-    def test_clears_cache_on_live_run(self, mock_get_records, mock_cache):
+    @patch("app.commands.invalidate_search")
+    @patch("app.commands.invalidate_listings")
+    def test_clears_cache_on_live_run(
+        self,
+        mock_invalidate_listings,
+        mock_invalidate_search,
+        mock_cache,
+        mock_characters,
+        _mock_records,
+        mock_prerender,
+    ):
         _clear_cache(dry_run=False)
         mock_cache.delete.assert_called_once_with("archive:characters")
-        mock_cache.delete_memoized.assert_called_once_with(mock_get_records)
+        mock_invalidate_listings.assert_called_once_with(None)
+        mock_invalidate_search.assert_called_once_with()
+        # Read from the primary database, not a read replica
+        mock_characters.assert_called_once_with(database.db_session)
+        mock_cache.set.assert_called_once_with("archive:characters", ["a", "b"])
+        self.assertEqual(
+            [call.args for call in mock_prerender.call_args_list],
+            [("a", database.db_session), ("b", database.db_session)],
+        )
+
+    @patch("app.commands.prerender_listing", return_value=1)
+    @patch("app.commands.cache_records_page")
+    @patch("app.commands.list_available_characters", return_value=["a", "b"])
+    @patch("app.commands.invalidate_search")
+    def test_clears_searches_when_characters_changed(
+        self, mock_invalidate_search, _mock_characters, _mock_records, mock_prerender
+    ):
+        _clear_cache(dry_run=False, characters={"a"})
+        mock_invalidate_search.assert_called_once_with()
+        mock_prerender.assert_called_once_with("a", database.db_session)
 
     @patch("app.commands.cache")
     def test_skips_cache_clear_on_dry_run(self, mock_cache):
@@ -217,7 +1023,7 @@ class CacheInvalidationTestCase(unittest.TestCase):
         self.app_context.pop()
 
     def _save(self, validated):
-        save_entries([validated], 1, 1000, dry_run=False)
+        _save_and_publish(validated)
 
     def test_cache_is_stale_without_invalidation(self):
         """Without clearing the cache, updated data is not reflected."""
@@ -252,3 +1058,87 @@ class CacheInvalidationTestCase(unittest.TestCase):
         # Cache now returns new result
         result_after = archive_service.get_records_by_character("e")
         self.assertEqual(result_after["items"][0]["profile_name"], "Enhanced Site")
+
+    def test_refreshes_only_changed_characters(self):
+        self._save(_make_validated(1, profile_name="Alpha"))
+        self._save(_make_validated(2, profile_name="Bravo"))
+        archive_service.get_records_by_character("a")
+        archive_service.get_records_by_character("b")
+
+        # Change both records, but only report "a" as changed
+        self._save(_make_validated(1, profile_name="Alpine"))
+        self._save(_make_validated(2, profile_name="Brave"))
+        _clear_cache(dry_run=False, characters={"a"})
+
+        # "a" is cached again without a request having to query the database
+        with patch.object(archive_service.database, "read_session") as mock_session:
+            result = archive_service.get_records_by_character(character="a")
+            self.assertEqual(result["items"][0]["profile_name"], "Alpine")
+            result = archive_service.get_records_by_character("b")
+            self.assertEqual(result["items"][0]["profile_name"], "Bravo")
+            mock_session.execute.assert_not_called()
+
+    def _listing_html(self, character, cursor=None):
+        page = archive_service.get_records_page(
+            character, cursor, self.app.config["ARCHIVE_PAGE_SIZE"]
+        )
+        return archive_service.get_listing_html(page["items"]), page["meta"]
+
+    def test_renders_first_pages_of_changed_characters(self):
+        self._save(_make_validated(1, profile_name="Alpha"))
+        self._save(_make_validated(2, profile_name="Alpine"))
+        self._save(_make_validated(3, profile_name="Amber"))
+        self._save(_make_validated(4, profile_name="Bravo"))
+        self.app.config["ARCHIVE_PAGE_SIZE"] = 1
+        self.app.config["ARCHIVE_PRERENDER_PAGES"] = 2
+        _clear_cache(dry_run=False, characters={"a"})
+
+        first, meta = self._listing_html("a")
+        self.assertIn("Alpha", first)
+        self.assertNotIn("Alpine", first)
+        second, meta = self._listing_html("a", meta["next_cursor"])
+        self.assertIn("Alpine", second)
+        third, _ = self._listing_html("a", meta["next_cursor"])
+        self.assertIsNone(third)
+        self.assertIsNone(self._listing_html("b")[0])
+
+        # Pages whose records have changed since are not rendered
+        self._save(_make_validated(1, profile_name="Alpaca"))
+        self.assertIsNone(self._listing_html("a")[0])
+
+    def test_refreshes_from_primary_when_read_replica_lags(self):
+        self._save(_make_validated(1, profile_name="Alpha"))
+        # A read replica that has not yet seen the sync below
+        replica_engine = create_engine("sqlite://")
+        database.Base.metadata.create_all(replica_engine)
+        replica = scoped_session(sessionmaker(bind=replica_engine))
+        replica.add(ArchiveRecord(**_record_row(_make_validated(1, "Alpha"))))
+        replica.commit()
+
+        self._save(_make_validated(1, profile_name="Alpine"))
+        self._save(_make_validated(2, profile_name="Bravo"))
+        with patch.object(database, "read_session", replica):
+            _clear_cache(dry_run=False, characters={"a", "b"})
+
+            self.assertEqual(archive_service.get_available_characters(), ["a", "b"])
+            result = archive_service.get_records_by_character("a")
+            self.assertEqual(result["items"][0]["profile_name"], "Alpine")
+        self.assertIn("Alpine", self._listing_html("a")[0])
+        self.assertIn("Bravo", self._listing_html("b")[0])
+        replica.remove()
+        replica_engine.dispose()
+
+    def test_refreshes_available_characters(self):
+        self._save(_make_validated(1, profile_name="Alpha"))
+        self.assertEqual(archive_service.get_available_characters(), ["a"])
+
+        self._save(_make_validated(2, profile_name="Bravo"))
+        _clear_cache(dry_run=False, characters={"b"})
+
+        self.assertEqual(archive_service.get_available_characters(), ["a", "b"])
+
+    @patch("app.commands.cache")
+    def test_keeps_caches_when_nothing_changed(self, mock_cache):
+        _clear_cache(dry_run=False, characters=set())
+        mock_cache.delete.assert_not_called()
+        mock_cache.delete_memoized.assert_not_called()
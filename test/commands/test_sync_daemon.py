@@ -0,0 +1,157 @@
+import json
+import unittest
+from unittest.mock import patch
+
+import requests_mock
+from click.testing import CliRunner
+from sqlalchemy.exc import OperationalError
+
+from app import create_app
+from app.commands import archive_sync_daemon, get_sync_state
+from app.lib import database
+from app.lib.models import ArchiveRecord
+from app.lib.sync_lock import SyncLock
+
+FEED_URL = "http://example.com/data.json"
+
+ENTRY = {
+    "profileName": "Example Site",
+    "entryUrl": "https://example.com",
+    "archiveLink": "https://webarchive.nationalarchives.gov.uk/example",
+    "domainType": "Central government",
+    "firstCapture": "2010-01-01",
+    "firstCaptureDisplay": "2010",
+    "latestCapture": "2024-01-01",
+    "latestCaptureDisplay": "2024",
+    "ongoing": True,
+    "wamId": 1,
+    "wamLink": "https://webarchive.nationalarchives.gov.uk/1",
+    "parentId": None,
+    "generatedOn": "2024-01-01",
+    "currentDepartments": [],
+    "previousDepartments": [],
+    "description": "An example archived site",
+}
+
+
+class ArchiveSyncDaemonTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("config.Test")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        database.Base.metadata.create_all(database.engine)
+        self.runner = CliRunner()
+
+    def tearDown(self):
+        database.db_session.remove()
+        database.Base.metadata.drop_all(database.engine)
+        self.app_context.pop()
+
+    def _run_once(self, entries, *sync_args):
+        with requests_mock.Mocker() as m:
+            m.get(FEED_URL, content=json.dumps(entries).encode())
+            result = self.runner.invoke(
+                archive_sync_daemon, ["--once", "--", "--url", FEED_URL, *sync_args]
+            )
+        self.assertEqual(result.exit_code, 0, result.output)
+        return m
+
+    @patch("app.commands._clear_cache")
+    def test_syncs_and_starts_a_new_generation(self, mock_clear_cache):
+        self._run_once([ENTRY])
+
+        self.assertEqual(database.db_session.query(ArchiveRecord).count(), 1)
+        self.assertEqual(get_sync_state().generation, 1)
+        mock_clear_cache.assert_called_once_with(False, {"e"})
+
+    @patch("app.commands._clear_cache")
+    def test_unchanged_sync_keeps_the_generation(self, _mock_clear_cache):
+        self._run_once([ENTRY])
+        with patch("app.lib.sync_lock.SyncLock.ran_within", return_value=False):
+            m = self._run_once([ENTRY], "--force")
+
+        self.assertTrue(m.called)
+        self.assertEqual(get_sync_state().generation, 1)
+
+    @patch("app.commands._clear_cache")
+    def test_skips_while_another_node_holds_the_lock(self, mock_clear_cache):
+        other_node = SyncLock(60, holder="other")
+        self.assertTrue(other_node.acquire())
+        try:
+            m = self._run_once([ENTRY])
+        finally:
+            other_node.release()
+
+        self.assertFalse(m.called)
+        mock_clear_cache.assert_not_called()
+
+    @patch("app.commands._clear_cache")
+    def test_skips_when_another_node_synced_recently(self, _mock_clear_cache):
+        other_node = SyncLock(60, holder="other")
+        other_node.acquire()
+        other_node.release(record_run=True)
+
+        m = self._run_once([ENTRY])
+
+        self.assertFalse(m.called)
+        self.assertIsNone(get_sync_state())
+
+    @patch("app.commands._cache_is_shared", return_value=False)
+    @patch("app.commands._clear_cache")
+    def test_clears_local_caches_after_another_node_syncs(
+        self, mock_clear_cache, _mock_cache_is_shared
+    ):
+        with patch("app.commands.get_sync_state") as mock_get_sync_state:
+            mock_get_sync_state.side_effect = [
+                type("SyncState", (), {"generation": 1})(),
+                type("SyncState", (), {"generation": 2})(),
+            ]
+            with patch("app.lib.sync_lock.SyncLock.acquire", return_value=False):
+                self._run_once([ENTRY])
+
+        mock_clear_cache.assert_called_once_with(False)
+
+    @patch("app.commands._cache_is_shared", return_value=True)
+    @patch("app.commands._clear_cache")
+    def test_shared_caches_are_left_to_the_syncing_node(
+        self, mock_clear_cache, _mock_cache_is_shared
+    ):
+        with patch("app.commands.get_sync_state") as mock_get_sync_state:
+            mock_get_sync_state.side_effect = [
+                type("SyncState", (), {"generation": 1})(),
+                type("SyncState", (), {"generation": 2})(),
+            ]
+            with patch("app.lib.sync_lock.SyncLock.acquire", return_value=False):
+                self._run_once([ENTRY])
+
+        mock_clear_cache.assert_not_called()
+
+    @patch("app.commands.logger")
+    @patch("app.commands._run_sync", side_effect=Exception("boom"))
+    def test_failed_sync_releases_the_lock(self, _mock_run_sync, mock_logger):
+        result = self.runner.invoke(archive_sync_daemon, ["--once"])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        mock_logger.exception.assert_called_once()
+        other_node = SyncLock(60, holder="other")
+        self.assertTrue(other_node.acquire())
+        other_node.release()
+        self.assertFalse(other_node.ran_within(60))
+
+    @patch("app.commands.logger")
+    @patch("app.commands._run_sync")
+    def test_database_errors_do_not_stop_the_daemon(self, mock_run_sync, mock_logger):
+        error = OperationalError("UPDATE archive_sync_locks", {}, Exception("gone"))
+        with (
+            patch("app.lib.sync_lock.SyncLock.acquire", side_effect=[error, True]),
+            patch("app.commands.threading.Event.wait", side_effect=[False, True]),
+        ):
+            result = self.runner.invoke(archive_sync_daemon, [])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        mock_logger.exception.assert_called_once()
+        mock_run_sync.assert_called_once()
+
+    def test_invalid_sync_options_fail_immediately(self):
+        result = self.runner.invoke(archive_sync_daemon, ["--", "--workers", "0"])
+        self.assertNotEqual(result.exit_code, 0)
@@ -0,0 +1,431 @@
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+from app import create_app
+from app.commands import _record_row
+from app.lib import database
+from app.lib.archive_service import (
+    LISTING_COLUMNS,
+    InvalidCursorError,
+    _fts_to_tsquery,
+    character_listing_query,
+    encode_cursor,
+    get_available_characters,
+    get_record_count,
+    get_records_by_character,
+    get_records_page,
+    invalidate_listings,
+    invalidate_search,
+    search_records,
+)
+from app.lib.cache import cache
+from app.lib.models import ArchiveRecord, ArchiveSyncState
+from app.lib.schemas import ArchiveRecordSchema
+
+
+def _add_record(wam_id, profile_name):
+    validated = ArchiveRecordSchema(
+        profileName=profile_name,
+        entryUrl=f"https://example{wam_id}.gov.uk/",
+        archiveLink=f"https://webarchive.example.com/{wam_id}",
+        domainType="Central government",
+        firstCaptureDisplay="2010",
+        latestCaptureDisplay="2024",
+        ongoing=True,
+        wamId=wam_id,
+        description="",
+    )
+    database.db_session.add(ArchiveRecord(**_record_row(validated)))
+    database.db_session.commit()
+
+
+class FtsToTsqueryTestCase(unittest.TestCase):
+    def test_terms_are_anded(self):
+        self.assertEqual(_fts_to_tsquery("government digital"), "government & digital")
+
+    def test_prefix_wildcard(self):
+        self.assertEqual(_fts_to_tsquery("digit*"), "digit:*")
+
+    def test_phrase(self):
+        self.assertEqual(
+            _fts_to_tsquery('"government digital" service'),
+            "(government <-> digital) & service",
+        )
+
+    def test_boolean_operators_and_grouping(self):
+        self.assertEqual(
+            _fts_to_tsquery("(health OR digital) NOT service"),
+            "(health | digital) & ! service",
+        )
+        self.assertEqual(_fts_to_tsquery("health AND digital"), "health & digital")
+
+    def test_lower_case_operators_are_terms(self):
+        self.assertEqual(_fts_to_tsquery("health and safety"), "health & and & safety")
+
+    def test_dangling_operators_dropped(self):
+        self.assertEqual(_fts_to_tsquery("health AND OR digital"), "health & digital")
+        self.assertEqual(_fts_to_tsquery("(health NOT) digital"), "(health) & digital")
+        self.assertEqual(_fts_to_tsquery("OR"), "")
+
+    def test_empty_groups_and_phrases_dropped(self):
+        self.assertEqual(_fts_to_tsquery('health () "" digital'), "health & digital")
+
+    def test_unmatched_parentheses_dropped(self):
+        self.assertEqual(_fts_to_tsquery(")health("), "health")
+        self.assertEqual(_fts_to_tsquery("(health (digital)"), "(health & (digital))")
+
+
+class CharacterListingTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("config.Test")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        database.Base.metadata.create_all(database.engine)
+
+    def tearDown(self):
+        database.db_session.remove()
+        database.Base.metadata.drop_all(database.engine)
+        self.app_context.pop()
+
+    def test_records_in_sort_name_order(self):
+        _add_record(1, "Digital Service")
+        _add_record(2, "The Data Office")
+        _add_record(3, "Archive Board")
+        _add_record(4, "Department for Things")
+
+        result = get_records_page("d")
+
+        self.assertEqual(result["meta"]["total_count"], 3)
+        self.assertEqual([item["wam_id"] for item in result["items"]], [2, 4, 1])
+        self.assertEqual(
+            set(result["items"][0]), {column.key for column in LISTING_COLUMNS}
+        )
+        self.assertIsNone(result["meta"]["next_cursor"])
+        self.assertIsNone(result["meta"]["previous_cursor"])
+
+    def test_pages_follow_cursors_both_ways(self):
+        # Records with the same sort_name are ordered by id
+        for wam_id in range(1, 6):
+            _add_record(wam_id, "Digital Service")
+        _add_record(6, "Data Office")
+
+        first = get_records_page("d", limit=2)
+        second = get_records_page("d", first["meta"]["next_cursor"], limit=2)
+        third = get_records_page("d", second["meta"]["next_cursor"], limit=2)
+
+        self.assertEqual([item["wam_id"] for item in first["items"]], [6, 1])
+        self.assertEqual([item["wam_id"] for item in second["items"]], [2, 3])
+        self.assertEqual([item["wam_id"] for item in third["items"]], [4, 5])
+        self.assertIsNone(first["meta"]["previous_cursor"])
+        self.assertIsNone(third["meta"]["next_cursor"])
+        self.assertEqual(third["meta"]["total_count"], 6)
+
+        back = get_records_page("d", third["meta"]["previous_cursor"], limit=2)
+        self.assertEqual(back["items"], second["items"])
+        back = get_records_page("d", back["meta"]["previous_cursor"], limit=2)
+        self.assertEqual(back["items"], first["items"])
+        self.assertIsNone(back["meta"]["previous_cursor"])
+        self.assertIsNotNone(back["meta"]["next_cursor"])
+
+    def test_limit_is_capped(self):
+        for wam_id in range(1, 4):
+            _add_record(wam_id, f"Digital Service {wam_id}")
+        self.app.config["ARCHIVE_LIMIT_MAX"] = 2
+
+        result = get_records_by_character("d", limit=100)
+
+        self.assertEqual(len(result["items"]), 2)
+        self.assertEqual(result["meta"]["limit"], 2)
+
+    def test_invalid_cursor(self):
+        for cursor in (
+            "not a cursor",
+            encode_cursor("sideways", {"sort_name": "a", "id": 1}),
+        ):
+            with self.subTest(cursor=cursor), self.assertRaises(InvalidCursorError):
+                get_records_by_character("d", cursor)
+
+    def test_query_plan_uses_composite_index_without_sorting(self):
+        for direction, position in (
+            ("after", None),
+            ("after", ("digital service", 1)),
+            ("before", ("digital service", 1)),
+        ):
+            statement = character_listing_query("d", direction, position).compile(
+                database.engine, compile_kwargs={"literal_binds": True}
+            )
+            with database.engine.connect() as connection:
+                plan = " ".join(
+                    row[-1]
+                    for row in connection.exec_driver_sql(
+                        f"EXPLAIN QUERY PLAN {statement}"
+                    )
+                )
+            with self.subTest(direction=direction, position=position):
+                self.assertIn("ix_archive_records_first_character_sort_name_id", plan)
+                self.assertNotIn("TEMP B-TREE", plan)
+
+
+class SnapshotTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("config.Test")
+        self.app.config["ARCHIVE_SNAPSHOT"] = True
+        self.app.config["ARCHIVE_SNAPSHOT_CHECK_INTERVAL"] = 0
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        database.Base.metadata.create_all(database.engine)
+
+    def tearDown(self):
+        database.db_session.remove()
+        database.read_session.remove()
+        database.Base.metadata.drop_all(database.engine)
+        self.app_context.pop()
+
+    def _publish_generation(self, generation):
+        database.db_session.merge(
+            ArchiveSyncState(
+                id=1, source_url="https://example.com/feed.json", generation=generation
+            )
+        )
+        database.db_session.commit()
+
+    def _wait_for_snapshot(self):
+        refresh_thread = self.app.extensions["archive_snapshot"]._refresh_thread
+        if refresh_thread is not None:
+            refresh_thread.join()
+
+    def test_pages_match_the_database(self):
+        for wam_id in range(1, 6):
+            _add_record(wam_id, "Digital Service")
+        _add_record(6, "Data Office")
+        _add_record(7, "Archive Board")
+
+        self.assertEqual(get_available_characters(), ["a", "d"])
+        self.assertEqual(get_record_count(), 7)
+        cursor = None
+        while True:
+            page = get_records_by_character("d", cursor, limit=2)
+            self.assertEqual(page, get_records_page("d", cursor, limit=2))
+            if not page["meta"]["next_cursor"]:
+                break
+            cursor = page["meta"]["next_cursor"]
+        previous = get_records_by_character("d", page["meta"]["previous_cursor"], 2)
+        self.assertEqual(
+            previous, get_records_page("d", page["meta"]["previous_cursor"], 2)
+        )
+
+    def test_pages_match_the_database_whatever_the_case_or_punctuation(self):
+        # Orders that differ between code point order and most locales
+        for wam_id, name in enumerate(
+            ["bravo", "Bravo", "b-side", "B Side", "b_side", "Bé", "Be", "be"], 1
+        ):
+            _add_record(wam_id, name)
+
+        cursor = None
+        seen = []
+        while True:
+            page = get_records_by_character("b", cursor, limit=3)
+            self.assertEqual(page, get_records_page("b", cursor, limit=3))
+            seen.extend(record["id"] for record in page["items"])
+            if not page["meta"]["next_cursor"]:
+                break
+            cursor = page["meta"]["next_cursor"]
+        self.assertEqual(sorted(seen), list(range(1, 9)))
+
+    def test_sort_name_is_compared_by_code_point_on_postgresql(self):
+        ddl = str(
+            CreateTable(ArchiveRecord.__table__).compile(dialect=postgresql.dialect())
+        )
+        self.assertIn('sort_name TEXT COLLATE "C" NOT NULL', ddl)
+
+    def test_reads_do_not_query_the_database(self):
+        _add_record(1, "Digital Service")
+        get_available_characters()
+        self.app.extensions["archive_snapshot"].check_interval = 60
+        with patch.object(database, "read_session") as mock_session:
+            get_available_characters()
+            get_records_by_character("d")
+            get_record_count()
+            mock_session.execute.assert_not_called()
+            mock_session.scalar.assert_not_called()
+
+    def test_snapshot_is_loaded_again_for_new_generation(self):
+        self._publish_generation(1)
+        _add_record(1, "Digital Service")
+        self.assertEqual(get_available_characters(), ["d"])
+
+        # Records published without a new generation are not seen
+        _add_record(2, "Archive Board")
+        self.assertEqual(get_available_characters(), ["d"])
+        self._wait_for_snapshot()
+
+        self._publish_generation(2)
+        # The previous snapshot is served while the new one is made
+        self.assertEqual(get_available_characters(), ["d"])
+        self._wait_for_snapshot()
+        self.assertEqual(get_available_characters(), ["a", "d"])
+        self.assertEqual(get_records_by_character("a")["items"][0]["wam_id"], 2)
+
+
+class ListingCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("config.Test")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        cache.clear()
+        patcher = patch(
+            "app.lib.archive_service.get_records_page",
+            side_effect=lambda character, cursor, limit: {"character": character},
+        )
+        self.get_records_page = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.app_context.pop()
+
+    def test_pages_are_cached(self):
+        get_records_by_character("a")
+        get_records_by_character("a")
+        get_records_by_character("a", limit=5)
+        self.assertEqual(self.get_records_page.call_count, 2)
+
+    def test_pages_expire_before_listing_versions(self):
+        get_records_by_character("a")
+        version = cache.get("archive:listing-version:a")
+        with patch("cachelib.simple.time", return_value=time.time() + 60):
+            get_records_by_character("a")
+            self.assertEqual(cache.get("archive:listing-version:a"), version)
+        self.assertEqual(self.get_records_page.call_count, 2)
+
+    def test_invalidating_characters_keeps_other_listings(self):
+        get_records_by_character("a")
+        get_records_by_character("b")
+        invalidate_listings({"a"})
+        get_records_by_character("a")
+        get_records_by_character("b")
+        self.assertEqual(
+            [c.args[0] for c in self.get_records_page.call_args_list], ["a", "b", "a"]
+        )
+
+    def test_invalidating_all_listings(self):
+        get_records_by_character("a")
+        invalidate_listings()
+        get_records_by_character("a")
+        self.assertEqual(self.get_records_page.call_count, 2)
+
+
+class SearchCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("config.Test")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        cache.clear()
+        self.session = MagicMock()
+        self.session.scalar.return_value = 1
+        patcher = patch("app.lib.database.db_session", self.session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch(
+            "app.lib.archive_service.search_page",
+            side_effect=lambda query, limit, offset: {"query": query},
+        )
+        self.search_page = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.app_context.pop()
+
+    def test_equivalent_queries_share_cached_pages(self):
+        search_records("government digital")
+        search_records("government @digital!")
+        search_records("  government digital ")
+        self.assertEqual(self.search_page.call_count, 1)
+        search_records("government digital", offset=100)
+        self.assertEqual(self.search_page.call_count, 2)
+
+    def test_generation_is_only_looked_up_once(self):
+        search_records("health")
+        search_records("digital")
+        self.assertEqual(self.session.scalar.call_count, 1)
+
+    def test_invalidating_searches_uses_new_generation(self):
+        search_records("health")
+        self.session.scalar.return_value = 2
+        search_records("health")
+        invalidate_search()
+        search_records("health")
+        search_records("health")
+        self.assertEqual(self.search_page.call_count, 2)
+        self.assertEqual(self.session.scalar.call_count, 2)
+
+    def test_generation_is_read_from_the_primary_database(self):
+        with patch("app.lib.database.read_session") as read_session:
+            search_records("health")
+        read_session.scalar.assert_not_called()
+        self.session.scalar.assert_called_once()
+
+    def test_generation_expires(self):
+        search_records("health")
+        self.session.scalar.return_value = 2
+        with patch("cachelib.simple.time", return_value=time.time() + 60):
+            search_records("health")
+        self.assertEqual(self.session.scalar.call_count, 2)
+        self.assertEqual(self.search_page.call_count, 2)
+
+    def test_empty_query_is_not_cached(self):
+        search_records("@#!")
+        self.session.scalar.assert_not_called()
+        self.search_page.assert_called_once_with("", 100, 0)
+
+
+class SearchRecordsPostgresqlTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("config.Test")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        cache.clear()
+        self.session = MagicMock()
+        self.session.get_bind.return_value.dialect.name = "postgresql"
+        self.session.execute.return_value.scalar.return_value = 1
+        self.session.execute.return_value.mappings.return_value = []
+        patcher = patch("app.lib.database.read_session", self.session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # The data generation is read from the primary database
+        patcher = patch("app.lib.database.db_session")
+        patcher.start().scalar.return_value = 0
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.app_context.pop()
+
+    def test_searches_search_vector_with_tsquery(self):
+        search_records("(health OR digit*) service")
+        (count_sql, count_params), (sql, params) = (
+            call.args for call in self.session.execute.call_args_list
+        )
+        self.assertIn("search_vector @@ to_tsquery('simple', :query)", str(count_sql))
+        self.assertIn("ar.search_vector @@ query", str(sql))
+        self.assertIn("to_tsquery('simple', :query)", str(sql))
+        self.assertNotIn("archive_records_fts", str(count_sql) + str(sql))
+        self.assertEqual(
+            count_params, {"query": "(health | digit:*) & service", "max_results": 1001}
+        )
+        self.assertEqual(
+            params, {"query": "(health | digit:*) & service", "limit": 100, "offset": 0}
+        )
+
+    def test_page_is_not_fetched_without_matches(self):
+        self.session.execute.return_value.scalar.return_value = 0
+        result = search_records("health")
+        self.assertEqual(self.session.execute.call_count, 1)
+        self.assertEqual(result["items"], [])
+
+    def test_query_without_terms_is_not_run(self):
+        result = search_records("NOT ()")
+        self.session.execute.assert_not_called()
+        self.assertEqual(result["meta"]["total_count"], 0)
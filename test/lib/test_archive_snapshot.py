@@ -0,0 +1,141 @@
+import threading
+import unittest
+from collections import namedtuple
+from unittest.mock import MagicMock, patch
+
+from app.lib.archive_snapshot import ArchiveSnapshot, SnapshotHolder
+
+Record = namedtuple("Record", ["id", "sort_name", "first_character"])
+
+RECORDS = [
+    Record(3, "digital service", "d"),
+    Record(1, "data office", "d"),
+    Record(2, "digital service", "d"),
+    Record(4, "archive board", "a"),
+    Record(5, "department", "d"),
+]
+
+
+class ArchiveSnapshotTestCase(unittest.TestCase):
+    def setUp(self):
+        self.snapshot = ArchiveSnapshot(1, RECORDS)
+
+    def _ids(self, records):
+        return [record.id for record in records]
+
+    def test_records_are_grouped_and_sorted(self):
+        self.assertEqual(self.snapshot.characters, ("a", "d"))
+        self.assertEqual(self.snapshot.record_count, 5)
+        self.assertEqual(self.snapshot.listing_count("d"), 4)
+        self.assertEqual(self.snapshot.listing_count("z"), 0)
+        records, more = self.snapshot.listing_page("d")
+        self.assertEqual(self._ids(records), [1, 5, 2, 3])
+        self.assertFalse(more)
+
+    def test_pages_after_position(self):
+        records, more = self.snapshot.listing_page("d", limit=2)
+        self.assertEqual(self._ids(records), [1, 5])
+        self.assertTrue(more)
+
+        records, more = self.snapshot.listing_page(
+            "d", "after", ("department", 5), limit=2
+        )
+        self.assertEqual(self._ids(records), [2, 3])
+        self.assertFalse(more)
+
+    def test_pages_before_position(self):
+        records, more = self.snapshot.listing_page(
+            "d", "before", ("digital service", 3), limit=2
+        )
+        self.assertEqual(self._ids(records), [5, 2])
+        self.assertTrue(more)
+
+        records, more = self.snapshot.listing_page(
+            "d", "before", ("department", 5), limit=2
+        )
+        self.assertEqual(self._ids(records), [1])
+        self.assertFalse(more)
+
+    def test_position_of_removed_record(self):
+        records, _ = self.snapshot.listing_page(
+            "d", "after", ("digital service", 1), limit=2
+        )
+        self.assertEqual(self._ids(records), [2, 3])
+
+    def test_unknown_character(self):
+        self.assertEqual(self.snapshot.listing_page("z"), ((), False))
+
+
+class SnapshotHolderTestCase(unittest.TestCase):
+    def setUp(self):
+        self.get_generation = MagicMock(return_value=1)
+        self.load = MagicMock(
+            side_effect=lambda generation: ArchiveSnapshot(generation, RECORDS)
+        )
+
+    def _get(self, holder):
+        snapshot = holder.get(self.get_generation, self.load)
+        if holder._refresh_thread is not None:
+            holder._refresh_thread.join()
+        return snapshot
+
+    @patch("app.lib.archive_snapshot.time.monotonic")
+    def test_generation_is_checked_once_per_interval(self, mock_monotonic):
+        holder = SnapshotHolder(check_interval=10)
+        for now in (100, 105, 109.9):
+            mock_monotonic.return_value = now
+            self._get(holder)
+        self.assertEqual(self.get_generation.call_count, 1)
+
+        mock_monotonic.return_value = 110
+        self._get(holder)
+        self.assertEqual(self.get_generation.call_count, 2)
+        # The generation has not changed, so the snapshot is kept
+        self.assertEqual(self.load.call_count, 1)
+
+    def test_snapshot_is_loaded_again_for_new_generation(self):
+        teardown = MagicMock()
+        holder = SnapshotHolder(check_interval=0, teardown=teardown)
+        first = self._get(holder)
+        self.get_generation.return_value = 2
+        self._get(holder)
+        second = self._get(holder)
+        self.assertEqual((first.generation, second.generation), (1, 2))
+        self.assertEqual(self.load.call_count, 2)
+        self.assertEqual(teardown.call_count, 2)
+
+    def test_previous_snapshot_is_served_while_the_next_is_made(self):
+        holder = SnapshotHolder(check_interval=0)
+        first = self._get(holder)
+        loading = threading.Event()
+        loaded = threading.Event()
+
+        def load(generation):
+            loading.set()
+            loaded.wait(5)
+            return ArchiveSnapshot(generation, RECORDS)
+
+        self.get_generation.return_value = 2
+        self.load.side_effect = load
+        self.assertIs(holder.get(self.get_generation, self.load), first)
+        self.assertTrue(loading.wait(5))
+        # Only one new snapshot is made at a time
+        self.assertIs(holder.get(self.get_generation, self.load), first)
+        loaded.set()
+        holder._refresh_thread.join()
+        self.assertEqual(self._get(holder).generation, 2)
+        self.assertEqual(self.load.call_count, 2)
+
+    @patch("app.lib.archive_snapshot.logger")
+    def test_previous_snapshot_is_kept_when_the_next_fails(self, mock_logger):
+        holder = SnapshotHolder(check_interval=0)
+        first = self._get(holder)
+        self.get_generation.side_effect = OSError("database is unavailable")
+        self._get(holder)
+        self.assertIs(holder.snapshot, first)
+        mock_logger.exception.assert_called_once()
+
+    def test_first_snapshot_is_waited_for(self):
+        holder = SnapshotHolder(check_interval=0)
+        self.assertEqual(holder.get(self.get_generation, self.load).generation, 1)
+        self.assertIsNone(holder._refresh_thread)
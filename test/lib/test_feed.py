@@ -0,0 +1,124 @@
+import gzip
+import io
+import json
+import unittest
+
+from app.lib.feed import (
+    FeedCompressionError,
+    detect_compression,
+    iter_feed_chunks,
+    iter_json_array,
+    zstd_available,
+)
+
+
+def _chunked(data, size):
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+class IterJsonArrayTestCase(unittest.TestCase):
+    def test_empty_array(self):
+        self.assertEqual(list(iter_json_array([b"[]"])), [])
+
+    def test_yields_entries_in_order(self):
+        entries = [{"wamId": i, "profileName": f"Site {i}"} for i in range(10)]
+        data = json.dumps(entries).encode()
+        self.assertEqual(list(iter_json_array([data])), entries)
+
+    def test_entries_split_across_chunks(self):
+        entries = [
+            {
+                "wamId": 123456,
+                "description": 'Quotes " and ] brackets',
+                "ongoing": True,
+            },
+            {"wamId": 7, "description": "Café", "parentId": None},
+        ]
+        data = json.dumps(entries, ensure_ascii=False).encode()
+        for size in (1, 2, 5, 64):
+            with self.subTest(size=size):
+                self.assertEqual(list(iter_json_array(_chunked(data, size))), entries)
+
+    def test_number_split_across_chunks(self):
+        self.assertEqual(list(iter_json_array([b"[12", b"34, 5.", b"5]"])), [1234, 5.5])
+
+    def test_whitespace_and_byte_order_mark(self):
+        data = b'\xef\xbb\xbf\n[ {"wamId": 1} ,\n {"wamId": 2} ]\n'
+        self.assertEqual(
+            list(iter_json_array(_chunked(data, 3))), [{"wamId": 1}, {"wamId": 2}]
+        )
+
+    def test_entries_are_yielded_before_the_feed_ends(self):
+        def chunks():
+            yield b'[{"wamId": 1},'
+            raise AssertionError("Read past the first entry")
+
+        self.assertEqual(next(iter_json_array(chunks())), {"wamId": 1})
+
+    def test_invalid_documents_raise(self):
+        for data in (b"", b"{}", b"[1,]", b"[,1]", b"[1 2]", b'[{"wamId": 1', b"[1] x"):
+            with self.subTest(data=data), self.assertRaises(json.JSONDecodeError):
+                list(iter_json_array(_chunked(data, 2)))
+
+    def test_malformed_element_raises_without_reading_the_rest(self):
+        read = 0
+
+        def chunks():
+            nonlocal read
+            yield b'[{"wamId": 1}, {"wamId": 2 "broken": true}, '
+            for wam_id in range(3, 10_000):
+                read += 1
+                yield json.dumps({"wamId": wam_id}).encode() + b", "
+            yield b"{}]"
+
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_json_array(chunks(), max_element_size=100))
+        self.assertLess(read, 20)
+
+
+class DetectCompressionTestCase(unittest.TestCase):
+    def test_file_extension(self):
+        self.assertEqual(detect_compression("/data/archive.json.gz"), "gzip")
+        self.assertEqual(detect_compression("/data/ARCHIVE.JSON.GZ"), "gzip")
+        self.assertEqual(detect_compression("/data/archive.json.zst"), "zstd")
+        self.assertIsNone(detect_compression("/data/archive.json", b"[{"))
+
+    def test_magic_number(self):
+        self.assertEqual(detect_compression("", gzip.compress(b"[]")[:4]), "gzip")
+        self.assertEqual(detect_compression("", b"\x28\xb5\x2f\xfd"), "zstd")
+
+
+class IterFeedChunksTestCase(unittest.TestCase):
+    def test_uncompressed(self):
+        chunks = list(iter_feed_chunks(io.BytesIO(b"[1, 2, 3]"), chunk_size=4))
+        self.assertEqual(chunks, [b"[1, ", b"2, 3", b"]"])
+
+    def test_gzip_is_decompressed_in_chunks(self):
+        data = json.dumps([{"wamId": i} for i in range(1000)]).encode()
+        feed_file = io.BytesIO(gzip.compress(data))
+        chunks = list(iter_feed_chunks(feed_file, "gzip", chunk_size=1024))
+        self.assertEqual(b"".join(chunks), data)
+        self.assertTrue(all(len(chunk) <= 1024 for chunk in chunks))
+
+    @unittest.skipUnless(zstd_available(), "zstd is not available")
+    def test_zstd(self):
+        try:
+            from compression import zstd
+
+            compressed = zstd.compress(b"[1, 2, 3]")
+        except ImportError:
+            import zstandard
+
+            compressed = zstandard.ZstdCompressor().compress(b"[1, 2, 3]")
+        chunks = iter_feed_chunks(io.BytesIO(compressed), "zstd")
+        self.assertEqual(list(iter_json_array(chunks)), [1, 2, 3])
+
+    def test_corrupt_or_truncated_gzip_raises(self):
+        compressed = gzip.compress(b"[1, 2, 3]")
+        for data in (compressed[:-4], b"\x1f\x8bnot gzip"):
+            with self.subTest(data=data), self.assertRaises(FeedCompressionError):
+                list(iter_feed_chunks(io.BytesIO(data), "gzip"))
+
+    def test_unsupported_compression_raises(self):
+        with self.assertRaises(FeedCompressionError):
+            list(iter_feed_chunks(io.BytesIO(b""), "brotli"))
@@ -0,0 +1,127 @@
+import hashlib
+import importlib.util
+import json
+import unittest
+from pathlib import Path
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+
+from app import create_app
+from app.lib import database
+from app.lib.models import ArchiveRecord
+from app.lib.schemas import (
+    RECORD_HASH_FIELDS,
+    ArchiveRecordSchema,
+    compute_record_hash,
+)
+
+ENTRY = {
+    "profileName": "The Example Site",
+    "entryUrl": "https://example.com",
+    "archiveLink": "https://webarchive.nationalarchives.gov.uk/example",
+    "domainType": "Central government",
+    "firstCaptureDisplay": "2010",
+    "latestCaptureDisplay": "2024",
+    "ongoing": True,
+    "wamId": 1,
+    "description": "An example archived site",
+}
+
+
+def _load_migration(filename):
+    path = Path(__file__).parents[2] / "migrations" / "versions" / filename
+    spec = importlib.util.spec_from_file_location(filename, path)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    return migration
+
+
+class RecordHashTestCase(unittest.TestCase):
+    def test_to_row_has_every_column(self):
+        row = ArchiveRecordSchema(**ENTRY).to_row()
+        self.assertEqual(row["wam_id"], 1)
+        self.assertEqual(row["record_url"], "https://example.com/")
+        self.assertEqual(row["sort_name"], "Example Site")
+        self.assertEqual(row["first_character"], "e")
+        self.assertEqual(row["record_hash"], compute_record_hash(row))
+        self.assertEqual(len(row["record_hash"]), 32)
+
+    def test_hash_is_of_saved_fields(self):
+        record_hash = ArchiveRecordSchema(**ENTRY).record_hash
+        self.assertEqual(
+            ArchiveRecordSchema(**{**ENTRY, "wamId": 2}).record_hash, record_hash
+        )
+        self.assertEqual(
+            ArchiveRecordSchema(**{**ENTRY, "generatedOn": "2025"}).record_hash,
+            record_hash,
+        )
+        for key, value in (
+            ("profileName", "Another Site"),
+            ("ongoing", False),
+            ("description", None),
+            ("domainType", ""),
+        ):
+            with self.subTest(key=key):
+                changed = ArchiveRecordSchema(**{**ENTRY, key: value})
+                self.assertNotEqual(changed.record_hash, record_hash)
+
+    def test_hash_matches_migration(self):
+        migration = _load_migration(
+            "1f8c2d7e4b90_rehash_archive_records_with_blake2b.py"
+        )
+        self.assertEqual(migration.RECORD_HASH_FIELDS, RECORD_HASH_FIELDS)
+        row = ArchiveRecordSchema(**ENTRY).to_row()
+        self.assertEqual(migration.blake2b_record_hash(row), row["record_hash"])
+
+
+class RehashMigrationTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("config.Test")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        database.Base.metadata.create_all(database.engine)
+        self.migration = _load_migration(
+            "1f8c2d7e4b90_rehash_archive_records_with_blake2b.py"
+        )
+
+    def tearDown(self):
+        database.db_session.remove()
+        database.Base.metadata.drop_all(database.engine)
+        self.app_context.pop()
+
+    def _run(self, direction):
+        with database.engine.begin() as connection:
+            context = MigrationContext.configure(connection)
+            with Operations.context(context):
+                getattr(self.migration, direction)()
+
+    def test_upgrade_and_downgrade(self):
+        rows = [
+            ArchiveRecordSchema(**{**ENTRY, "wamId": wam_id}).to_row()
+            for wam_id in (1, 2, 3)
+        ]
+        md5_hash = hashlib.md5(
+            json.dumps(
+                {name: rows[0][name] for name in RECORD_HASH_FIELDS}, sort_keys=True
+            ).encode(),
+            usedforsecurity=False,
+        ).hexdigest()
+        database.db_session.execute(
+            ArchiveRecord.__table__.insert(),
+            [{**row, "record_hash": md5_hash} for row in rows],
+        )
+        database.db_session.commit()
+
+        self._run("upgrade")
+        self.assertEqual(
+            {r for (r,) in database.db_session.query(ArchiveRecord.record_hash)},
+            {rows[0]["record_hash"]},
+        )
+        database.db_session.remove()
+
+        self._run("downgrade")
+        self.assertEqual(
+            {r for (r,) in database.db_session.query(ArchiveRecord.record_hash)},
+            {md5_hash},
+        )
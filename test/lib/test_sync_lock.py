@@ -0,0 +1,94 @@
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from app import create_app
+from app.lib import database
+from app.lib.models import ArchiveSyncLock
+from app.lib.sync_lock import SyncLock
+
+
+class SyncLockTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("config.Test")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        database.Base.metadata.create_all(database.engine)
+        self.locks = []
+
+    def tearDown(self):
+        for lock in self.locks:
+            if lock._stop_renewing is not None:
+                lock.release()
+        database.db_session.remove()
+        database.Base.metadata.drop_all(database.engine)
+        self.app_context.pop()
+
+    def _lock(self, holder, ttl=60):
+        lock = SyncLock(ttl, holder=holder)
+        self.locks.append(lock)
+        return lock
+
+    def _row(self):
+        database.db_session.remove()
+        return database.db_session.query(ArchiveSyncLock).one()
+
+    def test_only_one_holder_at_a_time(self):
+        first = self._lock("first")
+        second = self._lock("second")
+
+        self.assertTrue(first.acquire())
+        self.assertFalse(second.acquire())
+        self.assertEqual(self._row().holder, "first")
+
+        first.release()
+        self.assertTrue(second.acquire())
+        self.assertEqual(self._row().holder, "second")
+
+    def test_holder_can_acquire_again(self):
+        lock = self._lock("first")
+        self.assertTrue(lock.acquire())
+        self.assertTrue(lock.acquire())
+
+    def test_expired_lease_can_be_taken_over(self):
+        self.assertTrue(self._lock("stopped").acquire())
+        self.locks[0]._stop_renewing.set()
+        database.db_session.query(ArchiveSyncLock).update(
+            {"expires_at": datetime.now(timezone.utc) - timedelta(seconds=1)}
+        )
+        database.db_session.commit()
+
+        self.assertTrue(self._lock("second").acquire())
+        self.assertEqual(self._row().holder, "second")
+
+    def test_lease_is_renewed_while_held(self):
+        lock = self._lock("first", ttl=0.3)
+        self.assertTrue(lock.acquire())
+        expires_at = self._row().expires_at
+
+        time.sleep(0.5)
+
+        self.assertGreater(self._row().expires_at, expires_at)
+        self.assertFalse(self._lock("second").acquire())
+
+    def test_release_records_run(self):
+        lock = self._lock("first")
+        self.assertFalse(lock.ran_within(60))
+
+        lock.acquire()
+        lock.release()
+        self.assertFalse(lock.ran_within(60))
+
+        lock.acquire()
+        lock.release(record_run=True)
+        self.assertTrue(lock.ran_within(60))
+        self.assertFalse(lock.ran_within(0))
+        self.assertIsNone(self._row().holder)
+
+    def test_release_does_not_free_another_holders_lease(self):
+        first = self._lock("first")
+        first.acquire()
+
+        self._lock("second").release()
+
+        self.assertEqual(self._row().holder, "first")
@@ -0,0 +1,61 @@
+import json
+import unittest
+from unittest.mock import patch
+
+from app.lib.sync_report import SyncReport
+
+
+class SyncReportTestCase(unittest.TestCase):
+    def test_phases_accumulate(self):
+        report = SyncReport()
+        report.add("write", 0.5, rows=100)
+        report.add("write", 1.5, rows=300)
+
+        phase = report.as_dict()["phases"]["write"]
+        self.assertEqual(phase["seconds"], 2.0)
+        self.assertEqual(phase["rows"], 400)
+        self.assertEqual(phase["rows_per_sec"], 200)
+
+    def test_batches_are_recorded(self):
+        report = SyncReport()
+        report.add_batch("write", 1.0, rows=10)
+        report.add_batch("write", 2.0, rows=10)
+
+        phase = report.as_dict()["phases"]["write"]
+        self.assertEqual(phase["rows"], 20)
+        self.assertEqual(
+            [batch["rows_per_sec"] for batch in phase["batches"]], [10.0, 5.0]
+        )
+
+    def test_phase_context_manager_times_body(self):
+        report = SyncReport()
+        with (
+            patch("app.lib.sync_report.time.perf_counter", side_effect=[1.0, 3.5]),
+            report.phase("publish", rows=5),
+        ):
+            pass
+
+        self.assertEqual(report.phases["publish"], {"seconds": 2.5, "rows": 5})
+
+    def test_timed_counts_time_producing_items(self):
+        report = SyncReport()
+        times = iter([0.0, 1.0, 1.0, 3.0, 3.0, 3.5])
+        with patch("app.lib.sync_report.time.perf_counter", lambda: next(times)):
+            self.assertEqual(list(report.timed("parse", ["a", "b"])), ["a", "b"])
+
+        self.assertEqual(report.phases["parse"]["seconds"], 3.5)
+
+    def test_zero_duration_has_no_rate(self):
+        report = SyncReport()
+        report.add("fetch", 0, bytes=100)
+        self.assertIsNone(report.as_dict()["phases"]["fetch"]["bytes_per_sec"])
+
+    def test_summary_is_json_serialisable(self):
+        report = SyncReport()
+        report.outcome = "synced"
+        report.add("fetch", 0.1, bytes=1024)
+
+        summary = json.loads(json.dumps(report.as_dict({"total": 1})))
+        self.assertEqual(summary["outcome"], "synced")
+        self.assertEqual(summary["stats"], {"total": 1})
+        self.assertGreater(summary["peak_rss_bytes"], 0)
@@ -1,6 +1,12 @@
 import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from sqlalchemy.exc import OperationalError
 
 from app import create_app
+from app.lib import database
+from app.lib.models import ArchiveSyncState
 
 
 class MainBlueprintTestCase(unittest.TestCase):
@@ -22,3 +28,62 @@ class MainBlueprintTestCase(unittest.TestCase):
         rv = self.app.get("/cookies/")
         self.assertEqual(rv.status_code, 200)
         self.assertIn('<h1 class="tna-heading-xl">Cookies</h1>', rv.text)
+
+
+class ReadinessTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("config.Test")
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        database.Base.metadata.create_all(database.engine)
+
+    def tearDown(self):
+        database.db_session.remove()
+        database.Base.metadata.drop_all(database.engine)
+        self.app_context.pop()
+
+    def test_not_ready_before_first_sync(self):
+        rv = self.client.get("/healthcheck/ready/")
+        self.assertEqual(rv.status_code, 503)
+        self.assertEqual(
+            rv.json,
+            {
+                "ready": False,
+                "database": True,
+                "generation": None,
+                "last_synced_at": None,
+                "age_seconds": None,
+            },
+        )
+        self.assertIn("no-store", rv.headers["Cache-Control"])
+
+    def test_ready_after_sync(self):
+        last_synced_at = datetime.now(timezone.utc) - timedelta(minutes=5)
+        database.db_session.add(
+            ArchiveSyncState(
+                source_url="http://example.com/data.json",
+                last_synced_at=last_synced_at,
+                generation=3,
+            )
+        )
+        database.db_session.commit()
+
+        rv = self.client.get("/healthcheck/ready/")
+        self.assertEqual(rv.status_code, 200)
+        self.assertTrue(rv.json["ready"])
+        self.assertTrue(rv.json["database"])
+        self.assertEqual(rv.json["generation"], 3)
+        self.assertEqual(
+            rv.json["last_synced_at"],
+            last_synced_at.replace(tzinfo=None).isoformat() + "+00:00",
+        )
+        self.assertAlmostEqual(rv.json["age_seconds"], 300, delta=60)
+
+    def test_not_ready_when_database_is_unreachable(self):
+        with patch.object(
+            database.read_session, "execute", side_effect=OperationalError("", {}, None)
+        ):
+            rv = self.client.get("/healthcheck/ready/")
+        self.assertEqual(rv.status_code, 503)
+        self.assertFalse(rv.json["database"])
@@ -2,7 +2,7 @@ import unittest
 from unittest.mock import patch
 
 from app import create_app
-from app.lib.archive_service import _sanitize_fts_query
+from app.lib.archive_service import InvalidCursorError, _sanitize_fts_query
 from app.wagtail.pages.atoz_archive_page import render_atoz_archive_page
 
 PAGE_DATA = {
@@ -34,7 +34,7 @@ SEARCH_RESULTS = {
             "first_character": "g",
         }
     ],
-    "meta": {"total_count": 1},
+    "meta": {"total_count": 1, "total_count_capped": False, "limit": 100, "offset": 0},
 }
 
 CHARACTER_RESULTS = {
@@ -119,7 +119,7 @@ class AtozArchivePageSearchTestCase(unittest.TestCase):
         ):
             render_atoz_archive_page(PAGE_DATA)
 
-        mock_search.assert_called_once_with("foo")
+        mock_search.assert_called_once_with("foo", 100, 0)
         mock_by_char.assert_not_called()
 
     def test_basic_search_returns_results(self):
@@ -192,6 +192,159 @@ class AtozArchivePageSearchTestCase(unittest.TestCase):
         self.assertEqual(status, 500)
 
 
+class AtozArchivePagePaginationTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("config.Test")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+    def tearDown(self):
+        self.app_context.pop()
+
+    def _render(self, query_string, records=None, side_effect=None):
+        with (
+            patch(
+                "app.lib.archive_service.get_available_characters",
+                return_value=AVAILABLE_CHARACTERS,
+            ),
+            patch(
+                "app.lib.archive_service.get_records_by_character",
+                return_value=records,
+                side_effect=side_effect,
+            ) as mock_by_char,
+            self.app.test_request_context(f"/?{query_string}"),
+        ):
+            result = render_atoz_archive_page(PAGE_DATA)
+        if isinstance(result, tuple):
+            return (*result, mock_by_char)
+        return result.get_data(as_text=True), result.status_code, mock_by_char
+
+    def test_renders_previous_and_next_links(self):
+        records = {
+            **CHARACTER_RESULTS,
+            "meta": {
+                "total_count": 250,
+                "limit": 100,
+                "next_cursor": "NEXT",
+                "previous_cursor": "PREVIOUS",
+            },
+        }
+        response, status, mock_by_char = self._render(
+            "character=d&cursor=CURRENT", records
+        )
+        self.assertEqual(status, 200)
+        mock_by_char.assert_called_once_with("d", "CURRENT")
+        self.assertIn("data-az-pagination", response)
+        self.assertIn('href="?character=d&amp;cursor=NEXT"', response)
+        self.assertIn('href="?character=d&amp;cursor=PREVIOUS"', response)
+
+    def test_single_page_has_no_pagination(self):
+        response, status, _ = self._render("character=d", CHARACTER_RESULTS)
+        self.assertEqual(status, 200)
+        self.assertNotIn("data-az-pagination", response)
+
+    def test_uses_rendered_records(self):
+        with patch(
+            "app.lib.archive_service.get_listing_html",
+            return_value='<ul data-az-rendered-records=""></ul>',
+        ) as mock_listing_html:
+            response, status, _ = self._render("character=d", CHARACTER_RESULTS)
+        self.assertEqual(status, 200)
+        # The rendered records of the same records as the pagination
+        mock_listing_html.assert_called_once_with(CHARACTER_RESULTS["items"])
+        self.assertIn("data-az-rendered-records", response)
+        self.assertNotIn("Department for Digital", response)
+
+    def test_renders_records_without_rendered_records(self):
+        with (
+            patch("app.lib.archive_service.get_listing_html", return_value=None),
+            patch("app.lib.archive_service.set_listing_html") as mock_set_html,
+        ):
+            response, status, _ = self._render("character=d", CHARACTER_RESULTS)
+        self.assertEqual(status, 200)
+        self.assertIn("data-az-static-records", response)
+        self.assertIn("Department for Digital", response)
+        # Kept for the next request for the same records
+        records, html = mock_set_html.call_args.args
+        self.assertEqual(records, CHARACTER_RESULTS["items"])
+        self.assertIn("Department for Digital", html)
+
+    def test_invalid_cursor_returns_400(self):
+        _, status, _ = self._render(
+            "character=d&cursor=nonsense", side_effect=InvalidCursorError
+        )
+        self.assertEqual(status, 400)
+
+    def test_empty_page_returns_404(self):
+        _, status, _ = self._render(
+            "character=d&cursor=GONE", {"items": [], "meta": {"total_count": 0}}
+        )
+        self.assertEqual(status, 404)
+
+
+class AtozArchivePageSearchPaginationTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("config.Test")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+    def tearDown(self):
+        self.app_context.pop()
+
+    def _render(self, query_string, total_count=1, total_count_capped=False):
+        results = {
+            **SEARCH_RESULTS,
+            "meta": {
+                **SEARCH_RESULTS["meta"],
+                "total_count": total_count,
+                "total_count_capped": total_count_capped,
+            },
+        }
+        with (
+            patch(
+                "app.lib.archive_service.get_available_characters",
+                return_value=AVAILABLE_CHARACTERS,
+            ),
+            patch(
+                "app.lib.archive_service.search_records", return_value=results
+            ) as mock_search,
+            self.app.test_request_context(f"/?{query_string}"),
+        ):
+            result = render_atoz_archive_page(PAGE_DATA)
+        if isinstance(result, tuple):
+            return (*result, mock_search)
+        return result.get_data(as_text=True), result.status_code, mock_search
+
+    def test_renders_page_links(self):
+        response, status, mock_search = self._render("q=gov&page=2", total_count=250)
+        self.assertEqual(status, 200)
+        mock_search.assert_called_once_with("gov", 100, 100)
+        self.assertIn("(250 found)", response)
+        self.assertIn('href="?q=gov&amp;page=1"', response)
+        self.assertIn('href="?q=gov&amp;page=3"', response)
+
+    def test_single_page_has_no_pagination(self):
+        response, status, _ = self._render("q=gov")
+        self.assertEqual(status, 200)
+        self.assertNotIn("data-az-pagination", response)
+
+    def test_capped_count(self):
+        response, _, _ = self._render(
+            "q=gov", total_count=1000, total_count_capped=True
+        )
+        self.assertIn("(more than 1000 found)", response)
+
+    def test_page_past_results_returns_404(self):
+        _, status, _ = self._render("q=gov&page=4", total_count=250)
+        self.assertEqual(status, 404)
+
+    def test_invalid_page_returns_400(self):
+        for page in ("0", "two"):
+            with self.subTest(page=page):
+                _, status, _ = self._render(f"q=gov&page={page}")
+                self.assertEqual(status, 400)
+
+
 class SanitizeFtsQueryTestCase(unittest.TestCase):
     def test_plain_query_is_unchanged(self):
         self.assertEqual(_sanitize_fts_query("government"), "government")
@@ -202,6 +355,12 @@ class SanitizeFtsQueryTestCase(unittest.TestCase):
     def test_at_sign_is_stripped(self):
         self.assertEqual(_sanitize_fts_query("site@example"), "site example")
 
+    def test_whitespace_is_collapsed(self):
+        self.assertEqual(
+            _sanitize_fts_query(" government @ digital\t service "),
+            "government digital service",
+        )
+
     def test_fts5_wildcard_preserved(self):
         self.assertEqual(_sanitize_fts_query("digit*"), "digit*")
 